@@ -0,0 +1,155 @@
+"""
+Analysis Sessions
+Server-side coverage analyses referenced by id from generate calls
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from models import db, AnalysisSession
+
+CACHE_SIZE = int(os.getenv('ANALYSIS_SESSION_CACHE_SIZE', '512'))
+TTL_HOURS = int(os.getenv('ANALYSIS_SESSION_TTL_HOURS', '72'))
+
+def make_analysis_id(document_type, requirement, analysis):
+    """Stable id, so analyzing the same requirement twice reuses one session"""
+    content = json.dumps([document_type, requirement, analysis], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+def _element_line(label, elements, value_keys):
+    items = []
+    for element in elements or []:
+        if not isinstance(element, dict):
+            continue
+        name = element.get('element') or 'Element'
+        status = element.get('status')
+        if status and status not in ('present', 'missing'):
+            name = f"{name} ({status})"
+        value = next((element[key] for key in value_keys if element.get(key)), None)
+        items.append(f"{name}: {value}" if value else name)
+    return f"{label}: " + '; '.join(items) if items else None
+
+def digest_coverage_analysis(analysis):
+    """Compact plain-text form of a coverage analysis for generation prompts.
+
+    Keeps what generation uses (score, category, the content of present
+    elements, suggestions for missing ones, critical gaps) and drops the
+    UI-only question list and formatting.
+    """
+    if not isinstance(analysis, dict) or not analysis:
+        return "None provided"
+    coverage = analysis.get('coverage_analysis')
+    coverage = coverage if isinstance(coverage, dict) else analysis
+
+    summary = []
+    if analysis.get('overall_score') is not None:
+        score = f"Score: {analysis['overall_score']}/100"
+        if analysis.get('enterprise_readiness'):
+            score += f" ({analysis['enterprise_readiness']})"
+        summary.append(score)
+    for key, label in (('requirement_category', 'Category'), ('project_name', 'Project')):
+        if analysis.get(key):
+            summary.append(f"{label}: {analysis[key]}")
+
+    lines = [' | '.join(summary)] if summary else []
+    lines.append(_element_line('Present', coverage.get('present_elements'), ('content', 'details')))
+    lines.append(_element_line('Missing', coverage.get('missing_elements'), ('suggested_content', 'details')))
+    gaps = analysis.get('critical_gaps')
+    if gaps:
+        lines.append("Critical gaps: " + '; '.join(str(gap) for gap in gaps))
+    lines = [line for line in lines if line]
+    return '\n'.join(lines) if lines else "None provided"
+
+class StoredAnalysis:
+    """A coverage analysis and its prompt digest"""
+
+    def __init__(self, analysis_id, document_type, analysis, digest, created_at):
+        self.analysis_id = analysis_id
+        self.document_type = document_type
+        self.analysis = analysis
+        self.digest = digest
+        self.created_at = created_at
+
+class AnalysisSessionStore:
+    """In-process LRU in front of the analysis_session table.
+
+    Needs an application context. Sessions outlive a process restart and
+    are shared by workers through the database; the LRU saves the load
+    and decompression on the analyze -> generate hot path.
+    """
+
+    def __init__(self, capacity=CACHE_SIZE, ttl_hours=TTL_HOURS):
+        self.capacity = capacity
+        self.ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def _remember(self, stored):
+        with self._lock:
+            self._sessions[stored.analysis_id] = stored
+            self._sessions.move_to_end(stored.analysis_id)
+            while len(self._sessions) > self.capacity:
+                self._sessions.popitem(last=False)
+
+    def save(self, document_type, requirement, analysis):
+        """Store an analysis and return its analysis_id"""
+        analysis_id = make_analysis_id(document_type, requirement, analysis)
+        stored = StoredAnalysis(analysis_id, document_type, copy.deepcopy(analysis),
+                                digest_coverage_analysis(analysis), datetime.utcnow())
+        try:
+            row = db.session.get(AnalysisSession, analysis_id)
+            if row:
+                row.created_at = stored.created_at
+            else:
+                db.session.add(AnalysisSession(id=analysis_id, document_type=document_type, analysis=analysis,
+                                               digest=stored.digest, created_at=stored.created_at))
+            db.session.commit()
+        except Exception as e:
+            # Still usable from this process, just not shared or persisted
+            db.session.rollback()
+            print(f"ERROR: Could not persist analysis session {analysis_id}: {str(e)}")
+        self._remember(stored)
+        return analysis_id
+
+    def get(self, analysis_id, document_type=None):
+        """Return the StoredAnalysis for an id, or None if unknown, expired or of another type"""
+        if not analysis_id:
+            return None
+        with self._lock:
+            stored = self._sessions.get(analysis_id)
+            if stored:
+                self._sessions.move_to_end(analysis_id)
+
+        if stored is None:
+            row = db.session.get(AnalysisSession, str(analysis_id))
+            if row is None:
+                return None
+            stored = StoredAnalysis(row.id, row.document_type, row.analysis, row.digest, row.created_at)
+            self._remember(stored)
+
+        if datetime.utcnow() - stored.created_at > self.ttl:
+            return None
+        if document_type and stored.document_type != document_type:
+            return None
+        return stored
+
+    def purge_expired(self):
+        """Delete expired sessions from the database; returns how many were removed"""
+        cutoff = datetime.utcnow() - self.ttl
+        removed = AnalysisSession.query.filter(AnalysisSession.created_at < cutoff).delete()
+        db.session.commit()
+        with self._lock:
+            for analysis_id in [key for key, stored in self._sessions.items() if stored.created_at < cutoff]:
+                del self._sessions[analysis_id]
+        return removed
+
+    def clear(self):
+        """Forget cached sessions (the database is left alone)"""
+        with self._lock:
+            self._sessions.clear()
+
+analysis_sessions = AnalysisSessionStore()
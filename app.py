@@ -1,11 +1,13 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, session, Response, g, stream_with_context
 import os
+import uuid
 from dotenv import load_dotenv
 import json
 import tempfile
 import base64
 from werkzeug.utils import secure_filename
 from llm_client import GroqClient
+from llm_providers import LLM_BULK_PROVIDER, provider_stats
 from story_parser import StoryParser
 from story_exporter_enhanced import EnhancedStoryExporter
 from field_questions import REQUIRED_FIELDS
@@ -13,6 +15,23 @@ from brd_field_questions import BRD_REQUIRED_FIELDS
 from frd_field_questions import FRD_REQUIRED_FIELDS
 from cr_field_questions import CR_REQUIRED_FIELDS
 from srd_field_questions import SRD_REQUIRED_FIELDS
+from models import db
+from migrate_history_schema import migrate_schema
+from document_history import get_or_create_user, record_document, list_documents, get_document
+from search_index import init_search, search_documents, SearchUnavailable
+from requirement_similarity import similarity_index, REUSE_THRESHOLD, SUGGEST_THRESHOLD
+from incremental_regeneration import plan_regeneration, merge_sections
+from bulk_export import parse_export_jobs, stream_bulk_export
+from batch_analysis import (detect_format, parse_batch_rows, make_batch_id, stream_batch, batch_progress, BatchConflict,
+                            MAX_CONCURRENCY)
+from text_exporters import TEXT_FORMATS, stream_text_export
+from tracker_connectors import TrackerError, get_connector, issues_from_documents, push_summary, resolve_project
+from document_preview import preview_cache, preview_manifest, stream_preview, PREVIEW_FORMATS
+from analysis_sessions import analysis_sessions, digest_coverage_analysis
+from prompt_registry import prompt_registry
+from speculation import speculative_generator, suggested_answers
+from local_analyzer import local_coverage_analysis
+from document_pack import parse_pack_request, split_pack_analysis, pack_answers, stream_pack, pack_export_jobs
 
 import secrets
 
@@ -23,13 +42,253 @@ app = Flask(__name__)
 default_secret = secrets.token_hex(32) if os.getenv('FLASK_ENV') == 'development' else None
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', default_secret)
 
+# Database configuration (document history)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///user_stories.db')
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+db.init_app(app)
+with app.app_context():
+    db.create_all()
+    # Databases created before document history get its column and indexes; a no-op once they exist
+    for change in migrate_schema():
+        app.logger.info(f"Migrated history schema: {change}")
+    analysis_sessions.purge_expired()
+init_search(app)
+
 # File upload configuration
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'pdf', 'docx'}
 
+# Analyzer method of each document type, used for live analysis
+ANALYZERS = {
+    'story': 'analyze_requirement_coverage',
+    'brd': 'analyze_brd_requirement_coverage',
+    'frd': 'analyze_frd_requirement_coverage',
+    'srd': 'analyze_srd_requirement_coverage',
+    'cr': 'analyze_cr_requirement_coverage'
+}
+
 # Initialize components
 groq_client = GroqClient()
+# Batch analysis and document packs can run on separate capacity so they never starve interactive calls
+bulk_client = GroqClient(LLM_BULK_PROVIDER) if LLM_BULK_PROVIDER else groq_client
 story_parser = StoryParser()
 story_exporter = EnhancedStoryExporter()
+prompt_registry.start_watching()
+
+@app.after_request
+def _stamp_prompt_version(response):
+    """Tag every response with the prompt set that produced it"""
+    response.headers['X-Prompt-Version'] = prompt_registry.version
+    if g.get('speculation'):
+        response.headers['X-Speculation'] = g.speculation
+    return response
+
+def _session_id():
+    """Id of the current browser session, assigned on first use"""
+    session_id = session.get('session_id')
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        session['session_id'] = session_id
+        session.permanent = True
+    return session_id
+
+def _current_user():
+    """Get the history user for the current browser session"""
+    return get_or_create_user(_session_id())
+
+def _similarity_owner():
+    """Session the similarity index is scoped to, or None if there is no usable session"""
+    try:
+        return _session_id()
+    except Exception as e:
+        app.logger.error(f"Similarity session error: {str(e)}")
+        return None
+
+def _record_history(response, document_type, requirement, coverage_analysis, document_data):
+    """Store a generated document in the session history without failing the request"""
+    try:
+        story = record_document(_current_user(), document_type, requirement, coverage_analysis, document_data)
+        response.headers['X-Document-Id'] = str(story.id)
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"History recording error: {str(e)}")
+    return response
+
+def _analyze_with_reuse(document_type, requirement, analyze, allow_reuse=True, owner=None, remember=True):
+    """Reuse the analysis of a near-identical earlier requirement, or run a fresh one.
+
+    Only requirements analyzed in the same session (owner, by default the
+    current one) are considered. Returns (coverage_analysis, similar) where
+    similar gives the closest one's similarity score (None if nothing was
+    close enough to mention). remember=False leaves the new analysis out of
+    the index, e.g. for drafts.
+    """
+    owner = owner or _similarity_owner()
+    similar = similarity_index.find_similar(owner, document_type, requirement) if owner else None
+    if similar and similar.similarity < SUGGEST_THRESHOLD:
+        similar = None
+    
+    if similar and allow_reuse and similar.similarity >= REUSE_THRESHOLD:
+        info = dict(similar.to_dict(), reused=True)
+        return similar.analysis, info
+    
+    coverage_analysis = analyze(requirement)
+    
+    # Only genuine LLM analyses are worth reusing, never the local fallback
+    if owner and remember and coverage_analysis and coverage_analysis.get('analysis_source') != 'local':
+        similarity_index.add(owner, document_type, requirement, coverage_analysis)
+    
+    info = dict(similar.to_dict(), reused=False) if similar else None
+    return coverage_analysis, info
+
+def _generate_incrementally(document_type, data, requirement, answers, coverage_analysis, generate):
+    """Regenerate only the sections affected by changed answers when possible.
+
+    Clients opt in with mode='incremental' and send back previous_answers and
+    previous_document. Returns (document, regenerated_sections) where
+    regenerated_sections is None for a full generation.
+    """
+    previous_document = data.get('previous_document')
+    previous_requirement = data.get('previous_requirement')
+    
+    if (data.get('mode') == 'incremental' and isinstance(previous_document, dict)
+            and (previous_requirement is None or previous_requirement.strip() == requirement)):
+        sections = plan_regeneration(document_type, data.get('previous_answers'), answers, previous_document)
+        if sections == []:
+            return previous_document, []
+        if sections:
+            regenerated = groq_client.generate_sections(
+                document_type, requirement, answers, coverage_analysis, sections, previous_document
+            )
+            if regenerated is not None:
+                return merge_sections(previous_document, regenerated), sections
+    
+    speculated = _claim_speculation(document_type, data, requirement, answers, coverage_analysis)
+    if speculated is not None:
+        return speculated, None
+    return generate(requirement, answers, coverage_analysis), None
+
+def _speculate(document_type, data, requirement, result):
+    """Start generating from the suggested answers while the user reviews them"""
+    if data.get('replaces_analysis_id') and data['replaces_analysis_id'] != result.get('analysis_id'):
+        speculative_generator.cancel(data['replaces_analysis_id'])
+    stored = analysis_sessions.get(result.get('analysis_id'), document_type)
+    if not stored:
+        return
+    # A failed speculation must not stand in for a real generation, so it yields None instead of the default document
+    speculative_generator.start(
+        stored.analysis_id, document_type, requirement, suggested_answers(stored.analysis),
+        lambda requirement, answers: groq_client.try_generate_document(document_type, requirement, answers,
+                                                                       stored.digest)
+    )
+
+def _claim_speculation(document_type, data, requirement, answers, coverage_analysis):
+    """Serve the speculative document if the submitted answers match, or patch the sections that differ.
+
+    Returns the document, or None to generate from scratch.
+    """
+    speculation = speculative_generator.claim(data.get('analysis_id'), document_type, requirement)
+    if not speculation:
+        return None
+    
+    document = speculation.result()
+    sections = plan_regeneration(document_type, speculation.answers, answers, document)
+    if sections == []:
+        speculative_generator.record('hits')
+        g.speculation = 'hit'
+        return document
+    if sections:
+        regenerated = groq_client.generate_sections(
+            document_type, requirement, answers, coverage_analysis, sections, document
+        )
+        if regenerated is not None:
+            speculative_generator.record('patched')
+            g.speculation = 'patched:' + ','.join(sections)
+            return merge_sections(document, regenerated)
+    
+    speculative_generator.record('misses')
+    g.speculation = 'miss'
+    return None
+
+def _regenerated_header(response, regenerated_sections):
+    """Tell the client which sections a generate call actually produced"""
+    response.headers['X-Regenerated-Sections'] = 'all' if regenerated_sections is None else ','.join(regenerated_sections)
+    return response
+
+def _store_analysis(result, document_type, requirement, coverage_analysis):
+    """Keep the analysis server-side and give the client its analysis_id"""
+    try:
+        return dict(result, analysis_id=analysis_sessions.save(document_type, requirement, coverage_analysis))
+    except Exception as e:
+        app.logger.error(f"Analysis session error: {str(e)}")
+        return result
+
+def _analysis_result(document_type, data, requirement, owner):
+    """Run (or reuse) the LLM analysis of a draft and store it the way the analyze routes do; None if it failed"""
+    # Drafts are looked up in the session's index but not added to it
+    coverage_analysis, similar_analysis = _analyze_with_reuse(
+        document_type, requirement, getattr(groq_client, ANALYZERS[document_type]), data.get('reuse_analysis', True),
+        owner, remember=False
+    )
+    if not coverage_analysis:
+        return None
+    
+    result = coverage_analysis if 'coverage_analysis' in coverage_analysis else {'coverage_analysis': coverage_analysis}
+    if similar_analysis:
+        result = dict(result, similar_analysis=similar_analysis)
+    return _store_analysis(result, document_type, requirement, coverage_analysis)
+
+def _live_analysis_stream(document_type, data, requirement, owner):
+    """NDJSON lines: the local pre-analysis at once, then the LLM analysis when it arrives"""
+    yield json.dumps(dict(local_coverage_analysis(document_type, requirement), stage='local')) + '\n'
+    try:
+        result = _analysis_result(document_type, data, requirement, owner)
+    except Exception as e:
+        app.logger.error(f"Live analysis error: {str(e)}")
+        result = None
+    if result is None:
+        yield json.dumps({'stage': 'error', 'error': 'Failed to analyze requirement coverage'}) + '\n'
+        return
+    yield json.dumps(dict(result, stage='llm')) + '\n'
+
+def _pack_analyses(client, requirement, document_types):
+    """One combined analysis for a document pack, split per document type and stored like regular analyses"""
+    combined = client.analyze_pack_coverage(requirement, document_types)
+    results = {}
+    for document_type, analysis in split_pack_analysis(combined, document_types, requirement).items():
+        result = analysis if 'coverage_analysis' in analysis else {'coverage_analysis': analysis}
+        results[document_type] = _store_analysis(result, document_type, requirement, analysis)
+    return results
+
+def _coverage_for_generation(document_type, data):
+    """Resolve the coverage analysis of a generate call.
+
+    Clients send the analysis_id returned by analyze; a posted
+    coverage_analysis is still accepted. Returns (coverage_analysis,
+    prompt_coverage) where prompt_coverage is the compact digest given to
+    the model, or (None, None) for an unknown or expired analysis_id.
+    """
+    analysis_id = data.get('analysis_id')
+    if analysis_id:
+        stored = analysis_sessions.get(analysis_id, document_type)
+        if stored:
+            return stored.analysis, stored.digest
+        if not data.get('coverage_analysis'):
+            return None, None
+    coverage_analysis = data.get('coverage_analysis', {})
+    return coverage_analysis, digest_coverage_analysis(coverage_analysis)
+
+def _analysis_expired_response():
+    return jsonify({'error': 'Analysis session not found or expired, please analyze the requirement again',
+                    'analysis_expired': True}), 404
+
+def _text_export_response(document_type, format_type, document_data, coverage_data, section_images, download_base):
+    """Stream a Markdown, HTML or JSON-LD export without going through a temp file"""
+    extension, mimetype = TEXT_FORMATS[format_type]
+    return Response(
+        stream_text_export(document_type, format_type, document_data, coverage_data, section_images),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{download_base}.{extension}"'}
+    )
 
 @app.route('/')
 def index():
@@ -52,7 +311,9 @@ def analyze_requirement():
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
         # Analyze requirement coverage using LLM
-        coverage_analysis = groq_client.analyze_requirement_coverage(requirement)
+        coverage_analysis, similar_analysis = _analyze_with_reuse(
+            'story', requirement, groq_client.analyze_requirement_coverage, data.get('reuse_analysis', True)
+        )
         
         if not coverage_analysis:
             return jsonify({'error': 'Failed to analyze requirement coverage'}), 500
@@ -65,12 +326,76 @@ def analyze_requirement():
         else:
             result = coverage_analysis
         
+        if similar_analysis:
+            result = dict(result, similar_analysis=similar_analysis)
+        
+        result = _store_analysis(result, 'story', requirement, coverage_analysis)
+        
+        _speculate('story', data, requirement, result)
+        
         return jsonify(result)
     
     except Exception as e:
         app.logger.error(f"Analysis error: {str(e)}")
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@app.route('/analyze/live', methods=['POST'])
+def analyze_live():
+    """Analysis for the requirement editor's live mode, streamed as NDJSON"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data received'}), 400
+        
+        requirement = data.get('requirement', '').strip()
+        document_type = data.get('document_type', 'story')
+        
+        if not requirement:
+            return jsonify({'error': 'Requirement text is required'}), 400
+        
+        if document_type not in ANALYZERS:
+            return jsonify({'error': 'Invalid document type'}), 400
+        
+        # Check if groq_client is available
+        if not groq_client:
+            return jsonify({'error': 'GroqClient not initialized'}), 500
+        
+        # Resolved before streaming so a new session cookie still goes out with the headers
+        owner = _similarity_owner()
+        
+        # The client aborts superseded requests, so nothing is speculated here;
+        # it calls /analyze/<analysis_id>/speculate for the analysis it adopts
+        return Response(stream_with_context(_live_analysis_stream(document_type, data, requirement, owner)),
+                        mimetype='application/x-ndjson')
+    
+    except Exception as e:
+        app.logger.error(f"Live analysis error: {str(e)}")
+        return jsonify({'error': f'Live analysis failed: {str(e)}'}), 500
+
+@app.route('/analyze/<analysis_id>/speculate', methods=['POST'])
+def speculate_analysis(analysis_id):
+    """Start speculative generation for a live analysis the user moved on with"""
+    try:
+        data = request.get_json() or {}
+        requirement = data.get('requirement', '').strip()
+        document_type = data.get('document_type', 'story')
+        
+        if not requirement:
+            return jsonify({'error': 'Requirement text is required'}), 400
+        
+        if document_type not in ANALYZERS:
+            return jsonify({'error': 'Invalid document type'}), 400
+        
+        if not analysis_sessions.get(analysis_id, document_type):
+            return _analysis_expired_response()
+        
+        _speculate(document_type, data, requirement, {'analysis_id': analysis_id})
+        return jsonify({'analysis_id': analysis_id}), 202
+    
+    except Exception as e:
+        app.logger.error(f"Speculation error: {str(e)}")
+        return jsonify({'error': f'Speculation failed: {str(e)}'}), 500
+
 @app.route('/generate', methods=['POST'])
 def generate_story():
     try:
@@ -80,7 +405,6 @@ def generate_story():
             
         requirement = data.get('requirement', '').strip()
         answers = data.get('answers', {})
-        coverage_analysis = data.get('coverage_analysis', {})
         
         if not requirement:
             return jsonify({'error': 'Requirement text is required'}), 400
@@ -89,8 +413,14 @@ def generate_story():
         if not groq_client:
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
+        coverage_analysis, prompt_coverage = _coverage_for_generation('story', data)
+        if coverage_analysis is None:
+            return _analysis_expired_response()
+        
         # Generate user story using LLM with coverage analysis
-        story_data = groq_client.generate_story(requirement, answers, coverage_analysis)
+        story_data, regenerated_sections = _generate_incrementally(
+            'story', data, requirement, answers, prompt_coverage, groq_client.generate_story
+        )
         
         if not story_data:
             return jsonify({'error': 'Failed to generate user story'}), 500
@@ -101,7 +431,8 @@ def generate_story():
         else:
             parsed_story = story_data
         
-        return jsonify(parsed_story)
+        response = _regenerated_header(jsonify(parsed_story), regenerated_sections)
+        return _record_history(response, 'story', requirement, coverage_analysis, parsed_story)
     
     except Exception as e:
         app.logger.error(f"Story generation error: {str(e)}")
@@ -118,9 +449,13 @@ def export_story(format_type):
         if not story_data:
             return jsonify({'error': 'Story data is required'}), 400
         
-        if format_type not in ['word', 'pdf']:
+        if format_type not in ['word', 'pdf'] and format_type not in TEXT_FORMATS:
             return jsonify({'error': 'Invalid export format'}), 400
         
+        if format_type in TEXT_FORMATS:
+            return _text_export_response('story', format_type, story_data, coverage_data, section_images,
+                                         'user_story')
+        
         # Generate export file with enhanced features
         file_path = story_exporter.export_story(story_data, format_type, coverage_data, section_images)
         
@@ -145,6 +480,83 @@ def export_story(format_type):
         print(f"Error in export_story: {str(e)}")
         return jsonify({'error': f'Export failed: {str(e)}'}), 500
 
+@app.route('/export_bulk', methods=['POST'])
+def export_bulk():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data received'}), 400
+        
+        jobs = parse_export_jobs(data)
+        
+        return Response(
+            stream_bulk_export(jobs),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename="documents.zip"'}
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Bulk export error: {str(e)}")
+        return jsonify({'error': f'Bulk export failed: {str(e)}'}), 500
+
+@app.route('/generate_pack', methods=['POST'])
+def generate_pack():
+    """Analyze a requirement once and generate several document types from it concurrently"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data received'}), 400
+        
+        requirement, document_types, answers, formats = parse_pack_request(data)
+        
+        # Check if groq_client is available
+        if not groq_client:
+            return jsonify({'error': 'GroqClient not initialized'}), 500
+        
+        # Resolved before streaming so a new session cookie still goes out with the headers
+        try:
+            user = _current_user()
+        except Exception as e:
+            app.logger.error(f"History recording error: {str(e)}")
+            user = None
+        
+        def analyze():
+            return _pack_analyses(bulk_client, requirement, document_types)
+        
+        def generate(document_type, result):
+            # Every document shares the requirement and answers; each gets its own analysis digest.
+            # A failed generation comes back as None and is reported instead of streamed as a document
+            return bulk_client.try_generate_document(
+                document_type, requirement, pack_answers(result, answers), digest_coverage_analysis(result)
+            )
+        
+        def record(document_type, result, document):
+            if user is None:
+                return
+            try:
+                record_document(user, document_type, requirement, result.get('coverage_analysis'), document)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"History recording error: {str(e)}")
+        
+        if formats:
+            # Documents are rendered into the archive as soon as each one is generated
+            return Response(
+                stream_with_context(stream_bulk_export(pack_export_jobs(document_types, formats, analyze, generate, record))),
+                mimetype='application/zip',
+                headers={'Content-Disposition': 'attachment; filename="document_pack.zip"'}
+            )
+        return Response(stream_with_context(stream_pack(document_types, analyze, generate, record)),
+                        mimetype='application/x-ndjson')
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Document pack error: {str(e)}")
+        return jsonify({'error': f'Document pack failed: {str(e)}'}), 500
+
 @app.route('/analyze_brd', methods=['POST'])
 def analyze_brd_requirement():   
     try:
@@ -162,7 +574,9 @@ def analyze_brd_requirement():
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
         # Analyze BRD requirement coverage using LLM
-        coverage_analysis = groq_client.analyze_brd_requirement_coverage(requirement)
+        coverage_analysis, similar_analysis = _analyze_with_reuse(
+            'brd', requirement, groq_client.analyze_brd_requirement_coverage, data.get('reuse_analysis', True)
+        )
         
         if not coverage_analysis:
             return jsonify({'error': 'Failed to analyze BRD requirement coverage'}), 500
@@ -175,6 +589,13 @@ def analyze_brd_requirement():
         else:
             result = coverage_analysis
         
+        if similar_analysis:
+            result = dict(result, similar_analysis=similar_analysis)
+        
+        result = _store_analysis(result, 'brd', requirement, coverage_analysis)
+        
+        _speculate('brd', data, requirement, result)
+        
         return jsonify(result)
     
     except Exception as e:
@@ -190,7 +611,6 @@ def generate_brd():
             
         requirement = data.get('requirement', '').strip()
         answers = data.get('answers', {})
-        coverage_analysis = data.get('coverage_analysis', {})
         
         if not requirement:
             return jsonify({'error': 'Requirement text is required'}), 400
@@ -199,13 +619,20 @@ def generate_brd():
         if not groq_client:
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
+        coverage_analysis, prompt_coverage = _coverage_for_generation('brd', data)
+        if coverage_analysis is None:
+            return _analysis_expired_response()
+        
         # Generate BRD using LLM with coverage analysis
-        brd_data = groq_client.generate_brd(requirement, answers, coverage_analysis)
+        brd_data, regenerated_sections = _generate_incrementally(
+            'brd', data, requirement, answers, prompt_coverage, groq_client.generate_brd
+        )
         
         if not brd_data:
             return jsonify({'error': 'Failed to generate BRD'}), 500
         
-        return jsonify(brd_data)
+        response = _regenerated_header(jsonify(brd_data), regenerated_sections)
+        return _record_history(response, 'brd', requirement, coverage_analysis, brd_data)
     
     except Exception as e:
         app.logger.error(f"BRD generation error: {str(e)}")
@@ -222,9 +649,13 @@ def export_brd(format_type):
         if not brd_data:
             return jsonify({'error': 'BRD data is required'}), 400
         
-        if format_type not in ['word', 'pdf']:
+        if format_type not in ['word', 'pdf'] and format_type not in TEXT_FORMATS:
             return jsonify({'error': 'Invalid export format'}), 400
         
+        if format_type in TEXT_FORMATS:
+            return _text_export_response('brd', format_type, brd_data, coverage_data, section_images,
+                                         'business_requirements_document')
+        
         # Generate BRD export file with enhanced features
         file_path = story_exporter.export_brd(brd_data, format_type, coverage_data, section_images)
         
@@ -266,7 +697,9 @@ def analyze_frd_requirement():
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
         # Analyze FRD requirement coverage using LLM
-        coverage_analysis = groq_client.analyze_frd_requirement_coverage(requirement)
+        coverage_analysis, similar_analysis = _analyze_with_reuse(
+            'frd', requirement, groq_client.analyze_frd_requirement_coverage, data.get('reuse_analysis', True)
+        )
         
         if not coverage_analysis:
             return jsonify({'error': 'Failed to analyze FRD requirement coverage'}), 500
@@ -279,6 +712,13 @@ def analyze_frd_requirement():
         else:
             result = coverage_analysis
         
+        if similar_analysis:
+            result = dict(result, similar_analysis=similar_analysis)
+        
+        result = _store_analysis(result, 'frd', requirement, coverage_analysis)
+        
+        _speculate('frd', data, requirement, result)
+        
         return jsonify(result)
     
     except Exception as e:
@@ -294,7 +734,6 @@ def generate_frd():
             
         requirement = data.get('requirement', '').strip()
         answers = data.get('answers', {})
-        coverage_analysis = data.get('coverage_analysis', {})
         
         if not requirement:
             return jsonify({'error': 'Requirement text is required'}), 400
@@ -303,13 +742,20 @@ def generate_frd():
         if not groq_client:
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
+        coverage_analysis, prompt_coverage = _coverage_for_generation('frd', data)
+        if coverage_analysis is None:
+            return _analysis_expired_response()
+        
         # Generate FRD using LLM with coverage analysis
-        frd_data = groq_client.generate_frd(requirement, answers, coverage_analysis)
+        frd_data, regenerated_sections = _generate_incrementally(
+            'frd', data, requirement, answers, prompt_coverage, groq_client.generate_frd
+        )
         
         if not frd_data:
             return jsonify({'error': 'Failed to generate FRD'}), 500
         
-        return jsonify(frd_data)
+        response = _regenerated_header(jsonify(frd_data), regenerated_sections)
+        return _record_history(response, 'frd', requirement, coverage_analysis, frd_data)
     
     except Exception as e:
         app.logger.error(f"FRD generation error: {str(e)}")
@@ -326,9 +772,13 @@ def export_frd(format_type):
         if not frd_data:
             return jsonify({'error': 'FRD data is required'}), 400
         
-        if format_type not in ['word', 'pdf']:
+        if format_type not in ['word', 'pdf'] and format_type not in TEXT_FORMATS:
             return jsonify({'error': 'Invalid export format'}), 400
         
+        if format_type in TEXT_FORMATS:
+            return _text_export_response('frd', format_type, frd_data, coverage_data, section_images,
+                                         'functional_requirements_document')
+        
         # Generate FRD export file with enhanced features
         file_path = story_exporter.export_frd(frd_data, format_type, coverage_data, section_images)
         
@@ -370,7 +820,9 @@ def analyze_srd_requirement():
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
         # Analyze SRD requirement coverage using LLM
-        coverage_analysis = groq_client.analyze_srd_requirement_coverage(requirement)
+        coverage_analysis, similar_analysis = _analyze_with_reuse(
+            'srd', requirement, groq_client.analyze_srd_requirement_coverage, data.get('reuse_analysis', True)
+        )
         
         if not coverage_analysis:
             return jsonify({'error': 'Failed to analyze SRD requirement coverage'}), 500
@@ -383,6 +835,13 @@ def analyze_srd_requirement():
         else:
             result = coverage_analysis
         
+        if similar_analysis:
+            result = dict(result, similar_analysis=similar_analysis)
+        
+        result = _store_analysis(result, 'srd', requirement, coverage_analysis)
+        
+        _speculate('srd', data, requirement, result)
+        
         return jsonify(result)
     
     except Exception as e:
@@ -398,7 +857,6 @@ def generate_srd():
             
         requirement = data.get('requirement', '').strip()
         answers = data.get('answers', {})
-        coverage_analysis = data.get('coverage_analysis', {})
         
         if not requirement:
             return jsonify({'error': 'Requirement text is required'}), 400
@@ -407,13 +865,20 @@ def generate_srd():
         if not groq_client:
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
+        coverage_analysis, prompt_coverage = _coverage_for_generation('srd', data)
+        if coverage_analysis is None:
+            return _analysis_expired_response()
+        
         # Generate SRD using LLM with coverage analysis
-        srd_data = groq_client.generate_srd(requirement, answers, coverage_analysis)
+        srd_data, regenerated_sections = _generate_incrementally(
+            'srd', data, requirement, answers, prompt_coverage, groq_client.generate_srd
+        )
         
         if not srd_data:
             return jsonify({'error': 'Failed to generate SRD'}), 500
         
-        return jsonify(srd_data)
+        response = _regenerated_header(jsonify(srd_data), regenerated_sections)
+        return _record_history(response, 'srd', requirement, coverage_analysis, srd_data)
     
     except Exception as e:
         app.logger.error(f"SRD generation error: {str(e)}")
@@ -449,7 +914,9 @@ def analyze_cr_requirement():
         enhanced_requirement = requirement + attachment_context
         
         # Analyze CR requirement coverage using LLM
-        coverage_analysis = groq_client.analyze_cr_requirement_coverage(enhanced_requirement)
+        coverage_analysis, similar_analysis = _analyze_with_reuse(
+            'cr', enhanced_requirement, groq_client.analyze_cr_requirement_coverage, data.get('reuse_analysis', True)
+        )
         
         if not coverage_analysis:
             return jsonify({'error': 'Failed to analyze CR requirement coverage'}), 500
@@ -462,6 +929,13 @@ def analyze_cr_requirement():
         else:
             result = coverage_analysis
         
+        if similar_analysis:
+            result = dict(result, similar_analysis=similar_analysis)
+        
+        result = _store_analysis(result, 'cr', enhanced_requirement, coverage_analysis)
+        
+        _speculate('cr', data, requirement, result)
+        
         return jsonify(result)
     
     except Exception as e:
@@ -477,7 +951,6 @@ def generate_cr():
             
         requirement = data.get('requirement', '').strip()
         answers = data.get('answers', {})
-        coverage_analysis = data.get('coverage_analysis', {})
         
         if not requirement:
             return jsonify({'error': 'Requirement text is required'}), 400
@@ -486,13 +959,20 @@ def generate_cr():
         if not groq_client:
             return jsonify({'error': 'GroqClient not initialized'}), 500
         
+        coverage_analysis, prompt_coverage = _coverage_for_generation('cr', data)
+        if coverage_analysis is None:
+            return _analysis_expired_response()
+        
         # Generate CR using LLM with coverage analysis
-        cr_data = groq_client.generate_cr(requirement, answers, coverage_analysis)
+        cr_data, regenerated_sections = _generate_incrementally(
+            'cr', data, requirement, answers, prompt_coverage, groq_client.generate_cr
+        )
         
         if not cr_data:
             return jsonify({'error': 'Failed to generate CR'}), 500
         
-        return jsonify(cr_data)
+        response = _regenerated_header(jsonify(cr_data), regenerated_sections)
+        return _record_history(response, 'cr', requirement, coverage_analysis, cr_data)
     
     except Exception as e:
         app.logger.error(f"CR generation error: {str(e)}")
@@ -509,9 +989,13 @@ def export_srd(format_type):
         if not srd_data:
             return jsonify({'error': 'SRD data is required'}), 400
         
-        if format_type not in ['word', 'pdf']:
+        if format_type not in ['word', 'pdf'] and format_type not in TEXT_FORMATS:
             return jsonify({'error': 'Invalid export format'}), 400
         
+        if format_type in TEXT_FORMATS:
+            return _text_export_response('srd', format_type, srd_data, coverage_data, section_images,
+                                         'system_requirements_document')
+        
         # Generate SRD export file with enhanced features
         file_path = story_exporter.export_srd(srd_data, format_type, coverage_data, section_images)
         
@@ -536,9 +1020,265 @@ def export_srd(format_type):
         print(f"Error in export_srd: {str(e)}")
         return jsonify({'error': f'SRD Export failed: {str(e)}'}), 500
 
+@app.route('/export_cr/<format_type>', methods=['POST'])
+def export_cr(format_type):
+    try:
+        data = request.get_json()
+        cr_data = data.get('cr_data')
+        coverage_data = data.get('coverage_data')
+        section_images = data.get('section_images', {})
+
+        if not cr_data:
+            return jsonify({'error': 'CR data is required'}), 400
+
+        if format_type not in ['word', 'pdf'] and format_type not in TEXT_FORMATS:
+            return jsonify({'error': 'Invalid export format'}), 400
+
+        if format_type in TEXT_FORMATS:
+            return _text_export_response('cr', format_type, cr_data, coverage_data, section_images,
+                                         'change_request_document')
+
+        # Generate CR export file with enhanced features
+        file_path = story_exporter.export_cr(cr_data, format_type, coverage_data, section_images)
+
+        if not file_path or not os.path.exists(file_path):
+            return jsonify({'error': 'CR Export failed'}), 500
+
+        # Determine MIME type
+        mime_types = {
+            'word': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            'pdf': 'application/pdf'
+        }
+
+        return send_file(
+            file_path,
+            as_attachment=True,
+            download_name=f"change_request_document.{format_type if format_type != 'word' else 'docx'}",
+            mimetype=mime_types[format_type]
+        )
+
+    except Exception as e:
+        app.logger.error(f"CR Export error: {str(e)}")
+        print(f"Error in export_cr: {str(e)}")
+        return jsonify({'error': f'CR Export failed: {str(e)}'}), 500
+
+@app.route('/preview/<document_type>', methods=['POST'])
+def preview_document(document_type):
+    try:
+        if document_type not in ['story', 'brd', 'frd', 'srd', 'cr']:
+            return jsonify({'error': 'Invalid document type'}), 400
+        
+        data = request.get_json()
+        document_data = data.get(f'{document_type}_data')
+        if not document_data:
+            return jsonify({'error': 'Document data is required'}), 400
+        
+        format_type = request.args.get('format', 'png')
+        if format_type not in PREVIEW_FORMATS:
+            return jsonify({'error': 'Invalid preview format'}), 400
+        width = request.args.get('width', type=int)
+        
+        # Pagination is cached by document hash; pages render when first requested
+        preview, cached = preview_cache.get_or_create(
+            document_type, document_data, data.get('coverage_data'), data.get('section_images', {})
+        )
+        headers = {'X-Preview-Id': preview.preview_id, 'X-Preview-Cache': 'hit' if cached else 'miss'}
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            return Response(stream_preview(preview, format_type, width),
+                            mimetype='application/x-ndjson', headers=headers)
+        return jsonify(preview_manifest(preview, format_type, width)), 200, headers
+    
+    except Exception as e:
+        app.logger.error(f"Preview error: {str(e)}")
+        return jsonify({'error': f'Preview failed: {str(e)}'}), 500
+
+@app.route('/preview/<preview_id>/<int:page_number>.<format_type>', methods=['GET'])
+def preview_page(preview_id, page_number, format_type):
+    try:
+        preview = preview_cache.get(preview_id)
+        if not preview:
+            return jsonify({'error': 'Unknown or expired preview'}), 404
+        if format_type not in PREVIEW_FORMATS:
+            return jsonify({'error': 'Invalid preview format'}), 400
+        
+        width = request.args.get('width', type=int)
+        # Page content is fixed by the document hash, so browsers may cache it indefinitely
+        etag = f'"{preview_id}-{page_number}-{format_type}-{width or 0}"'
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
+        
+        thumbnail = preview.thumbnail(page_number, format_type, width)
+        return Response(thumbnail, mimetype=PREVIEW_FORMATS[format_type], headers={
+            'ETag': etag,
+            'Cache-Control': 'private, max-age=86400, immutable',
+            'X-Page-Count': str(preview.page_count)
+        })
+    
+    except IndexError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        app.logger.error(f"Preview page error: {str(e)}")
+        return jsonify({'error': f'Preview failed: {str(e)}'}), 500
+
+@app.route('/tracker/push', methods=['POST'])
+def push_to_tracker():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data received'}), 400
+        
+        stories = data.get('stories') or ([data['story_data']] if data.get('story_data') else [])
+        # Clients may only pick TRACKER_PROJECT or one of TRACKER_ALLOWED_PROJECTS
+        project = resolve_project(data.get('project'))
+        issues = issues_from_documents(stories, data.get('brd_data'), project)
+        if not issues:
+            return jsonify({'error': 'No stories or business requirements to push'}), 400
+        
+        connector = get_connector(data.get('tracker_type'), project=project)
+        results = connector.push(issues)
+        
+        return jsonify({
+            'summary': push_summary(results),
+            'results': results,
+            'tracker_calls': connector.calls
+        })
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except TrackerError as e:
+        app.logger.error(f"Tracker push error: {str(e)}")
+        return jsonify({'error': f'Tracker push failed: {str(e)}'}), 502
+    except Exception as e:
+        app.logger.error(f"Tracker push error: {str(e)}")
+        return jsonify({'error': f'Tracker push failed: {str(e)}'}), 500
+
+@app.route('/history', methods=['GET'])
+def document_history():
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        cursor = request.args.get('cursor')
+        status = request.args.get('status')
+        document_type = request.args.get('document_type')
+        
+        user = _current_user()
+        documents, next_cursor = list_documents(user.id, limit, cursor, status, document_type)
+        
+        return jsonify({'documents': documents, 'next_cursor': next_cursor})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"History error: {str(e)}")
+        return jsonify({'error': f'History lookup failed: {str(e)}'}), 500
+
+@app.route('/history/<int:document_id>', methods=['GET'])
+def document_history_item(document_id):
+    try:
+        story = get_document(_current_user().id, document_id)
+        
+        if not story:
+            return jsonify({'error': 'Document not found'}), 404
+        
+        return jsonify(story.to_dict())
+    
+    except Exception as e:
+        app.logger.error(f"History error: {str(e)}")
+        return jsonify({'error': f'History lookup failed: {str(e)}'}), 500
+
+@app.route('/search', methods=['GET'])
+def search_history():
+    try:
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', 20, type=int)
+        document_type = request.args.get('document_type')
+        
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+        
+        results = search_documents(_current_user().id, query, limit, document_type)
+        
+        return jsonify({'query': query, 'results': results})
+    
+    except SearchUnavailable as e:
+        return jsonify({'error': str(e)}), 501
+    except Exception as e:
+        app.logger.error(f"Search error: {str(e)}")
+        return jsonify({'error': f'Search failed: {str(e)}'}), 500
+
+@app.route('/batch/analyze', methods=['POST'])
+def batch_analyze():
+    try:
+        document_type = request.values.get('document_type', 'story')
+        analyzers = {
+            'story': bulk_client.analyze_requirement_coverage,
+            'brd': bulk_client.analyze_brd_requirement_coverage,
+            'frd': bulk_client.analyze_frd_requirement_coverage,
+            'srd': bulk_client.analyze_srd_requirement_coverage,
+            'cr': bulk_client.analyze_cr_requirement_coverage
+        }
+        
+        if document_type not in analyzers:
+            return jsonify({'error': 'Invalid document type'}), 400
+        
+        upload = request.files.get('file')
+        if upload:
+            content = upload.read().decode('utf-8-sig')
+            format_type = request.values.get('format') or detect_format(upload.filename, upload.mimetype, content)
+        else:
+            content = request.get_data(as_text=True)
+            format_type = request.values.get('format') or detect_format(None, request.content_type, content)
+        
+        rows = parse_batch_rows(content, format_type)
+        if not rows:
+            return jsonify({'error': 'No requirements found in batch'}), 400
+        
+        batch_id = request.values.get('batch_id') or make_batch_id(document_type, content)
+        concurrency = request.values.get('concurrency', MAX_CONCURRENCY, type=int)
+        replay_completed = request.values.get('replay', 'true').lower() != 'false'
+        
+        # Batches belong to the session that started them
+        owner = _session_id()
+        
+        def analyze(requirement):
+            # Rows run on worker threads, outside the request context
+            coverage_analysis, _ = _analyze_with_reuse(document_type, requirement, analyzers[document_type], owner=owner)
+            return coverage_analysis
+        
+        return Response(
+            stream_batch(batch_id, rows, analyze, concurrency, replay_completed, owner, document_type),
+            mimetype='application/x-ndjson',
+            headers={'X-Batch-Id': batch_id}
+        )
+    
+    except BatchConflict as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Batch analysis error: {str(e)}")
+        return jsonify({'error': f'Batch analysis failed: {str(e)}'}), 500
+
+@app.route('/batch/<batch_id>', methods=['GET'])
+def batch_status(batch_id):
+    # Only the session that started a batch can see it
+    session_id = session.get('session_id')
+    progress = batch_progress(batch_id, session_id) if session_id else None
+    if not progress:
+        return jsonify({'error': 'Unknown or expired batch'}), 404
+    return jsonify(progress)
+
 @app.route('/health')
 def health_check():
-    return jsonify({'status': 'healthy', 'groq_configured': bool(os.getenv('GROQ_API_KEY'))})
+    return jsonify({
+        'status': 'healthy',
+        'groq_configured': bool(os.getenv('GROQ_API_KEY')),
+        'prompt_version': prompt_registry.version,
+        'prompts': prompt_registry.versions(),
+        'llm_hedging': groq_client.hedger.stats() if groq_client else None,
+        'llm_providers': provider_stats(),
+        'speculation': speculative_generator.stats()
+    })
 
 if __name__ == '__main__':
     debug_mode = os.getenv('FLASK_ENV') == 'development'
@@ -0,0 +1,235 @@
+"""
+Batch Analysis
+Bulk requirement analysis streamed back as NDJSON, resumable by batch id
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+MAX_CONCURRENCY = int(os.getenv('BATCH_ANALYZE_MAX_CONCURRENCY', '4'))
+MAX_ROWS = int(os.getenv('BATCH_ANALYZE_MAX_ROWS', '1000'))
+PROGRESS_TTL_SECONDS = int(os.getenv('BATCH_PROGRESS_TTL', '3600'))
+
+REQUIREMENT_COLUMNS = ('requirement', 'requirements', 'description', 'text')
+
+def detect_format(filename=None, content_type=None, content=''):
+    """Work out whether an upload is CSV or JSONL"""
+    name = (filename or '').lower()
+    if name.endswith('.csv') or 'csv' in (content_type or ''):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')) or 'ndjson' in (content_type or '') or 'jsonl' in (content_type or ''):
+        return 'jsonl'
+    first_line = content.lstrip().split('\n', 1)[0].strip()
+    return 'jsonl' if first_line.startswith(('{', '"')) else 'csv'
+
+def parse_batch_rows(content, format_type):
+    """Parse an uploaded backlog into a list of (row_id, requirement) pairs"""
+    rows = []
+    if format_type == 'jsonl':
+        for line_number, line in enumerate(content.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}") from e
+            if isinstance(item, str):
+                rows.append((str(line_number), item.strip()))
+            elif isinstance(item, dict):
+                requirement = next((item[c] for c in REQUIREMENT_COLUMNS if item.get(c)), '')
+                rows.append((str(item.get('id', line_number)), str(requirement).strip()))
+            else:
+                raise ValueError(f"Line {line_number} must be a JSON object or string")
+    elif format_type == 'csv':
+        reader = csv.reader(io.StringIO(content))
+        header = next(reader, None)
+        if header is None:
+            return rows
+        lowered = [column.strip().lower() for column in header]
+        requirement_index = next((lowered.index(c) for c in REQUIREMENT_COLUMNS if c in lowered), None)
+        id_index = lowered.index('id') if 'id' in lowered else None
+        if requirement_index is None:
+            # No recognised header: treat the first column of every line as the requirement
+            reader = csv.reader(io.StringIO(content))
+            requirement_index = 0
+        for line_number, record in enumerate(reader, 1):
+            if len(record) <= requirement_index or not record[requirement_index].strip():
+                continue
+            row_id = record[id_index] if id_index is not None and len(record) > id_index else str(line_number)
+            rows.append((row_id, record[requirement_index].strip()))
+    else:
+        raise ValueError(f"Unsupported batch format: {format_type}")
+
+    rows = [row for row in rows if row[1]]
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f"Batch has {len(rows)} requirements; the limit is {MAX_ROWS}")
+    return rows
+
+def make_batch_id(document_type, content):
+    """Stable batch id, so re-uploading the same backlog resumes it"""
+    digest = hashlib.sha256(f"{document_type}\n{content}".encode('utf-8')).hexdigest()
+    return digest[:16]
+
+def batch_fingerprint(document_type, rows):
+    """Hash of what a batch analyzes; results are only replayed for the same fingerprint"""
+    return make_batch_id(document_type, json.dumps(rows, separators=(',', ':')))
+
+class BatchConflict(ValueError):
+    """A batch id reused for a different backlog"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_batch_executor():
+    """Pool shared by every batch, so MAX_CONCURRENCY caps analyses process-wide"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix='batch-analyze')
+        return _executor
+
+class BatchState:
+    """Completed results, queued rows and in-flight work of one batch"""
+
+    def __init__(self, fingerprint=None):
+        self.lock = threading.RLock()
+        self.fingerprint = fingerprint
+        self.results = {}
+        self.futures = {}
+        self.queue = deque()
+        self.running = 0
+        self.touched = time.time()
+
+    def enqueue(self, analyze, index, row_id, requirement):
+        """Queue a row; the returned future resolves with its result"""
+        future = Future()
+        with self.lock:
+            self.futures[index] = future
+            self.queue.append((future, analyze, index, row_id, requirement))
+        future.add_done_callback(lambda f: self.record(index, f))
+        return future
+
+    def pump(self, executor, concurrency):
+        """Start queued rows while fewer than concurrency of this batch are running"""
+        with self.lock:
+            while self.queue and self.running < concurrency:
+                self.running += 1
+                executor.submit(self._run, executor, concurrency, *self.queue.popleft())
+
+    def _run(self, executor, concurrency, future, analyze, index, row_id, requirement):
+        result = _analyze_row(analyze, index, row_id, requirement)
+        with self.lock:
+            self.running -= 1
+        future.set_result(result)
+        # Queued rows keep starting after the client disconnects
+        self.pump(executor, concurrency)
+
+    def record(self, index, future):
+        """Keep a finished row; failed rows are forgotten so a resume retries them"""
+        result = future.result()
+        with self.lock:
+            self.futures.pop(index, None)
+            if result.get('status') == 'ok':
+                self.results[index] = result
+            self.touched = time.time()
+
+class BatchProgressStore:
+    """In-process batch progress per owner (browser session), expired after a period of inactivity"""
+
+    def __init__(self, ttl_seconds=PROGRESS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def get(self, owner, batch_id, fingerprint=None, create=True):
+        """State of an owner's batch; raises BatchConflict if the id was used for other rows"""
+        key = (owner, batch_id)
+        with self._lock:
+            now = time.time()
+            expired = [stored for stored, state in self._batches.items()
+                       if not state.futures and now - state.touched > self.ttl_seconds]
+            for stored in expired:
+                del self._batches[stored]
+            state = self._batches.get(key)
+            if state is not None and fingerprint and state.fingerprint != fingerprint:
+                raise BatchConflict(f"Batch {batch_id} was started with a different backlog")
+            if state is None and create:
+                state = self._batches[key] = BatchState(fingerprint)
+            return state
+
+progress_store = BatchProgressStore()
+
+def _analyze_row(analyze, index, row_id, requirement):
+    """Analyze one row, turning failures into an error result"""
+    try:
+        coverage_analysis = analyze(requirement)
+        if not coverage_analysis:
+            raise ValueError("Empty analysis result")
+        return {'row': index, 'id': row_id, 'status': 'ok', 'coverage_analysis': coverage_analysis}
+    except Exception as e:
+        return {'row': index, 'id': row_id, 'status': 'error', 'error': str(e)}
+
+def _ndjson(item):
+    return json.dumps(item, separators=(',', ':')) + '\n'
+
+def stream_batch(batch_id, rows, analyze, concurrency=MAX_CONCURRENCY, replay_completed=True,
+                 owner=None, document_type='', executor=None):
+    """Analyze rows with bounded concurrency, yielding NDJSON lines as rows finish.
+
+    Work keeps running if the client disconnects; re-submitting the same
+    batch id from the same owner replays (or skips) finished rows and only
+    analyzes the rest. Reusing the id for different rows raises
+    BatchConflict before anything is streamed.
+    """
+    state = progress_store.get(owner, batch_id, batch_fingerprint(document_type, rows))
+    concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+    executor = executor or get_batch_executor()
+
+    futures = {}
+    with state.lock:
+        completed = {index: result for index, result in state.results.items() if index < len(rows)}
+        for index, (row_id, requirement) in enumerate(rows):
+            if index in completed:
+                continue
+            # Rows still queued or running from an interrupted request are joined, not re-run
+            future = state.futures.get(index) or state.enqueue(analyze, index, row_id, requirement)
+            futures[future] = index
+        state.pump(executor, concurrency)
+
+    return _stream_results(batch_id, len(rows), completed, futures, replay_completed)
+
+def _stream_results(batch_id, total, completed, futures, replay_completed):
+    succeeded = len(completed)
+    failed = 0
+    yield _ndjson({'event': 'start', 'batch_id': batch_id, 'total': total,
+                   'completed': len(completed), 'pending': len(futures)})
+
+    if replay_completed:
+        for index in sorted(completed):
+            yield _ndjson(dict(completed[index], resumed=True))
+
+    for future in as_completed(futures):
+        result = future.result()
+        if result['status'] == 'ok':
+            succeeded += 1
+        else:
+            failed += 1
+        yield _ndjson(result)
+
+    yield _ndjson({'event': 'complete', 'batch_id': batch_id, 'total': total,
+                   'succeeded': succeeded, 'failed': failed})
+
+def batch_progress(batch_id, owner=None):
+    """Summary of an owner's batch, or None if it is unknown or expired"""
+    state = progress_store.get(owner, batch_id, create=False)
+    if state is None:
+        return None
+    with state.lock:
+        return {'batch_id': batch_id, 'completed': len(state.results), 'in_flight': len(state.futures)}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmark
+Wall-clock budgets the test suite leaves out: hedged tail latency, paced
+cassette replay, text export rendering, prompt rendering and local analysis
+
+Usage: python bench_hot_paths.py [--repeat 200]
+
+Each check prints its measurement next to its budget. Exits with status 1
+if any of them is over budget.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from constants import DEFAULT_COVERAGE_ANALYSIS
+from llm_providers import CassetteProvider, LLMProvider
+from local_analyzer import local_coverage_analysis
+from offline_llm import offline_client
+from prompt_registry import prompt_registry
+from request_hedging import RequestHedger
+from text_exporters import TEXT_FORMATS, stream_text_export
+
+DOCUMENT_TYPES = ('story', 'brd', 'frd', 'srd', 'cr')
+REQUIREMENT = "As a finance analyst I want to export approved invoices as CSV so that I can reconcile payments"
+MESSAGES = [{"role": "user", "content": REQUIREMENT}]
+
+class DelayedProvider(LLMProvider):
+    """Answers after a fixed delay"""
+
+    name = 'delayed'
+
+    def __init__(self, delay):
+        super().__init__('delayed-model', 1)
+        self.delay = delay
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        time.sleep(self.delay)
+        return '{}'
+
+def _p99(latencies):
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+def _timed(call, *args):
+    started = time.perf_counter()
+    call(*args)
+    return time.perf_counter() - started
+
+def hedged_tail():
+    """p99 of 100 calls with a 4% slow tail, without and with hedging"""
+    def upstream(index, attempt):
+        time.sleep(0.2 if index % 25 == 24 and attempt == 'primary' else 0.002)
+        return attempt
+
+    unhedged = RequestHedger(enabled=False)
+    hedger = RequestHedger(enabled=True, min_delay=0.01, initial_delay=0.05, max_rate=0.05, workers=4)
+    plain = [_timed(unhedged.call, 'kind', upstream, (index, 'primary')) for index in range(100)]
+    hedged = [_timed(hedger.call, 'kind', upstream, (index, 'primary'), (index, 'hedge')) for index in range(100)]
+    return [('hedging: unhedged p99', _p99(plain), None), ('hedging: hedged p99', _p99(hedged), 0.1)]
+
+def paced_replay():
+    """Replay of a 0.1s completion at pacing 0 and 0.5"""
+    path = os.path.join(tempfile.mkdtemp(), 'bench.jsonl.gz')
+    recorder = CassetteProvider(path, 'record', DelayedProvider(0.1))
+    recorder.complete(MESSAGES)
+    recorder.cassette.close()
+    return [(f'cassette: pacing {pacing:g}', _timed(CassetteProvider(path, 'replay', pacing=pacing).complete, MESSAGES),
+             budget) for pacing, budget in ((0, 0.05), (0.5, 0.1))]
+
+def text_exports():
+    """Slowest render of each text format across the document types"""
+    client = offline_client()
+    documents = {document_type: client._get_default_document(document_type) for document_type in DOCUMENT_TYPES}
+    return [(f'export: {format_type}',
+             max(_timed(list, stream_text_export(document_type, format_type, data, DEFAULT_COVERAGE_ANALYSIS))
+                 for document_type, data in documents.items()), 0.05)
+            for format_type in TEXT_FORMATS]
+
+def prompt_render(repeat):
+    """Mean time to render the largest generation prompt"""
+    template = prompt_registry.get('generate_cr.txt')
+    values = {'requirement': 'r' * 300, 'answers': 'a' * 300, 'coverage_analysis': 'c' * 500}
+    seconds = _timed(lambda: [template.render(**values) for _ in range(repeat)])
+    return [('prompt render', seconds / repeat, 0.0005)]
+
+def local_analysis(repeat):
+    """Mean time of a keystroke pre-analysis"""
+    seconds = _timed(lambda: [local_coverage_analysis('brd', REQUIREMENT) for _ in range(repeat)])
+    return [('local analysis', seconds / repeat, 0.001)]
+
+def main():
+    """Run every check and print a summary table"""
+    parser = argparse.ArgumentParser(description='Latency budgets of hot paths')
+    parser.add_argument('--repeat', type=int, default=200, help='repetitions of the per-call checks')
+    args = parser.parse_args()
+
+    print("⏱️ HOT PATH BENCHMARK")
+    print("=" * 64)
+    results = hedged_tail() + paced_replay() + text_exports() + prompt_render(args.repeat) + local_analysis(args.repeat)
+    over = 0
+    print(f"{'check':<26} {'ms':>9} {'budget ms':>10}")
+    for name, seconds, budget in results:
+        status = ''
+        if budget is not None:
+            status = 'ok' if seconds < budget else 'OVER'
+            over += seconds >= budget
+        budget_text = f"{budget * 1000:.1f}" if budget is not None else '-'
+        print(f"{name:<26} {seconds * 1000:>9.2f} {budget_text:>10} {status}")
+    if over:
+        print(f"\n{over} checks over budget")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Latency of the analyze, generate and export routes with LLM calls replayed from a cassette
+
+Usage: python bench_pipeline.py [--requests 20] [--workers 4] [--pacing 1.0] [--cassette PATH] [--record]
+
+Record once against the configured provider with --record (LLM_CASSETTE_SOURCE,
+groq by default); later runs replay the same completions, so results only
+change when the code does. Exits with status 1 if a replayed request was
+never recorded.
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+STAGES = ('analyze', 'generate', 'export')
+
+ACTORS = ('customer', 'warehouse manager', 'finance analyst', 'support agent', 'administrator')
+GOALS = ('export my order history as CSV', 'reset my password through an emailed link',
+         'approve refunds above a configurable limit', 'see stock levels per region on a dashboard',
+         'assign incoming tickets by product area', 'schedule monthly revenue reports')
+REASONS = ('reconcile invoices', 'regain access without calling support', 'keep fraud losses down',
+           'plan replenishment', 'answer customers faster', 'close the books on time')
+
+def requirements(count):
+    """Distinct requirements, identical on every run so their requests hash the same"""
+    combinations = list(itertools.product(ACTORS, GOALS, REASONS))
+    # Stepping by a stride coprime with the number of combinations spreads neighbours apart
+    picks = [combinations[(i * 7) % len(combinations)] for i in range(count)]
+    return [f"As a {actor} I want to {goal} so that I can {reason}"
+            + (f" (round {i // len(combinations) + 1})" if i >= len(combinations) else '')
+            for i, (actor, goal, reason) in enumerate(picks)]
+
+def run_pipeline(app, requirement):
+    """Analyze, generate and export one story; returns the seconds each stage took"""
+    from speculation import suggested_answers
+
+    client = app.test_client()
+    timings = {}
+
+    started = time.perf_counter()
+    # Reuse would make the LLM calls depend on how the workers interleave
+    analysis = client.post('/analyze', json={'requirement': requirement, 'reuse_analysis': False}).get_json()
+    timings['analyze'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    story = client.post('/generate', json={'requirement': requirement, 'analysis_id': analysis.get('analysis_id'),
+                                           'answers': suggested_answers(analysis)}).get_json()
+    timings['generate'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    client.post('/export/markdown', json={'story_data': story, 'coverage_data': analysis.get('coverage_analysis')})
+    timings['export'] = time.perf_counter() - started
+    return timings
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'calls': len(samples),
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000
+    }
+
+def main():
+    """Run the pipeline for every requirement and print a summary table"""
+    parser = argparse.ArgumentParser(description='Analyze/generate/export benchmark on recorded LLM completions')
+    parser.add_argument('--requests', type=int, default=20, help='requirements to run through the pipeline')
+    parser.add_argument('--workers', type=int, default=4, help='pipelines run at once')
+    parser.add_argument('--pacing', type=float, default=1.0, help='replay delay as a multiple of the recorded time')
+    parser.add_argument('--cassette', default='llm_cassette.jsonl.gz', help='cassette file')
+    parser.add_argument('--record', action='store_true', help='call the real provider and record its completions')
+    args = parser.parse_args()
+
+    # Provider settings are read at import time, so they go into the environment before the app is loaded
+    os.environ['LLM_PROVIDER'] = 'cassette'
+    os.environ['LLM_BULK_PROVIDER'] = ''
+    os.environ['LLM_CASSETTE'] = args.cassette
+    os.environ['LLM_CASSETTE_MODE'] = 'record' if args.record else 'replay'
+    os.environ['LLM_CASSETTE_PACING'] = str(args.pacing)
+    os.environ.setdefault('SECRET_KEY', 'bench')
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+    from app import app
+    from llm_providers import get_provider
+
+    print("⏱️ PIPELINE BENCHMARK")
+    print("=" * 64)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        runs = list(pool.map(lambda requirement: run_pipeline(app, requirement), requirements(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{'stage':<10} {'calls':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for stage in STAGES:
+        result = summarize([run[stage] for run in runs])
+        print(f"{stage:<10} {result['calls']:>6} {result['mean_ms']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f}")
+
+    stats = get_provider('cassette').stats()
+    print(f"\n{args.requests} pipelines in {elapsed:.2f}s ({stats['mode']}: {stats['entries']} completions in "
+          f"{stats['cassette']}, {stats['hits']} replayed, {stats['misses']} missing)")
+    if stats['misses']:
+        print("Some requests are not in the cassette; record it again with --record")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Prefix Cache Benchmark
+Time to first token of the inline and prefix prompt layouts against the fake
+completions server, which charges prefill time only for uncached tokens
+
+Usage: python bench_prefix_cache.py [--requests 50] [--prefill-us 50]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from analysis_sessions import digest_coverage_analysis
+from constants import DEFAULT_COVERAGE_ANALYSIS
+from fake_completions_server import start_fake_completions
+from offline_llm import offline_client
+
+DOCUMENT_TYPES = ('story', 'brd', 'frd', 'srd', 'cr')
+ANALYSIS_PROMPTS = {
+    'story': 'analyze_requirement.txt',
+    'brd': 'analyze_brd_requirement.txt',
+    'frd': 'analyze_frd_requirement.txt',
+    'srd': 'analyze_srd_requirement.txt',
+    'cr': 'analyze_cr_requirement.txt'
+}
+
+def prompt_only_client(layout):
+    """Offline GroqClient used only to assemble messages in a given layout"""
+    client = offline_client()
+    client.PROMPT_LAYOUT = layout
+    return client
+
+def workload(client, count):
+    """Analyze and generate requests for count distinct requirements, cycling document types"""
+    digest = digest_coverage_analysis(DEFAULT_COVERAGE_ANALYSIS)
+    requests = []
+    for i in range(count):
+        document_type = DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)]
+        requirement = f"Requirement {i}: customers in region {i % 7} can export their order history as CSV"
+        requests.append(client._prompt_messages(ANALYSIS_PROMPTS[document_type], "You are an expert analyst.",
+                                                requirement=requirement))
+        requests.append(client._build_generation_messages(document_type, requirement,
+                                                          {'Security': f'Role check {i}'}, digest))
+    return requests
+
+def time_to_first_token(base_url, messages):
+    """Seconds until the first streamed content chunk, plus the reported usage"""
+    body = json.dumps({'model': 'fake', 'messages': messages, 'stream': True}).encode('utf-8')
+    request = urllib.request.Request(f"{base_url}/chat/completions", data=body,
+                                     headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    first_token, usage = None, {}
+    with urllib.request.urlopen(request, timeout=60) as response:
+        for line in response:
+            line = line.decode('utf-8').strip()
+            if not line.startswith('data: ') or line == 'data: [DONE]':
+                continue
+            chunk = json.loads(line[6:])
+            if first_token is None and chunk['choices'][0]['delta'].get('content'):
+                first_token = time.perf_counter() - started
+            usage = chunk.get('usage') or usage
+    return first_token, usage
+
+def run_layout(layout, count, **server_options):
+    """Run the workload in one layout against a fresh (cold) fake server"""
+    server, _, base_url = start_fake_completions(**server_options)
+    try:
+        ttfts, prompt_tokens, cached_tokens = [], 0, 0
+        for messages in workload(prompt_only_client(layout), count):
+            ttft, usage = time_to_first_token(base_url, messages)
+            ttfts.append(ttft)
+            prompt_tokens += usage.get('prompt_tokens', 0)
+            cached_tokens += usage.get('prompt_tokens_details', {}).get('cached_tokens', 0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    ttfts.sort()
+    return {
+        'layout': layout,
+        'requests': len(ttfts),
+        'mean_ms': statistics.mean(ttfts) * 1000,
+        'p50_ms': ttfts[len(ttfts) // 2] * 1000,
+        'p95_ms': ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))] * 1000,
+        'cached_ratio': cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    }
+
+def main():
+    """Compare both layouts and print a summary table"""
+    parser = argparse.ArgumentParser(description='Prefix caching benchmark for prompt layouts')
+    parser.add_argument('--requests', type=int, default=50, help='distinct requirements (two calls each)')
+    parser.add_argument('--prefill-us', type=float, default=50, help='prefill time per uncached token (microseconds)')
+    args = parser.parse_args()
+
+    print("⏱️ PREFIX CACHE BENCHMARK")
+    print("=" * 64)
+    results = [run_layout(layout, args.requests, prefill_seconds_per_token=args.prefill_us / 1e6)
+               for layout in ('inline', 'prefix')]
+    print(f"{'layout':<8} {'calls':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'cached':>8}")
+    for result in results:
+        print(f"{result['layout']:<8} {result['requests']:>6} {result['mean_ms']:>9.1f} {result['p50_ms']:>8.1f} "
+              f"{result['p95_ms']:>8.1f} {result['cached_ratio']:>7.0%}")
+    inline, prefix = results
+    print(f"\nMean time to first token: {inline['mean_ms'] / prefix['mean_ms']:.1f}x faster with the prefix layout")
+
+if __name__ == "__main__":
+    main()
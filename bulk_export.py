@@ -0,0 +1,204 @@
+"""
+Bulk Export
+Renders many documents in parallel and streams them out as one ZIP archive
+"""
+
+import io
+import json
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from story_exporter_enhanced import EnhancedStoryExporter
+
+# Exporter method and download base name for each document type
+EXPORT_TARGETS = {
+    'story': ('export_story', 'user_story'),
+    'brd': ('export_brd', 'business_requirements_document'),
+    'frd': ('export_frd', 'functional_requirements_document'),
+    'srd': ('export_srd', 'system_requirements_document'),
+    'cr': ('export_cr', 'change_request_document')
+}
+
+FILE_EXTENSIONS = {
+    'word': 'docx',
+    'pdf': 'pdf',
+    'markdown': 'md',
+    'html': 'html',
+    'json': 'json'
+}
+
+# DOCX and PDF are compressed already; text formats are deflated in the archive
+STORED_FORMATS = {'word', 'pdf'}
+
+MAX_DOCUMENTS = int(os.getenv('BULK_EXPORT_MAX_DOCUMENTS', '200'))
+WORKERS = int(os.getenv('BULK_EXPORT_WORKERS', str(min(4, os.cpu_count() or 1))))
+EXECUTOR_TYPE = os.getenv('BULK_EXPORT_EXECUTOR', 'process')
+CHUNK_SIZE = 64 * 1024
+
+_exporter = None
+_executor = None
+_executor_lock = threading.Lock()
+
+def render_export(document_type, format_type, document_data, coverage_data=None, section_images=None):
+    """Render one document to a temp file and return its path (runs in a worker)"""
+    global _exporter
+    if _exporter is None:
+        _exporter = EnhancedStoryExporter()
+    method_name = EXPORT_TARGETS[document_type][0]
+    return getattr(_exporter, method_name)(document_data, format_type, coverage_data, section_images)
+
+def get_render_executor():
+    """Shared worker pool for bulk rendering, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if EXECUTOR_TYPE == 'thread':
+                _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='bulk-export')
+            else:
+                _executor = ProcessPoolExecutor(max_workers=WORKERS)
+        return _executor
+
+def parse_export_jobs(payload):
+    """Validate a bulk export request and expand it to one job per document and format"""
+    documents = payload.get('documents') or []
+    formats = payload.get('formats') or ['word']
+
+    if not isinstance(documents, list) or not documents:
+        raise ValueError("At least one document is required")
+    if len(documents) > MAX_DOCUMENTS:
+        raise ValueError(f"Bulk export is limited to {MAX_DOCUMENTS} documents")
+    for format_type in formats:
+        if format_type not in FILE_EXTENSIONS:
+            raise ValueError(f"Invalid export format: {format_type}")
+
+    jobs = []
+    for index, document in enumerate(documents, 1):
+        document_type = document.get('document_type', 'story')
+        if document_type not in EXPORT_TARGETS:
+            raise ValueError(f"Document {index}: invalid document type '{document_type}'")
+        if not isinstance(document.get('data'), dict):
+            raise ValueError(f"Document {index}: document data is required")
+
+        base_name = _slugify(document.get('name')) or EXPORT_TARGETS[document_type][1]
+        for format_type in document.get('formats') or formats:
+            if format_type not in FILE_EXTENSIONS:
+                raise ValueError(f"Document {index}: invalid export format '{format_type}'")
+            jobs.append({
+                'entry_name': f"{index:03d}_{base_name}.{FILE_EXTENSIONS[format_type]}",
+                'document_type': document_type,
+                'format_type': format_type,
+                'document_data': document['data'],
+                'coverage_data': document.get('coverage_data'),
+                'section_images': document.get('section_images') or {}
+            })
+    return jobs
+
+def _slugify(name):
+    if not name:
+        return ''
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(name)).strip('_')[:80]
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink for ZipFile; bytes are drained as they arrive"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _entry_info(job):
+    """Archive entry for a job, deflated unless the format is already compressed"""
+    info = zipfile.ZipInfo(job['entry_name'], date_time=time.localtime(time.time())[:6])
+    if job['format_type'] not in STORED_FORMATS:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+def _discard_output(future):
+    """Delete the temp file of a render nobody is waiting for any more"""
+    if future.cancelled() or future.exception():
+        return
+    try:
+        os.remove(future.result())
+    except OSError:
+        pass
+
+def stream_bulk_export(jobs, executor=None, window=None):
+    """Yield a ZIP archive of rendered jobs, entry by entry as renders finish.
+
+    At most `window` renders are in flight and finished files are copied
+    into the archive in chunks and deleted, so memory use does not grow
+    with the number of documents. A manifest.json entry closes the archive.
+    """
+    executor = executor or get_render_executor()
+    window = window or WORKERS * 2
+    stream = _ZipStream()
+    manifest = []
+    pending = {}
+    job_iter = iter(jobs)
+
+    def submit_next():
+        for job in job_iter:
+            if job.get('error'):
+                # Failed before rendering, e.g. a pack document that could not be generated
+                manifest.append({'entry': job['entry_name'], 'status': 'error', 'error': job['error']})
+                continue
+            future = executor.submit(render_export, job['document_type'], job['format_type'],
+                                     job['document_data'], job['coverage_data'], job['section_images'])
+            pending[future] = job
+            return True
+        return False
+
+    try:
+        # DOCX/PDF entries are stored as-is; see _entry_info for text formats
+        with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+            for _ in range(window):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    submit_next()
+
+                    try:
+                        path = future.result()
+                    except Exception as e:
+                        manifest.append({'entry': job['entry_name'], 'status': 'error', 'error': str(e)})
+                        continue
+
+                    try:
+                        with open(path, 'rb') as source, archive.open(_entry_info(job), 'w') as entry:
+                            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                                entry.write(chunk)
+                                data = stream.drain()
+                                if data:
+                                    yield data
+                    finally:
+                        os.remove(path)
+                    manifest.append({'entry': job['entry_name'], 'status': 'ok'})
+
+                data = stream.drain()
+                if data:
+                    yield data
+
+            archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+        yield stream.drain()
+    finally:
+        # Client went away: stop queued renders and clean up finished ones
+        for future in pending:
+            future.cancel()
+            future.add_done_callback(_discard_output)
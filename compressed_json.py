@@ -0,0 +1,92 @@
+"""
+Compressed JSON Column Type
+Stores large JSON payloads zlib-compressed against a shared preset dictionary
+"""
+
+import json
+import os
+import zlib
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+# Every compressed value starts with 0xFF (never valid UTF-8, so it cannot
+# collide with legacy text rows) followed by a one-byte codec id
+MAGIC = b'\xff'
+CODEC_ZLIB_DICT_V1 = b'\x01'
+CURRENT_CODEC = CODEC_ZLIB_DICT_V1
+
+# Dictionaries are frozen once shipped: rows compressed against a dictionary
+# can only be read back with the exact same bytes. Add a new codec id and
+# file instead of editing an existing one.
+DICTIONARY_FILES = {
+    CODEC_ZLIB_DICT_V1: 'payload_dictionary_v1.txt'
+}
+
+COMPRESSION_LEVEL = int(os.getenv('PAYLOAD_COMPRESSION_LEVEL', '6'))
+
+_dictionaries = {}
+
+def _load_dictionary(codec):
+    """Load (and cache) the preset dictionary for a codec"""
+    if codec not in _dictionaries:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), DICTIONARY_FILES[codec])
+        with open(path, 'rb') as f:
+            # zlib only uses the last 32 KB of a preset dictionary
+            _dictionaries[codec] = f.read()[-32768:]
+    return _dictionaries[codec]
+
+def is_compressed(data):
+    """Check whether a raw column value is already in compressed form"""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:1]) == MAGIC
+
+def compress_payload(value):
+    """Serialize a JSON-compatible value and compress it with the current codec"""
+    raw = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=_load_dictionary(CURRENT_CODEC))
+    return MAGIC + CURRENT_CODEC + compressor.compress(raw) + compressor.flush()
+
+def decompress_payload(data, legacy_text=False):
+    """Decode a raw column value back into its JSON value.
+
+    Values written before compression was introduced are plain text; they
+    are returned as-is when legacy_text is set, otherwise parsed as JSON.
+    """
+    if data is None:
+        return None
+
+    if is_compressed(data):
+        data = bytes(data)
+        codec = data[1:2]
+        if codec not in DICTIONARY_FILES:
+            raise ValueError(f"Unknown payload codec: {codec!r}")
+        decompressor = zlib.decompressobj(zdict=_load_dictionary(codec))
+        raw = decompressor.decompress(data[2:]) + decompressor.flush()
+        return json.loads(raw.decode('utf-8'))
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+
+    if legacy_text:
+        return data
+
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        return data
+
+class CompressedJSON(TypeDecorator):
+    """Binary column holding a compressed JSON value, decoded transparently"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, legacy_text=False, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.legacy_text = legacy_text
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_payload(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_payload(value, self.legacy_text)
@@ -0,0 +1,130 @@
+"""
+Document History
+Per-session record of generated documents with keyset-paginated listing
+"""
+
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import undefer_group
+from models import db, User, Story
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Columns returned by history listings - the large requirements, analysis
+# and user_stories payloads are never selected here
+HISTORY_COLUMNS = (
+    Story.id,
+    Story.document_type,
+    Story.title,
+    Story.domain,
+    Story.status,
+    Story.created_at,
+    Story.updated_at
+)
+
+# Document field used as the history title for each document type
+TITLE_FIELDS = {
+    'story': 'business_goal',
+    'brd': 'project_name',
+    'cr': 'change_request_id'
+}
+
+def get_or_create_user(session_id):
+    """Get the user for a browser session, creating it on first use"""
+    user = User.query.filter_by(session_id=session_id).first()
+    if not user:
+        user = User(session_id=session_id)
+        db.session.add(user)
+        db.session.commit()
+    return user
+
+def _derive_title(document_type, requirement, document_data):
+    """Pick a short human-readable title for a stored document"""
+    title = ''
+    field = TITLE_FIELDS.get(document_type)
+    if field and isinstance(document_data, dict):
+        title = str(document_data.get(field) or '').strip()
+    if not title:
+        title = requirement.strip().splitlines()[0] if requirement.strip() else 'Untitled document'
+    return title[:200]
+
+def record_document(user, document_type, requirement, coverage_analysis, document_data):
+    """Store a generated document in the session history"""
+    domain = None
+    if isinstance(coverage_analysis, dict):
+        domain = coverage_analysis.get('requirement_category')
+
+    story = Story(
+        user_id=user.id,
+        document_type=document_type,
+        title=_derive_title(document_type, requirement, document_data),
+        requirements=requirement,
+        analysis=coverage_analysis or None,
+        user_stories=document_data,
+        domain=str(domain)[:100] if domain else None,
+        status='generated'
+    )
+    db.session.add(story)
+    db.session.commit()
+    return story
+
+def encode_cursor(created_at, story_id):
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{story_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, story_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(story_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid history cursor") from e
+
+def _summary_dict(row):
+    """Convert a projected history row to a JSON-friendly dict"""
+    return {
+        'id': row.id,
+        'document_type': row.document_type,
+        'title': row.title,
+        'domain': row.domain,
+        'status': row.status,
+        'created_at': row.created_at.isoformat(),
+        'updated_at': row.updated_at.isoformat()
+    }
+
+def list_documents(user_id, limit=DEFAULT_PAGE_SIZE, cursor=None, status=None, document_type=None):
+    """List a user's documents newest first, one keyset page at a time.
+
+    Returns (documents, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    query = db.session.query(*HISTORY_COLUMNS).filter(Story.user_id == user_id)
+    if status:
+        query = query.filter(Story.status == status)
+    if document_type:
+        query = query.filter(Story.document_type == document_type)
+
+    if cursor:
+        created_at, story_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Story.created_at < created_at,
+            and_(Story.created_at == created_at, Story.id < story_id)
+        ))
+
+    rows = query.order_by(Story.created_at.desc(), Story.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return [_summary_dict(row) for row in rows], next_cursor
+
+def get_document(user_id, story_id):
+    """Load a single stored document, including its payload columns"""
+    return Story.query.options(undefer_group('payload')).filter_by(user_id=user_id, id=story_id).first()
@@ -0,0 +1,162 @@
+"""
+Document Pack
+Generates several document types for one requirement from a single combined analysis
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from bulk_export import EXPORT_TARGETS, FILE_EXTENSIONS
+from local_analyzer import local_coverage_analysis
+from speculation import suggested_answers
+
+PACK_DOCUMENT_TYPES = ('story', 'brd', 'frd', 'srd', 'cr')
+DEFAULT_PACK = ('story', 'brd', 'frd', 'srd')
+PACK_WORKERS = int(os.getenv('DOCUMENT_PACK_WORKERS', '16'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_pack_executor():
+    """Shared pool for pack generations, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PACK_WORKERS, thread_name_prefix='document-pack')
+        return _executor
+
+def parse_pack_request(payload):
+    """Validate a pack request; returns (requirement, document_types, answers, formats)"""
+    requirement = str(payload.get('requirement') or '').strip()
+    document_types = payload.get('document_types') or list(DEFAULT_PACK)
+    answers = payload.get('answers') or {}
+    formats = payload.get('formats') or []
+
+    if not requirement:
+        raise ValueError("Requirement text is required")
+    if not isinstance(document_types, list):
+        raise ValueError("document_types must be a list")
+    for document_type in document_types:
+        if document_type not in PACK_DOCUMENT_TYPES:
+            raise ValueError(f"Invalid document type: {document_type}")
+    if not isinstance(answers, dict):
+        raise ValueError("answers must be an object")
+    if not isinstance(formats, list):
+        raise ValueError("formats must be a list")
+    for format_type in formats:
+        if format_type not in FILE_EXTENSIONS:
+            raise ValueError(f"Invalid export format: {format_type}")
+
+    return requirement, list(dict.fromkeys(document_types)), answers, formats
+
+def _is_coverage_analysis(analysis):
+    coverage = analysis.get('coverage_analysis') if isinstance(analysis, dict) else None
+    return isinstance(coverage, dict) and isinstance(coverage.get('missing_elements', []), list)
+
+def split_pack_analysis(combined, document_types, requirement):
+    """One coverage analysis per document type from the combined response.
+
+    Types the combined analysis is missing or malformed for, or all of
+    them if the call failed, get the local keyword analysis instead.
+    """
+    combined = combined if isinstance(combined, dict) else {}
+    analyses = {}
+    for document_type in document_types:
+        analysis = combined.get(document_type)
+        analyses[document_type] = (analysis if _is_coverage_analysis(analysis)
+                                   else local_coverage_analysis(document_type, requirement))
+    return analyses
+
+def pack_answers(analysis, answers):
+    """The analysis' suggested answers, overridden by the answers sent with the pack"""
+    return {**suggested_answers(analysis), **answers}
+
+def generate_documents(document_types, generate, executor=None):
+    """Run generate(document_type) for every type at once, yielding (document_type, document, seconds) as each finishes.
+
+    A failed generation yields None as its document. Generations still
+    queued when the consumer stops are cancelled.
+    """
+    executor = executor or get_pack_executor()
+    started = time.perf_counter()
+    pending = {executor.submit(generate, document_type): document_type for document_type in document_types}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                document_type = pending.pop(future)
+                try:
+                    document = future.result()
+                except Exception:
+                    document = None
+                yield document_type, document, time.perf_counter() - started
+    finally:
+        for future in pending:
+            future.cancel()
+
+def _ndjson(item):
+    return json.dumps(item, separators=(',', ':')) + '\n'
+
+def stream_pack(document_types, analyze, generate, on_document=None, executor=None):
+    """Yield NDJSON events for a pack: the analyses, then each document as it finishes.
+
+    analyze() returns {document_type: analysis result}; generate(document_type,
+    result) returns the document, or None if generation failed. Failed
+    documents get an error event. on_document(document_type, result, document)
+    is called for every generated document, e.g. to record history.
+    """
+    started = time.perf_counter()
+    yield _ndjson({'event': 'start', 'document_types': document_types})
+
+    results = analyze()
+    for document_type in document_types:
+        yield _ndjson(dict(results[document_type], event='analysis', document_type=document_type))
+
+    generated = 0
+    for document_type, document, seconds in generate_documents(
+            document_types, lambda document_type: generate(document_type, results[document_type]), executor):
+        if document is None:
+            yield _ndjson({'event': 'error', 'document_type': document_type, 'error': 'Generation failed'})
+            continue
+        generated += 1
+        if on_document:
+            on_document(document_type, results[document_type], document)
+        yield _ndjson({'event': 'document', 'document_type': document_type,
+                       'analysis_id': results[document_type].get('analysis_id'),
+                       'seconds': round(seconds, 3), 'document': document})
+
+    yield _ndjson({'event': 'done', 'generated': generated, 'failed': len(document_types) - generated,
+                   'seconds': round(time.perf_counter() - started, 3)})
+
+def _entry_name(position, document_type, format_type):
+    return f"{position:02d}_{EXPORT_TARGETS[document_type][1]}.{FILE_EXTENSIONS[format_type]}"
+
+def pack_export_jobs(document_types, formats, analyze, generate, on_document=None, executor=None):
+    """Bulk export jobs for a pack, yielded as each document finishes generating.
+
+    Feeding these to stream_bulk_export renders finished documents while
+    the rest are still being generated. A failed document's jobs carry an
+    error instead, which the archive manifest reports.
+    """
+    results = analyze()
+    positions = {document_type: index for index, document_type in enumerate(document_types, 1)}
+    for document_type, document, _ in generate_documents(
+            document_types, lambda document_type: generate(document_type, results[document_type]), executor):
+        if document is None:
+            for format_type in formats:
+                yield {'entry_name': _entry_name(positions[document_type], document_type, format_type),
+                       'error': 'Generation failed'}
+            continue
+        if on_document:
+            on_document(document_type, results[document_type], document)
+        for format_type in formats:
+            yield {
+                'entry_name': _entry_name(positions[document_type], document_type, format_type),
+                'document_type': document_type,
+                'format_type': format_type,
+                'document_data': document,
+                'coverage_data': results[document_type].get('coverage_analysis'),
+                'section_images': {}
+            }
@@ -0,0 +1,435 @@
+"""
+Document Preview
+Paginates documents into page thumbnails, rendered lazily as PNG or SVG and cached by document hash
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from document_specs import DOCUMENT_SPECS, find_section_images, layout_document, resolve_field
+from pdf_fonts import find_font_file, get_font_set
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = 72
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+PREVIEW_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+CACHE_DOCUMENTS = int(os.getenv('PREVIEW_CACHE_DOCUMENTS', '32'))
+DEFAULT_WIDTH = int(os.getenv('PREVIEW_THUMBNAIL_WIDTH', '480'))
+MIN_WIDTH, MAX_WIDTH, WIDTH_STEP = 120, 1200, 40
+
+PRIMARY_COLOR = '#1e40af'
+SECONDARY_COLOR = '#64748b'
+HEADER_FILL = '#e8e8e8'
+TEXT_COLOR = '#000000'
+
+TextStyle = namedtuple('TextStyle', ['size', 'leading', 'bold', 'color', 'indent', 'centered'])
+
+TEXT_STYLES = {
+    'title': TextStyle(20, 24, True, PRIMARY_COLOR, 0, True),
+    'subtitle': TextStyle(13, 17, False, SECONDARY_COLOR, 0, True),
+    'heading1': TextStyle(18, 22, True, TEXT_COLOR, 0, False),
+    'heading2': TextStyle(14, 17, True, TEXT_COLOR, 0, False),
+    'heading3': TextStyle(12, 14, True, TEXT_COLOR, 0, False),
+    'body': TextStyle(10, 12, False, TEXT_COLOR, 0, False),
+    'indented': TextStyle(10, 12, False, TEXT_COLOR, 18, False),
+    'caption': TextStyle(9, 11, False, SECONDARY_COLOR, 0, True)
+}
+
+CELL_PADDING = 4
+
+# Page primitives, in points from the top-left corner of the page:
+#   ('text', x, y, text, size, bold, color)    y is the baseline
+#   ('rect', x, y, width, height, fill, stroke)
+#   ('image', x, y, width, height, png_bytes)
+
+def document_hash(document_type, document_data, coverage_data=None, section_images=None):
+    """Stable content hash identifying one rendering of a document"""
+    payload = json.dumps([document_type, document_data, coverage_data, section_images or {}],
+                         sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def _font_name(bold):
+    fonts = get_font_set().fonts
+    return fonts['bold'] if bold else fonts['normal']
+
+def wrap_text(text, width, size, bold=False):
+    """Greedy word wrap measured with the PDF font metrics"""
+    font = _font_name(bold)
+    lines = []
+    for raw_line in str(text).split('\n'):
+        line = ''
+        for word in raw_line.split():
+            candidate = f'{line} {word}' if line else word
+            if pdfmetrics.stringWidth(candidate, font, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # Break words that are wider than the line on their own
+            line = ''
+            for char in word:
+                if line and pdfmetrics.stringWidth(line + char, font, size) > width:
+                    lines.append(line)
+                    line = ''
+                line += char
+        lines.append(line)
+    return lines
+
+class PageLayout:
+    """Flows layout operations onto letter-sized pages"""
+
+    def __init__(self):
+        self.pages = [[]]
+        self.y = MARGIN
+
+    @property
+    def page(self):
+        return self.pages[-1]
+
+    def new_page(self):
+        self.pages.append([])
+        self.y = MARGIN
+
+    def page_break(self):
+        if self.page:
+            self.new_page()
+
+    def ensure(self, height):
+        """Start a new page unless the next block fits on this one"""
+        if self.page and self.y + height > PAGE_HEIGHT - MARGIN:
+            self.new_page()
+
+    def space(self, height):
+        self.y += height
+
+    def text(self, text, style_name='body', prefix=''):
+        style = TEXT_STYLES[style_name]
+        width = CONTENT_WIDTH - style.indent
+        for line in wrap_text(prefix + str(text), width, style.size, style.bold):
+            self.ensure(style.leading)
+            x = MARGIN + style.indent
+            if style.centered:
+                x = (PAGE_WIDTH - pdfmetrics.stringWidth(line, _font_name(style.bold), style.size)) / 2
+            self.page.append(('text', x, self.y + style.size, line, style.size, style.bold, style.color))
+            self.y += style.leading
+
+    def labelled(self, label, text):
+        """Bold label followed by its value, wrapped as one paragraph"""
+        style = TEXT_STYLES['body']
+        label_text = f'{label}: '
+        label_width = pdfmetrics.stringWidth(label_text, _font_name(True), style.size)
+        lines = wrap_text(label_text + str(text), CONTENT_WIDTH, style.size)
+        for index, line in enumerate(lines):
+            self.ensure(style.leading)
+            baseline = self.y + style.size
+            if index == 0 and line.startswith(label_text):
+                self.page.append(('text', MARGIN, baseline, label_text.rstrip(), style.size, True, style.color))
+                line = line[len(label_text):]
+                x = MARGIN + label_width
+            else:
+                x = MARGIN
+            self.page.append(('text', x, baseline, line, style.size, False, style.color))
+            self.y += style.leading
+
+    def table(self, headers, rows, font_size=10, col_widths=None, shade_first_column=False):
+        """Grid table split between rows, repeating the header on each page"""
+        columns = len(headers) if headers else max((len(row) for row in rows), default=1)
+        col_widths = col_widths or [CONTENT_WIDTH / columns] * columns
+        leading = font_size * 1.2
+
+        def measure(values, bold_columns):
+            cells = []
+            for index, width in enumerate(col_widths):
+                value = values[index] if index < len(values) else ''
+                cells.append(wrap_text(value, width - 2 * CELL_PADDING, font_size, index in bold_columns))
+            return cells, max(len(lines) for lines in cells) * leading + 2 * CELL_PADDING
+
+        def draw(cells, height, fills, bold_columns):
+            x = MARGIN
+            for index, (lines, width) in enumerate(zip(cells, col_widths)):
+                self.page.append(('rect', x, self.y, width, height, fills[index], TEXT_COLOR))
+                for line_number, line in enumerate(lines):
+                    baseline = self.y + CELL_PADDING + font_size + line_number * leading
+                    self.page.append(('text', x + CELL_PADDING, baseline, line, font_size,
+                                      index in bold_columns, TEXT_COLOR))
+                x += width
+            self.y += height
+
+        all_columns = set(range(columns))
+        header = measure(headers, all_columns) if headers else None
+        body_fills = [HEADER_FILL if shade_first_column and index == 0 else None for index in range(columns)]
+        body_bold = {0} if shade_first_column else set()
+
+        if header:
+            self.ensure(header[1] + leading + 2 * CELL_PADDING)
+            draw(*header, [HEADER_FILL] * columns, all_columns)
+        for row in rows:
+            cells, height = measure(list(row), body_bold)
+            if self.page and self.y + height > PAGE_HEIGHT - MARGIN:
+                self.new_page()
+                if header:
+                    draw(*header, [HEADER_FILL] * columns, all_columns)
+            draw(cells, height, body_fills, body_bold)
+        self.space(12)
+
+    def image(self, png_bytes, pixel_width, pixel_height, caption=None):
+        width = 3 * 72
+        height = width * pixel_height / pixel_width
+        self.ensure(height)
+        self.page.append(('image', MARGIN, self.y, width, height, png_bytes))
+        self.y += height
+        if caption:
+            self.text(caption, 'caption')
+        self.space(12)
+
+def _preview_image(image_data):
+    """Decode a section image and shrink it to preview size as PNG"""
+    encoded = image_data.get('data', '')
+    if encoded.startswith('data:image'):
+        encoded = encoded.split(',')[1]
+    with Image.open(io.BytesIO(base64.b64decode(encoded))) as img:
+        img = img.convert('RGB')
+        img.thumbnail((600, 600))
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue(), img.width, img.height
+
+def paginate(document_type, document_data, coverage_data=None, section_images=None):
+    """Lay out a document's cover page and sections into page primitives"""
+    if document_type not in DOCUMENT_SPECS:
+        raise ValueError(f"Unsupported document type: {document_type}")
+    spec = DOCUMENT_SPECS[document_type]
+    layout = PageLayout()
+
+    layout.space(50)
+    layout.text(spec['cover_title'], 'title')
+    layout.space(30)
+    subtitle = resolve_field(document_data, spec['subtitle'])
+    if subtitle:
+        layout.text(str(subtitle)[:150], 'subtitle')
+    layout.new_page()
+
+    for op in layout_document(spec, document_data, coverage_data):
+        kind = op[0]
+        if kind == 'heading':
+            layout.ensure(60)
+            layout.text(op[1], f'heading{min(op[2], 3)}')
+            layout.space(6)
+        elif kind == 'paragraph':
+            layout.text(op[1])
+        elif kind == 'labelled':
+            layout.labelled(op[1], op[2])
+        elif kind == 'bullet':
+            layout.text(op[1], 'indented', prefix='• ')
+        elif kind == 'indented':
+            layout.text(op[1], 'indented')
+        elif kind == 'table':
+            layout.table(op[1], op[2], op[3])
+        elif kind == 'details':
+            layout.table(None, op[1], 11, [144, CONTENT_WIDTH - 144], shade_first_column=True)
+        elif kind == 'dashboard':
+            layout.text(op[1], 'heading1')
+            layout.space(6)
+            for label, value in op[2]:
+                layout.labelled(label, value)
+            if op[3]:
+                layout.space(12)
+                layout.text(op[3], 'heading2')
+                layout.space(6)
+            layout.table(['Metric', 'Value'], op[4], 11, [216, 144])
+        elif kind == 'images':
+            for index, image_data in enumerate(find_section_images(op[1], section_images)):
+                try:
+                    layout.image(*_preview_image(image_data), image_data.get('caption'))
+                except Exception as e:
+                    print(f"ERROR: Failed to preview image {index+1} in section {op[1]}: {str(e)}")
+        elif kind == 'separator':
+            layout.space(16)
+        elif kind == 'page_break':
+            layout.page_break()
+
+    if not layout.page and len(layout.pages) > 1:
+        layout.pages.pop()
+    return layout.pages
+
+# ----------------------------------------------------------------------
+# Page renderers
+# ----------------------------------------------------------------------
+
+def thumbnail_width(width=None):
+    """Clamp a requested width and snap it to a step so cached sizes stay few"""
+    width = int(width or DEFAULT_WIDTH)
+    width = min(max(width, MIN_WIDTH), MAX_WIDTH)
+    return int(round(width / WIDTH_STEP)) * WIDTH_STEP
+
+@lru_cache(maxsize=64)
+def _pillow_font(bold, pixel_size):
+    """Pillow font matching the PDF body family at a pixel size"""
+    face = getattr(pdfmetrics.getFont(_font_name(bold)), 'face', None)
+    # Core PDF fonts have no font file; draw them with the Vera fonts ReportLab bundles
+    path = face.filename if face is not None else find_font_file('VeraBd.ttf' if bold else 'Vera.ttf')
+    return ImageFont.truetype(path, pixel_size)
+
+def render_png(page, width):
+    """Rasterize one page's primitives to PNG bytes"""
+    scale = width / PAGE_WIDTH
+    height = int(round(PAGE_HEIGHT * scale))
+    canvas = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(canvas)
+
+    for item in page:
+        kind = item[0]
+        if kind == 'rect':
+            _, x, y, w, h, fill, stroke = item
+            draw.rectangle([x * scale, y * scale, (x + w) * scale, (y + h) * scale],
+                           fill=fill, outline=stroke, width=max(1, int(round(0.75 * scale))))
+        elif kind == 'text':
+            _, x, y, text, size, bold, color = item
+            font = _pillow_font(bold, max(1, int(round(size * scale))))
+            draw.text((x * scale, y * scale), text, fill=color, font=font, anchor='ls')
+        elif kind == 'image':
+            _, x, y, w, h, png_bytes = item
+            with Image.open(io.BytesIO(png_bytes)) as img:
+                size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+                canvas.paste(img.convert('RGB').resize(size), (int(round(x * scale)), int(round(y * scale))))
+
+    buffer = io.BytesIO()
+    canvas.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+def render_svg(page, width):
+    """Serialize one page's primitives as an SVG document"""
+    height = int(round(PAGE_HEIGHT * width / PAGE_WIDTH))
+    family = escape(get_font_set().fonts['family'])
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {PAGE_WIDTH:g} {PAGE_HEIGHT:g}" font-family="{family}, sans-serif">',
+        f'<rect width="{PAGE_WIDTH:g}" height="{PAGE_HEIGHT:g}" fill="#ffffff"/>'
+    ]
+    for item in page:
+        kind = item[0]
+        if kind == 'rect':
+            _, x, y, w, h, fill, stroke = item
+            parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" '
+                         f'fill="{fill or "none"}" stroke="{stroke}" stroke-width="0.75"/>')
+        elif kind == 'text':
+            _, x, y, text, size, bold, color = item
+            weight = ' font-weight="bold"' if bold else ''
+            parts.append(f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size:g}" fill="{color}"{weight} '
+                         f'xml:space="preserve">{escape(text)}</text>')
+        elif kind == 'image':
+            _, x, y, w, h, png_bytes = item
+            encoded = base64.b64encode(png_bytes).decode('ascii')
+            parts.append(f'<image x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" '
+                         f'href="data:image/png;base64,{encoded}"/>')
+    parts.append('</svg>')
+    return ''.join(parts).encode('utf-8')
+
+RENDERERS = {
+    'png': render_png,
+    'svg': render_svg
+}
+
+# ----------------------------------------------------------------------
+# Preview cache
+# ----------------------------------------------------------------------
+
+class DocumentPreview:
+    """Paginated document whose page thumbnails are rendered on first request"""
+
+    def __init__(self, preview_id, document_type, pages):
+        self.preview_id = preview_id
+        self.document_type = document_type
+        self.pages = pages
+        self._thumbnails = {}
+        self._lock = threading.Lock()
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def thumbnail(self, page_number, format_type='png', width=None):
+        """Rendered bytes of a 1-based page, cached per format and width"""
+        if format_type not in RENDERERS:
+            raise ValueError(f"Unsupported preview format: {format_type}")
+        if not 1 <= page_number <= self.page_count:
+            raise IndexError(f"Page {page_number} out of range 1-{self.page_count}")
+        key = (page_number, format_type, thumbnail_width(width))
+        thumbnail = self._thumbnails.get(key)
+        if thumbnail is None:
+            thumbnail = RENDERERS[format_type](self.pages[page_number - 1], key[2])
+            with self._lock:
+                self._thumbnails.setdefault(key, thumbnail)
+        return thumbnail
+
+class PreviewCache:
+    """LRU of paginated documents keyed by document hash"""
+
+    def __init__(self, capacity=CACHE_DOCUMENTS):
+        self.capacity = capacity
+        self._previews = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, preview_id):
+        with self._lock:
+            preview = self._previews.get(preview_id)
+            if preview is not None:
+                self._previews.move_to_end(preview_id)
+            return preview
+
+    def get_or_create(self, document_type, document_data, coverage_data=None, section_images=None):
+        """Paginate a document unless an identical one is already cached"""
+        preview_id = document_hash(document_type, document_data, coverage_data, section_images)
+        preview = self.get(preview_id)
+        if preview is not None:
+            return preview, True
+
+        pages = paginate(document_type, document_data, coverage_data, section_images)
+        preview = DocumentPreview(preview_id, document_type, pages)
+        with self._lock:
+            preview = self._previews.setdefault(preview_id, preview)
+            self._previews.move_to_end(preview_id)
+            while len(self._previews) > self.capacity:
+                self._previews.popitem(last=False)
+        return preview, False
+
+preview_cache = PreviewCache()
+
+def preview_manifest(preview, format_type='png', width=None):
+    """Page count and per-page thumbnail URLs for a cached preview"""
+    width = thumbnail_width(width)
+    return {
+        'preview_id': preview.preview_id,
+        'document_type': preview.document_type,
+        'page_count': preview.page_count,
+        'format': format_type,
+        'width': width,
+        'pages': [f'/preview/{preview.preview_id}/{number}.{format_type}?width={width}'
+                  for number in range(1, preview.page_count + 1)]
+    }
+
+def stream_preview(preview, format_type='png', width=None):
+    """NDJSON lines: the manifest, then each page as a data URL as soon as it renders"""
+    manifest = preview_manifest(preview, format_type, width)
+    yield json.dumps({'type': 'manifest', **manifest}) + '\n'
+    for number in range(1, preview.page_count + 1):
+        encoded = base64.b64encode(preview.thumbnail(number, format_type, width)).decode('ascii')
+        yield json.dumps({
+            'type': 'page',
+            'page': number,
+            'data_url': f'data:{PREVIEW_FORMATS[format_type]};base64,{encoded}'
+        }) + '\n'
@@ -0,0 +1,498 @@
+"""
+Document Specs
+Declarative layout of every exported document type, interpreted by the
+Word and PDF backends of EnhancedStoryExporter
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+# A value read from the document data. `key` is a field name or a tuple path
+# into nested dicts; `max_length` truncates the rendered text.
+Field = namedtuple('Field', ['key', 'default', 'max_length'], defaults=(None, None))
+
+# Content blocks. Each block renders part of a section's value:
+#   ('paragraph',)                      the value itself as body text (a dict
+#                                       is rendered like key_values)
+#   ('fields', [(label, key), ...])     labelled paragraphs from a dict
+#   ('key_values',)                     every item of a dict, keys title-cased
+#   ('bullets', key, subheading)        bullet list (value[key] when key is set)
+#   ('numbered', text_key, detail)      numbered list; detail = (label, key)
+#   ('labelled_items', label_key, text_key)
+#   ('table', [(header, key), ...], font_size)
+#   ('details', [(label, literal or Field), ...])   two-column details table
+#   ('static_bullets', [text, ...])     fixed bullet list
+#   ('static_table', headers, rows)     fixed table (e.g. sign-off)
+#
+# A section renders when its key has a value; sections without a key
+# (static content) always render. layout_document() flattens a spec into
+# primitive operations ('heading', 'paragraph', 'labelled', 'bullet',
+# 'indented', 'table', 'details', 'dashboard', 'images', 'separator',
+# 'page_break'), which is all a backend has to know how to draw.
+
+def section(title, key, image, blocks, separator=True):
+    """Build a section spec"""
+    return {'title': title, 'key': key, 'image': image, 'blocks': blocks, 'separator': separator}
+
+STORY_SPEC = {
+    'header_title': 'Agile Story Document',
+    'cover_title': 'AGILE USER STORY DOCUMENT',
+    'subtitle': Field('business_goal'),
+    'file_prefix': 'Agile_Story_Document',
+    'document_control': None,
+    'dashboard': {
+        'title': 'OBJECTIVE',
+        'fields': [('Business Goal', Field('business_goal', 'Enhance system functionality'))],
+        'metrics_heading': 'Coverage Metrics'
+    },
+    'sections': [
+        section('USER STORY', None, 'user-story', [
+            ('details', [
+                ('Story ID', 'US-001'),
+                ('Story Name', Field('business_goal', 'Primary Feature', 50)),
+                ('Module', 'Core Application'),
+                ('Writer', 'Business Analyst')
+            ])
+        ]),
+        section('FUNCTIONAL FLOW', 'functional_flow', 'functional-flow', [('bullets', None, None)]),
+        section('VALIDATIONS', 'validations', 'validations', [('bullets', None, None)]),
+        section('ACCEPTANCE CRITERIA', 'acceptance_criteria', 'acceptance-criteria', [('bullets', None, None)]),
+        section('SECURITY REQUIREMENTS', 'security', 'security', [('bullets', None, None)]),
+        section('DEPENDENCIES', 'dependencies', 'dependencies', [('bullets', None, None)]),
+        section('RISKS & MITIGATION', 'risks', 'risks', [('bullets', None, None)]),
+        section('NON-FUNCTIONAL REQUIREMENTS', None, 'non-functional-requirements', [
+            ('static_bullets', [
+                'Performance: Response time < 2 seconds',
+                'Security: Authentication and authorization required',
+                'Audit: All actions must be logged',
+                'Logging: Comprehensive error and activity logging'
+            ])
+        ])
+    ]
+}
+
+BRD_SPEC = {
+    'header_title': 'Business Requirements Document',
+    'cover_title': 'BUSINESS REQUIREMENTS DOCUMENT',
+    'subtitle': Field('project_name'),
+    'file_prefix': 'Business_Requirements_Document',
+    'document_control': {
+        'document_id': 'BRD-001',
+        'author': 'Business Analyst',
+        'department': 'Business Analysis'
+    },
+    'dashboard': {
+        'title': 'BRD COVERAGE ANALYSIS',
+        'fields': [('Project', Field('project_name'))],
+        'metrics_heading': None
+    },
+    'sections': [
+        section('EXECUTIVE SUMMARY', 'executive_summary', 'executive-summary', [
+            ('fields', [
+                ('Background', 'background'),
+                ('Problem Statement', 'problem_statement'),
+                ('Business Need', 'business_need')
+            ])
+        ]),
+        section('BUSINESS OBJECTIVES', 'business_objectives', 'business-objectives', [
+            ('numbered', 'objective', ('KPI', 'kpi'))
+        ]),
+        section('PROJECT SCOPE', 'scope', 'scope', [
+            ('bullets', 'in_scope', 'In-Scope'),
+            ('bullets', 'out_of_scope', 'Out-of-Scope')
+        ]),
+        section('STAKEHOLDER LIST', 'stakeholders', 'stakeholders', [
+            ('table', [
+                ('Name', 'name'),
+                ('Role', 'role'),
+                ('Department', 'department'),
+                ('Responsibilities', 'responsibilities')
+            ], 10)
+        ]),
+        section('BUSINESS REQUIREMENTS', 'business_requirements', 'business-requirements', [
+            ('table', [
+                ('BR ID', 'br_id'),
+                ('Title', 'title'),
+                ('Description', 'description'),
+                ('Priority', 'priority'),
+                ('Source', 'source'),
+                ('Acceptance Criteria', 'acceptance_criteria')
+            ], 9)
+        ]),
+        section('RISKS & MITIGATION', 'risks', 'risks', [
+            ('table', [
+                ('Risk ID', 'risk_id'),
+                ('Description', 'description'),
+                ('Impact', 'impact'),
+                ('Likelihood', 'likelihood'),
+                ('Mitigation Plan', 'mitigation')
+            ], 10)
+        ]),
+        section('APPROVAL SECTION', None, None, [
+            ('static_table', ['Role', 'Name', 'Signature & Date'], [
+                ['Business Owner', '', ''],
+                ['Project Manager', '', ''],
+                ['IT Manager', '', '']
+            ])
+        ], separator=False)
+    ]
+}
+
+FRD_SPEC = {
+    'header_title': 'Functional Requirements Document',
+    'cover_title': 'FUNCTIONAL REQUIREMENTS DOCUMENT',
+    'subtitle': Field(('system_overview', 'architecture')),
+    'file_prefix': 'Functional_Requirements_Document',
+    'document_control': {
+        'document_id': 'FRD-001',
+        'author': 'Technical Analyst',
+        'department': 'Technical Analysis'
+    },
+    'dashboard': {
+        'title': 'FRD COVERAGE ANALYSIS',
+        'fields': [('System Complexity', Field('system_complexity'))],
+        'metrics_heading': None
+    },
+    'sections': [
+        section('SYSTEM OVERVIEW', 'system_overview', 'system-overview', [
+            ('fields', [('Architecture', 'architecture')]),
+            ('bullets', 'components', 'Components')
+        ]),
+        section('FUNCTIONAL REQUIREMENTS', 'functional_requirements', 'functional-requirements', [
+            ('table', [
+                ('Req ID', 'req_id'),
+                ('Title', 'title'),
+                ('Description', 'description'),
+                ('Priority', 'priority'),
+                ('Acceptance Criteria', 'acceptance_criteria')
+            ], 9)
+        ]),
+        section('DATA REQUIREMENTS', 'data_requirements', 'data-requirements', [('key_values',)]),
+        section('INTERFACE REQUIREMENTS', 'interface_requirements', 'interface-requirements', [('key_values',)]),
+        section('INTEGRATION REQUIREMENTS', 'integration_requirements', 'integration-requirements', [
+            ('table', [
+                ('System', 'system'),
+                ('Method', 'method'),
+                ('Data Format', 'data_format'),
+                ('Frequency', 'frequency')
+            ], 10)
+        ]),
+        section('PERFORMANCE REQUIREMENTS', 'performance_requirements', 'performance-requirements', [('key_values',)]),
+        section('SECURITY REQUIREMENTS', 'security_requirements', 'security-requirements', [('bullets', None, None)]),
+        section('VALIDATION RULES', 'validation_rules', 'validation-rules', [
+            ('table', [
+                ('Field', 'field'),
+                ('Rule', 'rule'),
+                ('Error Message', 'error_message')
+            ], 10)
+        ]),
+        section('ERROR HANDLING', 'error_handling', 'error-handling', [
+            ('table', [
+                ('Error Type', 'error_type'),
+                ('Handling Strategy', 'handling_strategy'),
+                ('User Message', 'user_message'),
+                ('Logging', 'logging')
+            ], 10)
+        ]),
+        section('TESTING REQUIREMENTS', 'testing_requirements', 'testing-requirements', [('key_values',)]),
+        section('DEPLOYMENT REQUIREMENTS', 'deployment_requirements', 'deployment-requirements', [('key_values',)])
+    ]
+}
+
+SRD_SPEC = {
+    'header_title': 'System Requirements Document',
+    'cover_title': 'SYSTEM REQUIREMENTS DOCUMENT',
+    'subtitle': Field(('system_architecture', 'overview')),
+    'file_prefix': 'System_Requirements_Document',
+    'document_control': {
+        'document_id': 'SRD-001',
+        'author': 'System Architect',
+        'department': 'System Architecture'
+    },
+    'dashboard': {
+        'title': 'SRD COVERAGE ANALYSIS',
+        'fields': [('System Complexity', Field('system_complexity'))],
+        'metrics_heading': None
+    },
+    'sections': [
+        section('SYSTEM ARCHITECTURE', 'system_architecture', 'system-architecture', [
+            ('fields', [('Overview', 'overview')]),
+            ('bullets', 'components', 'Components')
+        ]),
+        section('HARDWARE REQUIREMENTS', 'hardware_requirements', 'hardware-requirements', [('key_values',)]),
+        section('SOFTWARE REQUIREMENTS', 'software_requirements', 'software-requirements', [('key_values',)]),
+        section('NETWORK REQUIREMENTS', 'network_requirements', 'network-requirements', [('key_values',)]),
+        section('DATABASE REQUIREMENTS', 'database_requirements', 'database-requirements', [('key_values',)]),
+        section('PERFORMANCE SPECIFICATIONS', 'performance_specifications', 'performance-specifications', [('key_values',)]),
+        section('SYSTEM INTERFACES', 'system_interfaces', 'system-interfaces', [
+            ('table', [
+                ('Interface', 'interface'),
+                ('Type', 'type'),
+                ('Protocol', 'protocol'),
+                ('Data Format', 'data_format')
+            ], 10)
+        ]),
+        section('SECURITY ARCHITECTURE', 'security_architecture', 'security-architecture', [('key_values',)]),
+        section('BACKUP & RECOVERY', 'backup_recovery', 'backup-recovery', [('key_values',)]),
+        section('MONITORING & LOGGING', 'monitoring_logging', 'monitoring-logging', [('key_values',)]),
+        section('SCALABILITY REQUIREMENTS', 'scalability_requirements', 'scalability-requirements', [('key_values',)]),
+        section('COMPLIANCE & STANDARDS', 'compliance_standards', 'compliance-standards', [
+            ('labelled_items', 'standard', 'description')
+        ])
+    ]
+}
+
+CR_SPEC = {
+    'header_title': 'Change Request Document',
+    'cover_title': 'CHANGE REQUEST DOCUMENT',
+    'subtitle': Field('change_request_id'),
+    'file_prefix': 'Change_Request_Document',
+    'document_control': {
+        'document_id': 'CR-001',
+        'author': 'Change Manager',
+        'department': 'Change Management'
+    },
+    'dashboard': {
+        'title': 'CR COVERAGE ANALYSIS',
+        'fields': [('Change Complexity', Field('change_complexity'))],
+        'metrics_heading': None
+    },
+    'sections': [
+        section('CHANGE REQUEST ID & TITLE', 'change_request_id', 'change-request-id', [('paragraph',)]),
+        section('BUSINESS JUSTIFICATION', 'business_justification', 'business-justification', [('paragraph',)]),
+        section('REQUESTOR INFORMATION', 'requestor_information', 'requestor-information', [('paragraph',)]),
+        section('IMPACT ANALYSIS', 'impact_analysis', 'impact-analysis', [('paragraph',)]),
+        section('CURRENT STATE', 'current_state', 'current-state', [('paragraph',)]),
+        section('PROPOSED CHANGES', 'proposed_changes', 'proposed-changes', [('paragraph',)]),
+        section('RISK ASSESSMENT', 'risk_assessment', 'risk-assessment', [
+            ('table', [
+                ('Risk ID', 'risk_id'),
+                ('Description', 'description'),
+                ('Probability', 'probability'),
+                ('Impact', 'impact'),
+                ('Mitigation', 'mitigation')
+            ], 10)
+        ]),
+        section('COST-BENEFIT ANALYSIS', 'cost_benefit_analysis', 'cost-benefit-analysis', [('key_values',)]),
+        section('IMPLEMENTATION TIMELINE', 'implementation_timeline', 'implementation-timeline', [
+            ('table', [
+                ('Phase', 'phase'),
+                ('Duration', 'duration'),
+                ('Deliverables', 'deliverables'),
+                ('Dependencies', 'dependencies')
+            ], 10)
+        ]),
+        section('STAKEHOLDER IMPACT', 'stakeholder_impact', 'stakeholder-impact', [
+            ('table', [
+                ('Stakeholder Group', 'stakeholder_group'),
+                ('Impact Level', 'impact_level'),
+                ('Impact Description', 'impact_description'),
+                ('Mitigation Actions', 'mitigation_actions')
+            ], 10)
+        ]),
+        section('TESTING REQUIREMENTS', 'testing_requirements', 'testing-requirements', [('key_values',)]),
+        section('APPROVAL WORKFLOW', 'approval_workflow', 'approval-workflow', [
+            ('table', [
+                ('Step', 'step'),
+                ('Approver Role', 'approver_role'),
+                ('Approver Name', 'approver_name'),
+                ('Approval Criteria', 'approval_criteria')
+            ], 10)
+        ]),
+        section('ROLLBACK PLAN', 'rollback_plan', 'rollback-plan', [('key_values',)]),
+        section('SUCCESS METRICS', 'success_metrics', 'success-metrics', [
+            ('table', [
+                ('Metric', 'metric_name'),
+                ('Measurement Method', 'measurement_method'),
+                ('Target Value', 'target_value'),
+                ('Monitoring Frequency', 'monitoring_frequency')
+            ], 10)
+        ]),
+        section('SUPPORTING DOCUMENTS', 'supporting_documents', 'supporting-documents', [('bullets', None, None)])
+    ]
+}
+
+DOCUMENT_SPECS = {
+    'story': STORY_SPEC,
+    'brd': BRD_SPEC,
+    'frd': FRD_SPEC,
+    'srd': SRD_SPEC,
+    'cr': CR_SPEC
+}
+
+def resolve_field(data, field):
+    """Read a Field from document data, applying its default and length limit"""
+    keys = field.key if isinstance(field.key, tuple) else (field.key,)
+    value = data
+    for key in keys:
+        value = value.get(key) if isinstance(value, dict) else None
+    if not value:
+        value = field.default
+    if value is None:
+        return None
+    value = str(value)
+    return value[:field.max_length] if field.max_length else value
+
+def resolve_value(data, value):
+    """Resolve a literal or Field from a spec"""
+    return resolve_field(data, value) if isinstance(value, Field) else value
+
+def format_value(value):
+    """Render a leaf value as text"""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ', '.join(format_value(item) for item in value)
+    if isinstance(value, dict):
+        return '; '.join(f"{key.replace('_', ' ').title()}: {format_value(item)}" for key, item in value.items())
+    return str(value)
+
+def key_label(key):
+    """Heading for a dict key in a key/value block"""
+    return key.replace('_', ' ').title()
+
+def coverage_metrics(coverage_data):
+    """Dashboard metric rows for a coverage analysis"""
+    analysis = coverage_data.get('coverage_analysis', {}) or {}
+    return [
+        ('Coverage Score', f"{coverage_data.get('overall_score', 0)}%"),
+        ('Covered Elements', str(len(analysis.get('present_elements', [])))),
+        ('Missing Elements', str(len(analysis.get('missing_elements', [])))),
+        ('Enterprise Readiness', str(coverage_data.get('enterprise_readiness', 'Unknown')))
+    ]
+
+def document_control_rows(spec):
+    """Rows of the document control table"""
+    control = spec['document_control']
+    return [
+        ('Document Title', spec['header_title']),
+        ('Document ID', control['document_id']),
+        ('Version', '1.0'),
+        ('Author', control['author']),
+        ('Department', control['department']),
+        ('Date', datetime.now().strftime('%Y-%m-%d'))
+    ]
+
+def section_image_key(section_id, section_images):
+    """Key a section's images are stored under, accepting hyphen or underscore ids"""
+    for key in (section_id, section_id.replace('-', '_'), section_id.replace('_', '-')):
+        if section_images and key in section_images:
+            return key
+    return None
+
+def find_section_images(section_id, section_images):
+    """Images attached to a section, accepting hyphen or underscore ids"""
+    key = section_image_key(section_id, section_images)
+    return (section_images[key] or []) if key is not None else []
+
+def _as_list(value):
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def _layout_block(block, value, data):
+    """Render operations for one content block of a section"""
+    kind = block[0]
+    if kind == 'paragraph':
+        if isinstance(value, dict):
+            return [('labelled', key_label(key), format_value(item)) for key, item in value.items()]
+        return [('paragraph', format_value(value))]
+
+    if kind in ('fields', 'key_values') and not isinstance(value, dict):
+        # The model returned prose where a structure was expected
+        return [('paragraph', format_value(value))] if value else []
+
+    if kind == 'fields':
+        return [('labelled', label, format_value(value[key])) for label, key in block[1] if value.get(key)]
+
+    if kind == 'key_values':
+        return [('labelled', key_label(key), format_value(item)) for key, item in value.items()]
+
+    if kind == 'bullets':
+        _, key, subheading = block
+        if key:
+            value = value.get(key) if isinstance(value, dict) else None
+        items = _as_list(value)
+        if not items:
+            return []
+        ops = [('heading', subheading, 2)] if subheading else []
+        ops.extend(('bullet', format_value(item)) for item in items)
+        return ops
+
+    if kind == 'numbered':
+        _, text_key, detail = block
+        ops = []
+        for i, item in enumerate(_as_list(value), 1):
+            if not isinstance(item, dict):
+                ops.append(('paragraph', f"{i}. {format_value(item)}"))
+                continue
+            ops.append(('paragraph', f"{i}. {format_value(item.get(text_key)) or text_key.title()}"))
+            if detail and item.get(detail[1]):
+                ops.append(('indented', f"{detail[0]}: {format_value(item[detail[1]])}"))
+        return ops
+
+    if kind == 'labelled_items':
+        _, label_key, text_key = block
+        return [('labelled', format_value(item.get(label_key)), format_value(item.get(text_key)))
+                for item in _as_list(value) if isinstance(item, dict)]
+
+    if kind == 'table':
+        _, columns, font_size = block
+        rows = [[format_value(item.get(key)) for _, key in columns]
+                for item in _as_list(value) if isinstance(item, dict)]
+        if not rows:
+            return []
+        return [('table', [header for header, _ in columns], rows, font_size)]
+
+    if kind == 'details':
+        return [('details', [(label, resolve_value(data, item) or '') for label, item in block[1]])]
+
+    if kind == 'static_bullets':
+        return [('bullet', item) for item in block[1]]
+
+    if kind == 'static_table':
+        return [('table', block[1], block[2], 11)]
+
+    raise ValueError(f"Unknown block type: {kind}")
+
+def layout_section(spec_section, data):
+    """Render operations for one section, or [] when its value is missing"""
+    value = None
+    if spec_section['key']:
+        value = data.get(spec_section['key'])
+        if not value:
+            return []
+
+    ops = [('heading', spec_section['title'], 1)]
+    for block in spec_section['blocks']:
+        ops.extend(_layout_block(block, value, data))
+    if spec_section['image']:
+        ops.append(('images', spec_section['image']))
+    if spec_section['separator']:
+        ops.append(('separator',))
+    return ops
+
+def layout_sections(spec, data):
+    """Render operations for the content sections of a document"""
+    ops = []
+    for spec_section in spec['sections']:
+        ops.extend(layout_section(spec_section, data))
+    return ops
+
+def layout_document(spec, data, coverage_data=None):
+    """Flatten everything after the cover page into render operations"""
+    ops = []
+    if spec.get('document_control'):
+        ops.append(('heading', 'DOCUMENT CONTROL', 1))
+        ops.append(('details', document_control_rows(spec)))
+        ops.append(('page_break',))
+
+    if coverage_data:
+        dashboard = spec['dashboard']
+        fields = [(label, resolve_field(coverage_data, field)) for label, field in dashboard['fields']]
+        ops.append(('dashboard', dashboard['title'], [(label, value) for label, value in fields if value],
+                    dashboard['metrics_heading'], coverage_metrics(coverage_data)))
+        ops.append(('page_break',))
+
+    ops.extend(layout_sections(spec, data))
+    return ops
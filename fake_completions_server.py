@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Fake Completions Server
+OpenAI-compatible chat completions endpoint that simulates upstream prefix
+(KV) caching, for benchmarking prompt layouts without calling Groq
+
+Usage: python fake_completions_server.py [--port 8766] [--prefill-us 50]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BLOCK_TOKENS = 16
+_TOKEN = re.compile(r'\w+|[^\w\s]')
+
+def tokenize(messages):
+    """Rough word-level tokens of a chat request, role markers included"""
+    tokens = []
+    for message in messages:
+        tokens.append(f"<|{message.get('role', 'user')}|>")
+        tokens.extend(_TOKEN.findall(message.get('content') or ''))
+    return tokens
+
+class PrefixCache:
+    """LRU of hashed token blocks, as in paged KV caches.
+
+    Each block's hash chains the hash of every block before it, so a
+    request only reuses the cached blocks of an identical leading prefix.
+    """
+
+    def __init__(self, capacity_blocks=8192):
+        self.capacity_blocks = capacity_blocks
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, tokens):
+        """Count the cached leading tokens and cache the request's full blocks"""
+        cached = 0
+        matching = True
+        parent = b''
+        with self._lock:
+            for start in range(0, len(tokens) - BLOCK_TOKENS + 1, BLOCK_TOKENS):
+                block = '\x1f'.join(tokens[start:start + BLOCK_TOKENS])
+                parent = hashlib.sha1(parent + block.encode('utf-8')).digest()
+                if matching and parent in self._blocks:
+                    cached += BLOCK_TOKENS
+                    self._blocks.move_to_end(parent)
+                    continue
+                matching = False
+                self._blocks[parent] = True
+                if len(self._blocks) > self.capacity_blocks:
+                    self._blocks.popitem(last=False)
+        return cached
+
+class FakeCompletions:
+    """Prefill time proportional to uncached prompt tokens, then a short decode"""
+
+    def __init__(self, prefill_seconds_per_token=0.00005, decode_seconds_per_token=0.002,
+                 completion_tokens=8, capacity_blocks=8192):
+        self.prefill_seconds_per_token = prefill_seconds_per_token
+        self.decode_seconds_per_token = decode_seconds_per_token
+        self.completion_tokens = completion_tokens
+        self.cache = PrefixCache(capacity_blocks)
+
+    def prefill(self, messages):
+        """Simulate prefill; returns (prompt_tokens, cached_tokens)"""
+        tokens = tokenize(messages)
+        cached = self.cache.lookup(tokens)
+        time.sleep((len(tokens) - cached) * self.prefill_seconds_per_token)
+        return len(tokens), cached
+
+class FakeCompletionsHandler(BaseHTTPRequestHandler):
+    completions = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _usage(self, prompt_tokens, cached_tokens):
+        return {'prompt_tokens': prompt_tokens, 'completion_tokens': self.completions.completion_tokens,
+                'total_tokens': prompt_tokens + self.completions.completion_tokens,
+                'prompt_tokens_details': {'cached_tokens': cached_tokens}}
+
+    def do_POST(self):
+        if self.path not in ('/openai/v1/chat/completions', '/v1/chat/completions'):
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        prompt_tokens, cached_tokens = self.completions.prefill(payload.get('messages', []))
+        pieces = ['{"status"', ': "ok"'] + [' '] * max(self.completions.completion_tokens - 3, 0) + ['}']
+
+        if not payload.get('stream'):
+            time.sleep(len(pieces) * self.completions.decode_seconds_per_token)
+            body = json.dumps({'object': 'chat.completion', 'model': payload.get('model'),
+                               'choices': [{'index': 0, 'finish_reason': 'stop',
+                                            'message': {'role': 'assistant', 'content': ''.join(pieces)}}],
+                               'usage': self._usage(prompt_tokens, cached_tokens)}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(self.completions.decode_seconds_per_token)
+            chunk = {'object': 'chat.completion.chunk', 'choices': [{'index': 0, 'delta': {'content': piece}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+        final = {'object': 'chat.completion.chunk', 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                 'usage': self._usage(prompt_tokens, cached_tokens)}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+def start_fake_completions(port=0, **options):
+    """Start the fake server on a background thread; returns (server, completions, base_url)"""
+    completions = FakeCompletions(**options)
+    handler = type('BoundFakeCompletionsHandler', (FakeCompletionsHandler,), {'completions': completions})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, completions, f'http://127.0.0.1:{server.server_address[1]}/openai/v1'
+
+def main():
+    """Run the fake completions server in the foreground"""
+    parser = argparse.ArgumentParser(description='Fake chat completions server with prefix caching')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--prefill-us', type=float, default=50, help='prefill time per uncached token (microseconds)')
+    args = parser.parse_args()
+
+    server, _, base_url = start_fake_completions(args.port, prefill_seconds_per_token=args.prefill_us / 1e6)
+    print(f"🧪 Fake completions listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+In-Memory App
+Minimal Flask app on an in-memory SQLite database, for tests
+"""
+
+from flask import Flask
+from models import db
+
+def create_test_app():
+    """Create a minimal app bound to an in-memory SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
@@ -0,0 +1,95 @@
+"""
+Incremental Regeneration
+Maps changed Q&A answers to the document sections they affect
+"""
+
+import re
+from field_questions import REQUIRED_FIELDS
+from brd_field_questions import BRD_REQUIRED_FIELDS
+from frd_field_questions import FRD_REQUIRED_FIELDS
+from srd_field_questions import SRD_REQUIRED_FIELDS
+from cr_field_questions import CR_REQUIRED_FIELDS
+
+DOCUMENT_FIELDS = {
+    'story': REQUIRED_FIELDS,
+    'brd': BRD_REQUIRED_FIELDS,
+    'frd': FRD_REQUIRED_FIELDS,
+    'srd': SRD_REQUIRED_FIELDS,
+    'cr': CR_REQUIRED_FIELDS
+}
+
+# Fields whose document section key is not simply the normalized field name.
+# An empty list means the field has no generated section (e.g. BRD document
+# control is rendered by the exporter, not the LLM).
+SECTION_OVERRIDES = {
+    'brd': {
+        'approval_section': ['approval_workflow'],
+        'document_control': []
+    }
+}
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def normalize_field(field_name):
+    """Normalize a field or element name to a document section key"""
+    return _NON_WORD.sub('_', str(field_name).lower()).strip('_')
+
+def _answer_text(value):
+    """Comparable form of an answer value"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+def diff_answers(previous_answers, answers):
+    """Return the answer fields that were added, removed or changed"""
+    previous_answers = previous_answers or {}
+    answers = answers or {}
+    changed = []
+    for field in list(previous_answers) + [f for f in answers if f not in previous_answers]:
+        if _answer_text(previous_answers.get(field)) != _answer_text(answers.get(field)):
+            changed.append(field)
+    return changed
+
+def sections_for_fields(document_type, fields, previous_document):
+    """Map changed answer fields to the top-level document sections they affect.
+
+    Returns an ordered list of section keys, or None when some field cannot
+    be mapped and the whole document has to be regenerated.
+    """
+    known_fields = {normalize_field(field) for field in DOCUMENT_FIELDS.get(document_type, [])}
+    overrides = SECTION_OVERRIDES.get(document_type, {})
+
+    sections = []
+    for field in fields:
+        key = normalize_field(field)
+        if key in overrides:
+            targets = overrides[key]
+        elif key in previous_document:
+            targets = [key]
+        elif key in known_fields:
+            # A known field the previous version never produced; regenerate it
+            targets = [key]
+        else:
+            return None
+
+        for target in targets:
+            if target not in sections:
+                sections.append(target)
+    return sections
+
+def plan_regeneration(document_type, previous_answers, answers, previous_document):
+    """Work out which sections need regenerating after an answer change.
+
+    Returns a (possibly empty) list of section keys, or None if a full
+    regeneration is required.
+    """
+    if not isinstance(previous_document, dict) or not previous_document:
+        return None
+    changed = diff_answers(previous_answers, answers)
+    return sections_for_fields(document_type, changed, previous_document)
+
+def merge_sections(previous_document, sections):
+    """Merge regenerated sections into the previous version of a document"""
+    merged = dict(previous_document)
+    merged.update(sections)
+    return merged
@@ -1,10 +1,14 @@
 from models import db, User, Story
 from app import app
+from migrate_history_schema import migrate_schema
 
 def init_db():
     """Initialize the database with tables"""
     with app.app_context():
         db.create_all()
+        # Existing tables are not altered by create_all
+        for change in migrate_schema():
+            print(f"Migrated: {change}")
         print("Database tables created successfully!")
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""
+LLM Cassette
+Records LLM completions and their timing to a compact file for deterministic replay
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import zlib
+
+CASSETTE_VERSION = 1
+
+def request_key(messages, model, temperature, max_tokens):
+    """Stable hash of everything that determines a completion"""
+    request = json.dumps({'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+                         sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()[:32]
+
+def _line(item):
+    return json.dumps(item, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+class Cassette:
+    """Completions keyed by request hash, stored as gzip-compressed JSON lines.
+
+    The first line is a header naming the recorded provider, model and
+    concurrency limit; every other line is one completion: its key, how
+    long it took, and the response or the error it failed with. A request
+    recorded several times replays its completions in recorded order,
+    then starts over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = {}
+        self.entries = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._writer = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+            try:
+                for line in handle:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    if 'version' in item:
+                        if item['version'] != CASSETTE_VERSION:
+                            raise ValueError(f"Unsupported cassette version {item['version']} in {self.path}")
+                        self.header = self.header or item
+                    elif 'key' in item:
+                        self.entries.setdefault(item['key'], []).append(item)
+            except (EOFError, zlib.error):
+                # A recording that was not closed cleanly keeps every line flushed before it stopped
+                pass
+
+    def __len__(self):
+        return sum(len(recorded) for recorded in self.entries.values())
+
+    def start_recording(self, **header):
+        """Open the cassette for appending; a new cassette gets header as its first line"""
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = gzip.open(self.path, 'at', encoding='utf-8')
+            atexit.register(self.close)
+            if not self.header:
+                self.header = dict(header, version=CASSETTE_VERSION)
+                self._write(self.header)
+
+    def _write(self, item):
+        self._writer.write(_line(item))
+        # Sync-flushed so a recording cut short stays readable
+        self._writer.flush()
+
+    def record(self, key, seconds, response=None, error=None):
+        """Append one completion (or the error it failed with) to the cassette"""
+        item = {'key': key, 'seconds': round(seconds, 4)}
+        if error is not None:
+            item['error'] = error
+        else:
+            item['response'] = response
+        with self._lock:
+            if self._writer is None:
+                raise RuntimeError(f"Cassette {self.path} is not open for recording")
+            self.entries.setdefault(key, []).append(item)
+            self._write(item)
+
+    def replay(self, key):
+        """The next recorded completion for a request key, or None if it was never recorded"""
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return recorded[index % len(recorded)]
+
+    def rewind(self):
+        """Replay every request from its first recorded completion again"""
+        with self._lock:
+            self._cursors.clear()
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -1,64 +1,117 @@
 import os
 import json
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor
 from field_questions import REQUIRED_FIELDS
 from brd_field_questions import BRD_REQUIRED_FIELDS
 from frd_field_questions import FRD_REQUIRED_FIELDS
 from cr_field_questions import CR_REQUIRED_FIELDS
 from srd_field_questions import SRD_REQUIRED_FIELDS
-from constants import DEFAULT_COVERAGE_ANALYSIS, DEFAULT_STORY_DATA
+from constants import DEFAULT_STORY_DATA
+from local_analyzer import local_coverage_analysis
+from prompt_registry import prompt_registry
+from request_hedging import RequestHedger
+from llm_providers import LLMProvider, get_provider
 
 class GroqClient:
-    def __init__(self):
-        self.api_key = os.getenv('GROQ_API_KEY')
+    # Prompt file and system message used to generate each document type
+    GENERATION_SETTINGS = {
+        'story': ('generate_story.txt', "You are a senior business analyst that creates detailed enterprise-grade user stories and returns only valid JSON responses."),
+        'brd': ('generate_brd.txt', "You are a senior business analyst that creates detailed enterprise-grade Business Requirements Documents and returns only valid JSON responses."),
+        'frd': ('generate_frd.txt', "You are a senior technical analyst that creates detailed enterprise-grade Functional Requirements Documents and returns only valid JSON responses."),
+        'srd': ('generate_srd.txt', "You are a senior system architect that creates detailed enterprise-grade System Requirements Documents and returns only valid JSON responses."),
+        'cr': ('generate_cr.txt', "You are a senior change management specialist that creates detailed enterprise-grade Change Request documents and returns only valid JSON responses.")
+    }
+    
+    # Name and required elements of each document type, for the combined document pack analysis
+    PACK_ELEMENTS = {
+        'story': ('User Story', REQUIRED_FIELDS),
+        'brd': ('Business Requirements Document', BRD_REQUIRED_FIELDS),
+        'frd': ('Functional Requirements Document', FRD_REQUIRED_FIELDS),
+        'srd': ('System Requirements Document', SRD_REQUIRED_FIELDS),
+        'cr': ('Change Request', CR_REQUIRED_FIELDS)
+    }
+    
+    # Single-type analyses the pack falls back to when the combined reply is unusable
+    PACK_ANALYZERS = {
+        'story': 'analyze_requirement_coverage',
+        'brd': 'analyze_brd_requirement_coverage',
+        'frd': 'analyze_frd_requirement_coverage',
+        'srd': 'analyze_srd_requirement_coverage',
+        'cr': 'analyze_cr_requirement_coverage'
+    }
+    
+    # The combined pack analysis covers every element of several document
+    # types at once, so it gets a larger completion budget than one analysis
+    PACK_MAX_TOKENS = int(os.getenv('GROQ_PACK_MAX_TOKENS', '8000'))
+    
+    # 'inline' keeps the data where the template puts it; 'prefix' sends each
+    # template's static instructions and schema as the system message and the
+    # request data last, so upstream prefix caching can reuse them
+    PROMPT_LAYOUT = os.getenv('PROMPT_LAYOUT', 'inline')
+    
+    def __init__(self, provider=None):
+        """provider is an LLMProvider, a provider name, or None for LLM_PROVIDER"""
         self.debug_mode = os.getenv('FLASK_ENV') == 'development'
         
-        if self.debug_mode:
-            print(f"DEBUG - API Key configured: {bool(self.api_key)}")
-        
-        if not self.api_key:
-            if self.debug_mode:
-                print("ERROR - GROQ_API_KEY not found in environment")
-            raise ValueError("GROQ_API_KEY environment variable is required")
-        
         try:
-            self.client = Groq(api_key=self.api_key)
+            self.provider = provider if isinstance(provider, LLMProvider) else get_provider(provider)
             if self.debug_mode:
-                print("DEBUG - Groq client initialized successfully")
+                print(f"DEBUG - LLM provider initialized: {self.provider.name}")
         except Exception as e:
             if self.debug_mode:
-                print(f"ERROR - Groq client initialization failed: {str(e)}")
+                print(f"ERROR - LLM provider initialization failed: {str(e)}")
             raise
         
-        self.model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
+        self.model = self.provider.default_model
         self.temperature = float(os.getenv('GROQ_TEMPERATURE', '0.3'))
         self.max_tokens = int(os.getenv('GROQ_MAX_TOKENS', '3000'))
         
+        # Backup requests for slow completions, optionally to another model
+        self.hedger = RequestHedger()
+        self.hedge_model = os.getenv('LLM_HEDGE_MODEL') or self.model
+        
         if self.debug_mode:
             print(f"DEBUG - Model: {self.model}, Temp: {self.temperature}, Tokens: {self.max_tokens}")
+            if self.hedger.enabled:
+                print(f"DEBUG - Hedging at p{self.hedger.percentile:g} to {self.hedge_model}, max rate {self.hedger.max_rate:g}")
     
-    def _load_prompt(self, prompt_file):
-        """Load prompt from file"""
-        try:
-            with open(f'prompts/{prompt_file}', 'r', encoding='utf-8') as f:
-                return f.read().strip()
-        except FileNotFoundError:
+    def _render_prompt(self, prompt_file, **values):
+        """Fill a compiled prompt template, or None if the prompt is missing"""
+        return prompt_registry.render(prompt_file, **values)
+    
+    def _prompt_messages(self, prompt_file, system_message, **values):
+        """Chat messages for a prompt template in the configured layout, or None if the prompt is missing"""
+        template = prompt_registry.get(prompt_file)
+        if not template:
             return None
+        
+        if self.PROMPT_LAYOUT == 'prefix':
+            return [
+                {"role": "system", "content": f"{system_message}\n\n{template.static_text}"},
+                {"role": "user", "content": template.render_dynamic(**values)}
+            ]
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": template.render(**values)}
+        ]
     
-    def _make_request(self, messages):
-        """Make request to Groq API"""
+    def _complete(self, messages, model, max_tokens=None):
+        """One chat completion call"""
+        return self.provider.complete(messages, model, self.temperature, max_tokens or self.max_tokens)
+    
+    def _make_request(self, messages, max_tokens=None):
+        """Make request to the LLM provider, hedged with a backup request when it runs slow"""
         try:
             if self.debug_mode:
                 print(f"DEBUG - Making API call with model: {self.model}")
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+            # Latency is tracked per prompt: the system message identifies it
+            content = self.hedger.call(
+                messages[0]["content"],
+                self._complete,
+                (messages, self.model, max_tokens),
+                (messages, self.hedge_model, max_tokens)
             )
-            content = response.choices[0].message.content
             
             if self.debug_mode:
                 print(f"DEBUG - API Response received: {len(content)} characters")
@@ -69,11 +122,102 @@ class GroqClient:
                 print(f"DEBUG - Error Type: {type(e).__name__}")
             return None
     
+    def _build_generation_messages(self, document_type, requirement, answers, coverage_analysis=None):
+        """Build the chat messages that generate a document, or None if the prompt is missing.
+        
+        coverage_analysis is either the analysis dict or its text digest.
+        """
+        prompt_file, system_message = self.GENERATION_SETTINGS[document_type]
+        
+        answers_text = json.dumps(answers, indent=2) if answers else "None provided"
+        if isinstance(coverage_analysis, str):
+            # Already digested by the analysis session
+            coverage_text = coverage_analysis or "None provided"
+        else:
+            coverage_text = json.dumps(coverage_analysis, separators=(',', ':')) if coverage_analysis else "None provided"
+        
+        return self._prompt_messages(
+            prompt_file,
+            system_message,
+            requirement=requirement,
+            answers=answers_text,
+            coverage_analysis=coverage_text
+        )
+    
+    def _get_default_document(self, document_type):
+        """Get the fallback document for a document type"""
+        defaults = {
+            'story': lambda: DEFAULT_STORY_DATA,
+            'brd': self._get_default_brd_data,
+            'frd': self._get_default_frd_data,
+            'srd': self._get_default_srd_data,
+            'cr': self._get_default_cr_data
+        }
+        return defaults[document_type]()
+    
+    def try_generate_document(self, document_type, requirement, answers, coverage_analysis=None):
+        """Generate a complete document of the given type, or None if the LLM call failed.
+        
+        Unlike the generate_* methods this never substitutes the default
+        document, for callers that can retry or report the failure.
+        """
+        try:
+            messages = self._build_generation_messages(document_type, requirement, answers, coverage_analysis)
+            if not messages:
+                return None
+            
+            response = self._make_request(messages)
+            if not response:
+                return None
+            
+            document = json.loads(response)
+            return document if isinstance(document, dict) and document else None
+                
+        except Exception as e:
+            if self.debug_mode:
+                print(f"ERROR - {document_type} generation failed: {str(e)}")
+            return None
+    
+    def _generate_document(self, document_type, requirement, answers, coverage_analysis=None):
+        """Generate a complete document of the given type, or its default document if that fails"""
+        document = self.try_generate_document(document_type, requirement, answers, coverage_analysis)
+        return document if document is not None else self._get_default_document(document_type)
+    
+    def generate_sections(self, document_type, requirement, answers, coverage_analysis, sections, previous_document):
+        """Regenerate only the given top-level sections of a previously generated document.
+        
+        Returns a dict of the regenerated sections, or None if regeneration failed.
+        """
+        try:
+            messages = self._build_generation_messages(document_type, requirement, answers, coverage_analysis)
+            previous_sections = {section: previous_document.get(section) for section in sections}
+            instructions = self._render_prompt(
+                'regenerate_sections.txt',
+                sections=', '.join(sections),
+                previous_sections=json.dumps(previous_sections, indent=2)
+            )
+            if not messages or not instructions:
+                return None
+            
+            messages[1]["content"] += "\n\n" + instructions
+            
+            response = self._make_request(messages)
+            if not response:
+                return None
+            
+            regenerated = json.loads(response)
+            if not isinstance(regenerated, dict) or not all(section in regenerated for section in sections):
+                return None
+            return {section: regenerated[section] for section in sections}
+                
+        except Exception:
+            return None
+    
     def analyze_requirement(self, requirement):
         """Analyze requirement and generate questions for missing fields"""
-        prompt_template = self._load_prompt('analyze_requirement.txt')
-        if not prompt_template:
-            prompt_template = """You are a business analyst. Analyze the given requirement and determine which fields are present and which are missing.
+        prompt = self._render_prompt('analyze_requirement.txt', fields=', '.join(REQUIRED_FIELDS), requirement=requirement)
+        if not prompt:
+            prompt = """You are a business analyst. Analyze the given requirement and determine which fields are present and which are missing.
 
 Required fields: {fields}
 
@@ -96,12 +240,7 @@ Return ONLY valid JSON in this format:
       "expected_answer_format": ""
     }}
   ]
-}}"""
-        
-        prompt = prompt_template.format(
-            fields=', '.join(REQUIRED_FIELDS),
-            requirement=requirement
-        )
+}}""".format(fields=', '.join(REQUIRED_FIELDS), requirement=requirement)
         
         messages = [
             {"role": "system", "content": "You are a business analyst that returns only valid JSON responses."},
@@ -120,20 +259,17 @@ Return ONLY valid JSON in this format:
     def analyze_requirement_coverage(self, requirement):
         """Analyze requirement coverage against 10 enterprise elements"""
         try:
-            prompt_template = self._load_prompt('analyze_requirement.txt')
-            if not prompt_template:
-                return DEFAULT_COVERAGE_ANALYSIS
-            
-            prompt = prompt_template.format(requirement=requirement)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert business analyst that analyzes requirements and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._prompt_messages(
+                'analyze_requirement.txt',
+                "You are an expert business analyst that analyzes requirements and returns only valid JSON responses.",
+                requirement=requirement
+            )
+            if not messages:
+                return self._local_coverage_analysis('story', requirement)
             
             response = self._make_request(messages)
             if not response:
-                return DEFAULT_COVERAGE_ANALYSIS
+                return self._local_coverage_analysis('story', requirement)
             
             try:
                 parsed_response = json.loads(response)
@@ -143,61 +279,29 @@ Return ONLY valid JSON in this format:
                 if self.debug_mode:
                     print(f"DEBUG - JSON Parse failed: {str(e)}")
                     print(f"DEBUG - Raw response: {response[:500]}")
-                return DEFAULT_COVERAGE_ANALYSIS
+                return self._local_coverage_analysis('story', requirement)
                 
         except Exception:
-            return DEFAULT_COVERAGE_ANALYSIS
+            return self._local_coverage_analysis('story', requirement)
     
     def generate_story(self, requirement, answers, coverage_analysis=None):
         """Generate complete user story from requirement and answers"""
-        try:
-            prompt_template = self._load_prompt('generate_story.txt')
-            if not prompt_template:
-                return DEFAULT_STORY_DATA
-            
-            answers_text = json.dumps(answers, indent=2) if answers else "None provided"
-            coverage_text = json.dumps(coverage_analysis, indent=2) if coverage_analysis else "None provided"
-            
-            prompt = prompt_template.format(
-                requirement=requirement,
-                answers=answers_text,
-                coverage_analysis=coverage_text
-            )
-            
-            messages = [
-                {"role": "system", "content": "You are a senior business analyst that creates detailed enterprise-grade user stories and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_request(messages)
-            if not response:
-                return DEFAULT_STORY_DATA
-            
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return DEFAULT_STORY_DATA
-                
-        except Exception:
-            return DEFAULT_STORY_DATA
+        return self._generate_document('story', requirement, answers, coverage_analysis)
     
     def analyze_brd_requirement_coverage(self, requirement):
         """Analyze requirement coverage against 15 BRD elements"""
         try:
-            prompt_template = self._load_prompt('analyze_brd_requirement.txt')
-            if not prompt_template:
-                return self._get_default_brd_coverage_analysis()
-            
-            prompt = prompt_template.format(requirement=requirement)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert business analyst that analyzes business requirements and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._prompt_messages(
+                'analyze_brd_requirement.txt',
+                "You are an expert business analyst that analyzes business requirements and returns only valid JSON responses.",
+                requirement=requirement
+            )
+            if not messages:
+                return self._local_coverage_analysis('brd', requirement)
             
             response = self._make_request(messages)
             if not response:
-                return self._get_default_brd_coverage_analysis()
+                return self._local_coverage_analysis('brd', requirement)
             
             try:
                 parsed_response = json.loads(response)
@@ -208,61 +312,29 @@ Return ONLY valid JSON in this format:
                 if self.debug_mode:
                     print(f"DEBUG - BRD JSON Parse failed: {str(e)}")
                     print(f"DEBUG - Raw response: {response[:500]}")
-                return self._get_default_brd_coverage_analysis()
+                return self._local_coverage_analysis('brd', requirement)
                 
         except Exception:
-            return self._get_default_brd_coverage_analysis()
+            return self._local_coverage_analysis('brd', requirement)
     
     def generate_brd(self, requirement, answers, coverage_analysis=None):
         """Generate complete BRD from requirement and answers"""
-        try:
-            prompt_template = self._load_prompt('generate_brd.txt')
-            if not prompt_template:
-                return self._get_default_brd_data()
-            
-            answers_text = json.dumps(answers, indent=2) if answers else "None provided"
-            coverage_text = json.dumps(coverage_analysis, indent=2) if coverage_analysis else "None provided"
-            
-            prompt = prompt_template.format(
-                requirement=requirement,
-                answers=answers_text,
-                coverage_analysis=coverage_text
-            )
-            
-            messages = [
-                {"role": "system", "content": "You are a senior business analyst that creates detailed enterprise-grade Business Requirements Documents and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_request(messages)
-            if not response:
-                return self._get_default_brd_data()
-            
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return self._get_default_brd_data()
-                
-        except Exception:
-            return self._get_default_brd_data()
+        return self._generate_document('brd', requirement, answers, coverage_analysis)
     
     def analyze_frd_requirement_coverage(self, requirement):
         """Analyze requirement coverage against 14 FRD elements"""
         try:
-            prompt_template = self._load_prompt('analyze_frd_requirement.txt')
-            if not prompt_template:
-                return self._get_default_frd_coverage_analysis()
-            
-            prompt = prompt_template.format(requirement=requirement)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert technical analyst that analyzes functional requirements and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._prompt_messages(
+                'analyze_frd_requirement.txt',
+                "You are an expert technical analyst that analyzes functional requirements and returns only valid JSON responses.",
+                requirement=requirement
+            )
+            if not messages:
+                return self._local_coverage_analysis('frd', requirement)
             
             response = self._make_request(messages)
             if not response:
-                return self._get_default_frd_coverage_analysis()
+                return self._local_coverage_analysis('frd', requirement)
             
             try:
                 parsed_response = json.loads(response)
@@ -273,61 +345,29 @@ Return ONLY valid JSON in this format:
                 if self.debug_mode:
                     print(f"DEBUG - FRD JSON Parse failed: {str(e)}")
                     print(f"DEBUG - Raw response: {response[:500]}")
-                return self._get_default_frd_coverage_analysis()
+                return self._local_coverage_analysis('frd', requirement)
                 
         except Exception:
-            return self._get_default_frd_coverage_analysis()
+            return self._local_coverage_analysis('frd', requirement)
     
     def generate_frd(self, requirement, answers, coverage_analysis=None):
         """Generate complete FRD from requirement and answers"""
-        try:
-            prompt_template = self._load_prompt('generate_frd.txt')
-            if not prompt_template:
-                return self._get_default_frd_data()
-            
-            answers_text = json.dumps(answers, indent=2) if answers else "None provided"
-            coverage_text = json.dumps(coverage_analysis, indent=2) if coverage_analysis else "None provided"
-            
-            prompt = prompt_template.format(
-                requirement=requirement,
-                answers=answers_text,
-                coverage_analysis=coverage_text
-            )
-            
-            messages = [
-                {"role": "system", "content": "You are a senior technical analyst that creates detailed enterprise-grade Functional Requirements Documents and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_request(messages)
-            if not response:
-                return self._get_default_frd_data()
-            
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return self._get_default_frd_data()
-                
-        except Exception:
-            return self._get_default_frd_data()
+        return self._generate_document('frd', requirement, answers, coverage_analysis)
     
     def analyze_srd_requirement_coverage(self, requirement):
         """Analyze requirement coverage against 12 SRD elements"""
         try:
-            prompt_template = self._load_prompt('analyze_srd_requirement.txt')
-            if not prompt_template:
-                return self._get_default_srd_coverage_analysis()
-            
-            prompt = prompt_template.format(requirement=requirement)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert system architect that analyzes system requirements and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._prompt_messages(
+                'analyze_srd_requirement.txt',
+                "You are an expert system architect that analyzes system requirements and returns only valid JSON responses.",
+                requirement=requirement
+            )
+            if not messages:
+                return self._local_coverage_analysis('srd', requirement)
             
             response = self._make_request(messages)
             if not response:
-                return self._get_default_srd_coverage_analysis()
+                return self._local_coverage_analysis('srd', requirement)
             
             try:
                 parsed_response = json.loads(response)
@@ -338,61 +378,29 @@ Return ONLY valid JSON in this format:
                 if self.debug_mode:
                     print(f"DEBUG - SRD JSON Parse failed: {str(e)}")
                     print(f"DEBUG - Raw response: {response[:500]}")
-                return self._get_default_srd_coverage_analysis()
+                return self._local_coverage_analysis('srd', requirement)
                 
         except Exception:
-            return self._get_default_srd_coverage_analysis()
+            return self._local_coverage_analysis('srd', requirement)
     
     def generate_srd(self, requirement, answers, coverage_analysis=None):
         """Generate complete SRD from requirement and answers"""
-        try:
-            prompt_template = self._load_prompt('generate_srd.txt')
-            if not prompt_template:
-                return self._get_default_srd_data()
-            
-            answers_text = json.dumps(answers, indent=2) if answers else "None provided"
-            coverage_text = json.dumps(coverage_analysis, indent=2) if coverage_analysis else "None provided"
-            
-            prompt = prompt_template.format(
-                requirement=requirement,
-                answers=answers_text,
-                coverage_analysis=coverage_text
-            )
-            
-            messages = [
-                {"role": "system", "content": "You are a senior system architect that creates detailed enterprise-grade System Requirements Documents and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_request(messages)
-            if not response:
-                return self._get_default_srd_data()
-            
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return self._get_default_srd_data()
-                
-        except Exception:
-            return self._get_default_srd_data()
+        return self._generate_document('srd', requirement, answers, coverage_analysis)
     
     def analyze_cr_requirement_coverage(self, requirement):
         """Analyze requirement coverage against 15 CR elements"""
         try:
-            prompt_template = self._load_prompt('analyze_cr_requirement.txt')
-            if not prompt_template:
-                return self._get_default_cr_coverage_analysis()
-            
-            prompt = prompt_template.format(requirement=requirement)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert change management analyst that analyzes change requests and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._prompt_messages(
+                'analyze_cr_requirement.txt',
+                "You are an expert change management analyst that analyzes change requests and returns only valid JSON responses.",
+                requirement=requirement
+            )
+            if not messages:
+                return self._local_coverage_analysis('cr', requirement)
             
             response = self._make_request(messages)
             if not response:
-                return self._get_default_cr_coverage_analysis()
+                return self._local_coverage_analysis('cr', requirement)
             
             try:
                 parsed_response = json.loads(response)
@@ -403,64 +411,68 @@ Return ONLY valid JSON in this format:
                 if self.debug_mode:
                     print(f"DEBUG - CR JSON Parse failed: {str(e)}")
                     print(f"DEBUG - Raw response: {response[:500]}")
-                return self._get_default_cr_coverage_analysis()
+                return self._local_coverage_analysis('cr', requirement)
                 
         except Exception:
-            return self._get_default_cr_coverage_analysis()
+            return self._local_coverage_analysis('cr', requirement)
     
     def generate_cr(self, requirement, answers, coverage_analysis=None):
         """Generate complete CR from requirement and answers"""
+        return self._generate_document('cr', requirement, answers, coverage_analysis)
+    
+    def analyze_pack_coverage(self, requirement, document_types):
+        """Analyze one requirement for several document types in a single call.
+        
+        Returns the parsed response, keyed by document type, or None if the call failed.
+        A reply that does not parse, usually one cut off at PACK_MAX_TOKENS, is
+        replaced by separate analyses of each type, run concurrently.
+        """
         try:
-            prompt_template = self._load_prompt('generate_cr.txt')
-            if not prompt_template:
-                return self._get_default_cr_data()
-            
-            answers_text = json.dumps(answers, indent=2) if answers else "None provided"
-            coverage_text = json.dumps(coverage_analysis, indent=2) if coverage_analysis else "None provided"
-            
-            prompt = prompt_template.format(
-                requirement=requirement,
-                answers=answers_text,
-                coverage_analysis=coverage_text
+            document_elements = '\n'.join(
+                f"{document_type}: {self.PACK_ELEMENTS[document_type][0]} - {', '.join(self.PACK_ELEMENTS[document_type][1])}"
+                for document_type in document_types
             )
+            messages = self._prompt_messages(
+                'analyze_pack_requirement.txt',
+                "You are an expert business analyst that analyzes requirements for several document types at once and returns only valid JSON responses.",
+                document_elements=document_elements,
+                requirement=requirement
+            )
+            if not messages:
+                return None
             
-            messages = [
-                {"role": "system", "content": "You are a senior change management specialist that creates detailed enterprise-grade Change Request documents and returns only valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self._make_request(messages)
+            response = self._make_request(messages, self.PACK_MAX_TOKENS)
             if not response:
-                return self._get_default_cr_data()
+                print(f"WARNING - Pack analysis call failed, using the local analyzer for {', '.join(document_types)}")
+                return None
             
             try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return self._get_default_cr_data()
+                parsed_response = json.loads(response)
+            except json.JSONDecodeError as e:
+                print(f"WARNING - Pack analysis unusable ({str(e)}, {len(response)} characters), "
+                      f"analyzing {', '.join(document_types)} separately")
+                return self._separate_pack_analyses(requirement, document_types)
+            
+            if self.debug_mode:
+                print(f"DEBUG - Pack analysis parsed successfully: {list(parsed_response.keys())}")
+            return parsed_response if isinstance(parsed_response, dict) else None
                 
-        except Exception:
-            return self._get_default_cr_data()
+        except Exception as e:
+            print(f"WARNING - Pack analysis failed, using the local analyzer: {str(e)}")
+            return None
     
-    def _get_default_brd_coverage_analysis(self):
-        """Get default BRD coverage analysis"""
-        return {
-            "coverage_analysis": {
-                "present_elements": [],
-                "missing_elements": [
-                    {"element": field, "status": "missing", "details": f"No {field.lower()} information provided", "editable": True}
-                    for field in BRD_REQUIRED_FIELDS
-                ]
-            },
-            "overall_score": 0,
-            "enterprise_readiness": "Needs Significant Enhancement",
-            "critical_gaps": BRD_REQUIRED_FIELDS,
-            "editable_recommendations": [
-                {"element": field, "question": f"Please provide {field.lower()} details", "suggested_answer": "To be determined", "field_type": "textarea"}
-                for field in BRD_REQUIRED_FIELDS
-            ],
-            "requirement_category": "Business Process",
-            "project_name": "Business Requirements Project"
-        }
+    def _separate_pack_analyses(self, requirement, document_types):
+        """One regular analysis per document type, keyed like the combined response"""
+        with ThreadPoolExecutor(max_workers=len(document_types)) as executor:
+            futures = {document_type: executor.submit(getattr(self, self.PACK_ANALYZERS[document_type]), requirement)
+                       for document_type in document_types}
+            return {document_type: future.result() for document_type, future in futures.items()}
+    
+    def _local_coverage_analysis(self, document_type, requirement):
+        """Keyword-based coverage analysis, used when the LLM analysis fails"""
+        if self.debug_mode:
+            print(f"DEBUG - {document_type.upper()} analysis unavailable, using the local analyzer")
+        return local_coverage_analysis(document_type, requirement)
     
     def _get_default_brd_data(self):
         """Get default BRD data structure"""
@@ -508,27 +520,6 @@ Return ONLY valid JSON in this format:
             ]
         }
     
-    def _get_default_frd_coverage_analysis(self):
-        """Get default FRD coverage analysis"""
-        return {
-            "coverage_analysis": {
-                "present_elements": [],
-                "missing_elements": [
-                    {"element": field, "status": "missing", "details": f"No {field.lower()} information provided", "editable": True}
-                    for field in FRD_REQUIRED_FIELDS
-                ]
-            },
-            "overall_score": 0,
-            "enterprise_readiness": "Needs Significant Enhancement",
-            "critical_gaps": FRD_REQUIRED_FIELDS,
-            "editable_recommendations": [
-                {"element": field, "question": f"Please provide {field.lower()} details", "suggested_answer": "To be determined", "field_type": "textarea"}
-                for field in FRD_REQUIRED_FIELDS
-            ],
-            "requirement_category": "Technical Requirements",
-            "system_complexity": "Medium"
-        }
-    
     def _get_default_frd_data(self):
         """Get default FRD data structure"""
         return {
@@ -597,27 +588,6 @@ Return ONLY valid JSON in this format:
             ]
         }
     
-    def _get_default_srd_coverage_analysis(self):
-        """Get default SRD coverage analysis"""
-        return {
-            "coverage_analysis": {
-                "present_elements": [],
-                "missing_elements": [
-                    {"element": field, "status": "missing", "details": f"No {field.lower()} information provided", "editable": True}
-                    for field in SRD_REQUIRED_FIELDS
-                ]
-            },
-            "overall_score": 0,
-            "enterprise_readiness": "Needs Significant Enhancement",
-            "critical_gaps": SRD_REQUIRED_FIELDS,
-            "editable_recommendations": [
-                {"element": field, "question": f"Please provide {field.lower()} details", "suggested_answer": "To be determined", "field_type": "textarea"}
-                for field in SRD_REQUIRED_FIELDS
-            ],
-            "requirement_category": "System Requirements",
-            "system_complexity": "Medium"
-        }
-    
     def _get_default_srd_data(self):
         """Get default SRD data structure"""
         return {
@@ -689,27 +659,6 @@ Return ONLY valid JSON in this format:
             ]
         }
     
-    def _get_default_cr_coverage_analysis(self):
-        """Get default CR coverage analysis"""
-        return {
-            "coverage_analysis": {
-                "present_elements": [],
-                "missing_elements": [
-                    {"element": field, "status": "missing", "details": f"No {field.lower()} information provided", "editable": True}
-                    for field in CR_REQUIRED_FIELDS
-                ]
-            },
-            "overall_score": 0,
-            "enterprise_readiness": "Needs Significant Enhancement",
-            "critical_gaps": CR_REQUIRED_FIELDS,
-            "editable_recommendations": [
-                {"element": field, "question": f"Please provide {field.lower()} details", "suggested_answer": "To be determined", "field_type": "textarea"}
-                for field in CR_REQUIRED_FIELDS
-            ],
-            "requirement_category": "Change Management",
-            "change_complexity": "Medium"
-        }
-    
     def _get_default_cr_data(self):
         """Get default CR data structure"""
         return {
@@ -0,0 +1,279 @@
+"""
+LLM Providers
+Chat completion backends behind GroqClient: Groq, local OpenAI-compatible servers, fixtures and cassettes
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+import httpx
+from groq import Groq
+from llm_cassette import Cassette, request_key
+
+# LLM_PROVIDER (groq by default) is read when the default provider is first
+# requested, so it can still be set after this module is imported
+
+# Provider for batch analysis and document packs; empty uses LLM_PROVIDER
+LLM_BULK_PROVIDER = os.getenv('LLM_BULK_PROVIDER', '')
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '120'))
+
+GROQ_MAX_CONCURRENCY = int(os.getenv('GROQ_MAX_CONCURRENCY', '8'))
+
+LOCAL_LLM_BASE_URL = os.getenv('LOCAL_LLM_BASE_URL', 'http://localhost:8080/v1')
+LOCAL_LLM_API_KEY = os.getenv('LOCAL_LLM_API_KEY', '')
+LOCAL_LLM_MODEL = os.getenv('LOCAL_LLM_MODEL', 'local-model')
+LOCAL_LLM_MAX_CONCURRENCY = int(os.getenv('LOCAL_LLM_MAX_CONCURRENCY', '4'))
+LOCAL_LLM_JSON_MODE = os.getenv('LOCAL_LLM_JSON_MODE', 'true').lower() == 'true'
+
+LLM_FIXTURES = os.getenv('LLM_FIXTURES', '')
+
+LLM_CASSETTE = os.getenv('LLM_CASSETTE', 'llm_cassette.jsonl.gz')
+# 'record' calls LLM_CASSETTE_SOURCE and saves its completions; 'replay' answers from the cassette
+LLM_CASSETTE_MODE = os.getenv('LLM_CASSETTE_MODE', 'replay')
+LLM_CASSETTE_SOURCE = os.getenv('LLM_CASSETTE_SOURCE', 'groq')
+# Replay delay as a multiple of the recorded time: 0 answers at once, 1.0 is real time
+LLM_CASSETTE_PACING = float(os.getenv('LLM_CASSETTE_PACING', '0'))
+
+class ProviderError(Exception):
+    """A completion request the backend rejected or answered unusably"""
+
+class LLMProvider:
+    """A chat completion backend with its own connection pool and concurrency limit.
+
+    Requests beyond max_concurrency wait for a free slot, so a slow or
+    small backend is never sent more work than it can take at once.
+    """
+
+    name = 'base'
+
+    def __init__(self, default_model, max_concurrency):
+        self.default_model = default_model
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counts = {'requests': 0, 'errors': 0, 'queued': 0}
+
+    def complete(self, messages, model=None, temperature=0.3, max_tokens=3000):
+        """Content of one JSON chat completion"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counts['queued'] += 1
+            self._slots.acquire()
+        with self._lock:
+            self._counts['requests'] += 1
+            self._in_flight += 1
+        try:
+            return self._complete(messages, model or self.default_model, temperature, max_tokens)
+        except Exception:
+            with self._lock:
+                self._counts['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        raise NotImplementedError
+
+    @property
+    def in_flight(self):
+        with self._lock:
+            return self._in_flight
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, provider=self.name, model=self.default_model,
+                        max_concurrency=self.max_concurrency, in_flight=self._in_flight)
+
+def _http_client(max_concurrency, timeout):
+    """A pooled HTTP client sized to the provider's concurrency"""
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    return httpx.Client(limits=limits, timeout=httpx.Timeout(timeout, connect=10.0))
+
+class GroqProvider(LLMProvider):
+    """Groq's hosted API"""
+
+    name = 'groq'
+
+    def __init__(self, api_key=None, model=None, max_concurrency=GROQ_MAX_CONCURRENCY, timeout=LLM_TIMEOUT):
+        api_key = api_key or os.getenv('GROQ_API_KEY')
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable is required")
+        super().__init__(model or os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant'), max_concurrency)
+        self.client = Groq(api_key=api_key, http_client=_http_client(max_concurrency, timeout))
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any server speaking the OpenAI chat completions API, e.g. a local llama.cpp or vLLM"""
+
+    name = 'local'
+
+    def __init__(self, base_url=LOCAL_LLM_BASE_URL, api_key=LOCAL_LLM_API_KEY, model=LOCAL_LLM_MODEL,
+                 max_concurrency=LOCAL_LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT, json_mode=LOCAL_LLM_JSON_MODE):
+        super().__init__(model, max_concurrency)
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.json_mode = json_mode
+        self._headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+        self._client = _http_client(max_concurrency, timeout)
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        payload = {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens}
+        if self.json_mode:
+            payload['response_format'] = {'type': 'json_object'}
+
+        response = self._client.post(self.url, json=payload, headers=self._headers)
+        if response.status_code != 200:
+            raise ProviderError(f"{self.url} returned {response.status_code}: {response.text[:200]}")
+        try:
+            return response.json()['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Unexpected completion from {self.url}: {str(e)}")
+
+class FixtureProvider(LLMProvider):
+    """Deterministic canned completions, for tests and fully offline runs.
+
+    Each fixture is a (match, response) pair; the first whose match occurs
+    in the request's messages answers it. Unmatched requests get
+    default_response, by default an empty completion, which GroqClient
+    treats as a failed call: analyses fall back to the local analyzer and
+    documents to their defaults.
+    """
+
+    name = 'fixture'
+
+    def __init__(self, fixtures=None, path=LLM_FIXTURES, default_response='', max_concurrency=64):
+        super().__init__('fixture', max_concurrency)
+        self.fixtures = []
+        self.default_response = default_response
+        self.calls = deque(maxlen=100)
+        if path:
+            with open(path, encoding='utf-8') as handle:
+                for fixture in json.load(handle):
+                    self.add(fixture['match'], fixture['response'])
+        for match, response in fixtures or ():
+            self.add(match, response)
+
+    def add(self, match, response):
+        """Answer requests mentioning match with response (dicts and lists are sent as JSON)"""
+        self.fixtures.append((match, response if isinstance(response, str) else json.dumps(response)))
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        self.calls.append(messages)
+        text = '\n'.join(str(message.get('content', '')) for message in messages)
+        for match, response in self.fixtures:
+            if match in text:
+                return response
+        return self.default_response
+
+class CassetteProvider(LLMProvider):
+    """Records another provider's completions to a cassette, or replays them.
+
+    Recording times every completion, failures included. Replay needs no
+    network access and returns the recorded completion for an identical
+    request, at once or after its recorded time scaled by pacing. It keeps
+    the recording's concurrency limit, so paced runs queue as the original
+    did. A request that was never recorded fails like a provider error.
+    Paced delays go through sleep, which defaults to time.sleep.
+    """
+
+    name = 'cassette'
+
+    def __init__(self, path=LLM_CASSETTE, mode=LLM_CASSETTE_MODE, source=None, pacing=LLM_CASSETTE_PACING,
+                 sleep=time.sleep):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.cassette = Cassette(path)
+        self.mode = mode
+        self.pacing = pacing
+        self.sleep = sleep
+        self.source = None
+
+        if mode == 'record':
+            source = source or LLM_CASSETTE_SOURCE
+            if source == self.name:
+                raise ValueError("A cassette cannot record another cassette")
+            self.source = source if isinstance(source, LLMProvider) else get_provider(source)
+            super().__init__(self.source.default_model, self.source.max_concurrency)
+            self.cassette.start_recording(provider=self.source.name, model=self.source.default_model,
+                                          max_concurrency=self.source.max_concurrency)
+        else:
+            if not len(self.cassette):
+                raise ValueError(f"No recorded completions in cassette {path}")
+            header = self.cassette.header
+            super().__init__(header.get('model', 'cassette'), header.get('max_concurrency', 64))
+        self._counts.update(hits=0, misses=0, recorded=0)
+
+    def _count(self, counter):
+        with self._lock:
+            self._counts[counter] += 1
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        key = request_key(messages, model, temperature, max_tokens)
+        if self.mode == 'record':
+            return self._record(key, messages, model, temperature, max_tokens)
+
+        recorded = self.cassette.replay(key)
+        if recorded is None:
+            self._count('misses')
+            raise ProviderError(f"Request {key} is not in cassette {self.cassette.path}")
+        self._count('hits')
+        if self.pacing > 0:
+            self.sleep(recorded['seconds'] * self.pacing)
+        if 'error' in recorded:
+            raise ProviderError(recorded['error'])
+        return recorded['response']
+
+    def _record(self, key, messages, model, temperature, max_tokens):
+        started = time.perf_counter()
+        try:
+            response = self.source.complete(messages, model, temperature, max_tokens)
+        except Exception as e:
+            self.cassette.record(key, time.perf_counter() - started, error=str(e))
+            self._count('recorded')
+            raise
+        self.cassette.record(key, time.perf_counter() - started, response=response)
+        self._count('recorded')
+        return response
+
+    def stats(self):
+        return dict(super().stats(), mode=self.mode, cassette=self.cassette.path, entries=len(self.cassette))
+
+PROVIDERS = {
+    'groq': GroqProvider,
+    'local': OpenAICompatibleProvider,
+    'fixture': FixtureProvider,
+    'cassette': CassetteProvider
+}
+
+_instances = {}
+# Reentrant: a recording cassette creates its source provider while being created
+_instances_lock = threading.RLock()
+
+def get_provider(name=None):
+    """The shared provider of a name (LLM_PROVIDER by default), created on first use"""
+    name = (name or os.getenv('LLM_PROVIDER', 'groq')).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = PROVIDERS[name]()
+        return _instances[name]
+
+def provider_stats():
+    """Counters of every provider in use, for /health"""
+    with _instances_lock:
+        providers = list(_instances.values())
+    return {provider.name: provider.stats() for provider in providers}
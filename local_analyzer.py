@@ -0,0 +1,295 @@
+"""
+Local Coverage Analyzer
+Instant keyword-based coverage analysis against the required fields of each document type
+"""
+
+from collections import deque
+from field_questions import REQUIRED_FIELDS, get_field_question, get_recommended_answer
+from brd_field_questions import BRD_REQUIRED_FIELDS, get_brd_field_question, get_brd_recommended_answer
+from frd_field_questions import FRD_REQUIRED_FIELDS, get_frd_field_question, get_frd_recommended_answer
+from srd_field_questions import SRD_REQUIRED_FIELDS, get_srd_field_question, get_srd_recommended_answer
+from cr_field_questions import CR_REQUIRED_FIELDS, CR_FIELD_QUESTIONS, get_cr_field_question
+
+# Terms that suggest a requirement covers a field, besides the field's own name.
+# Terms match whole words (case-insensitively) unless they end in '*', which
+# matches any word starting with the stem.
+SECURITY_TERMS = ('secur*', 'auth*', 'password*', 'encrypt*', 'permission*', 'role-based', 'token*', 'mfa', '2fa',
+                  'otp', 'sso', 'privacy', 'gdpr', 'access control')
+VALIDATION_TERMS = ('valid*', 'invalid*', 'required field*', 'format*', 'must contain', 'verif*', 'check*',
+                    'at least', 'at most', 'maximum', 'minimum', 'limit*')
+DEPENDENCY_TERMS = ('depend*', 'integrat*', 'api', 'apis', 'third-party', 'third party', 'external', 'service*',
+                    'database*', 'email*', 'sms', 'gateway*', 'vendor*', 'provider*')
+RISK_TERMS = ('risk*', 'fail*', 'downtime', 'outage*', 'fraud*', 'abuse*', 'mitigat*', 'fallback', 'breach*',
+              'data loss', 'vulnerab*')
+PERFORMANCE_TERMS = ('performance', 'response time*', 'latency', 'throughput', 'within', 'second*', 'ms',
+                     'concurrent*', 'load', 'fast*', 'quickly')
+TESTING_TERMS = ('test*', 'qa', 'uat', 'regression', 'acceptance test*')
+APPROVAL_TERMS = ('approv*', 'sign-off', 'sign off', 'signoff', 'authoriz*')
+CURRENT_STATE_TERMS = ('current*', 'today', 'existing', 'as-is', 'manual*', 'legacy', 'pain point*')
+STAKEHOLDER_TERMS = ('stakeholder*', 'sponsor*', 'owner*', 'team*', 'department*', 'user*', 'customer*',
+                     'manager*', 'staff')
+
+FIELD_TERMS = {
+    # User story
+    'Business Goal': ('so that', 'in order to', 'goal*', 'value', 'benefit*', 'revenue', 'reduce*', 'improv*',
+                      'increas*', 'objective*'),
+    'Actor': ('as a', 'as an', 'user*', 'customer*', 'admin*', 'manager*', 'agent*', 'operator*', 'staff',
+              'employee*', 'role*', 'visitor*', 'member*'),
+    'Trigger': ('when', 'whenever', 'once', 'after', 'upon', 'click*', 'trigger*', 'event*', 'schedul*'),
+    'Preconditions': ('logged in', 'signed in', 'authenticated', 'precondition*', 'prerequisite*', 'already',
+                      'existing', 'given', 'registered'),
+    'Functional Flow': ('step*', 'then', 'flow*', 'process*', 'workflow*', 'navigat*', 'submit*', 'select*',
+                        'enter*', 'receiv*', 'redirect*'),
+    'Validations': VALIDATION_TERMS,
+    'Acceptance Criteria': ('acceptance', 'criteria', 'given', 'should see', 'done when', 'expected result*',
+                            'success*'),
+    'Security': SECURITY_TERMS,
+    'Dependencies': DEPENDENCY_TERMS,
+    'Risks': RISK_TERMS,
+
+    # BRD
+    'Project Name': ('project*', 'initiative*', 'program*', 'programme*', 'called', 'named'),
+    'Executive Summary': ('summary', 'overview', 'background', 'problem*', 'purpose'),
+    'Business Objectives': ('objective*', 'goal*', 'kpi*', 'target*', 'roi', 'measur*', 'increas*', 'reduc*'),
+    'Scope': ('scope', 'in-scope', 'out-of-scope', 'include*', 'exclud*', 'phase*', 'mvp'),
+    'Stakeholders': STAKEHOLDER_TERMS,
+    'Current State': CURRENT_STATE_TERMS,
+    'Future State': ('future', 'to-be', 'going forward', 'target state', 'automat*', 'will'),
+    'Business Requirements': ('requir*', 'must', 'shall', 'need to', 'needs to', 'should'),
+    'Business Rules': ('rule*', 'if', 'policy', 'policies', 'unless', 'only when', 'condition*', 'threshold*'),
+    'Assumptions': ('assum*', 'presum*', 'given that', 'expected to'),
+    'Glossary': ('glossary', 'definition*', 'defined as', 'term*', 'acronym*', 'refers to'),
+    'Approval Section': APPROVAL_TERMS,
+    'Document Control': ('version*', 'revision*', 'document control', 'reviewer*', 'change log', 'changelog'),
+
+    # FRD
+    'System Overview': ('system*', 'platform*', 'architecture', 'overview', 'application*', 'module*'),
+    'Functional Requirements': ('function*', 'feature*', 'must', 'shall', 'allow*', 'enabl*', 'able to'),
+    'Data Requirements': ('data', 'record*', 'field*', 'schema*', 'stor*', 'database*', 'attribute*', 'entit*'),
+    'Interface Requirements': ('interface*', 'ui', 'screen*', 'page*', 'form*', 'button*', 'dashboard*', 'api',
+                               'endpoint*'),
+    'Integration Requirements': ('integrat*', 'sync*', 'connect*', 'third-party', 'third party', 'external',
+                                 'webhook*', 'import*', 'export*'),
+    'Performance Requirements': PERFORMANCE_TERMS,
+    'Security Requirements': SECURITY_TERMS,
+    'Validation Rules': VALIDATION_TERMS,
+    'Error Handling': ('error*', 'exception*', 'retr*', 'fail*', 'timeout*', 'invalid*'),
+    'Reporting Requirements': ('report*', 'analytic*', 'dashboard*', 'metric*', 'chart*', 'insight*'),
+    'Testing Requirements': TESTING_TERMS,
+    'Deployment Requirements': ('deploy*', 'release*', 'rollout*', 'environment*', 'cloud', 'hosting',
+                                'ci/cd', 'production'),
+    'Maintenance Requirements': ('maint*', 'support*', 'upgrad*', 'patch*', 'sla', 'slas'),
+    'Technical Specifications': ('technical', 'technolog*', 'stack', 'framework*', 'language*', 'protocol*',
+                                 'rest', 'json', 'python', 'java', 'react'),
+
+    # SRD
+    'System Architecture': ('architecture', 'microservice*', 'monolith*', 'layer*', 'tier*', 'component*'),
+    'Hardware Requirements': ('hardware', 'server*', 'cpu*', 'memory', 'ram', 'disk*', 'device*', 'gpu*'),
+    'Software Requirements': ('software', 'operating system*', 'linux', 'windows', 'runtime*', 'librar*',
+                              'framework*'),
+    'Network Requirements': ('network*', 'bandwidth', 'vpn', 'firewall*', 'dns', 'load balanc*', 'connectivity',
+                             'https'),
+    'Database Requirements': ('database*', 'sql', 'postgres*', 'mysql', 'oracle', 'mongo*', 'nosql', 'table*',
+                              'schema*'),
+    'System Interfaces': ('interface*', 'api', 'apis', 'integrat*', 'endpoint*', 'external system*', 'webhook*'),
+    'Performance Specifications': PERFORMANCE_TERMS,
+    'Security Architecture': SECURITY_TERMS + ('firewall*',),
+    'Backup & Recovery': ('backup*', 'back up', 'recover*', 'restor*', 'disaster*', 'rpo', 'rto', 'replica*',
+                          'failover'),
+    'Monitoring & Logging': ('monitor*', 'logging', 'logs', 'alert*', 'audit*', 'observab*', 'trac*'),
+    'Scalability Requirements': ('scal*', 'growth', 'grow*', 'elastic*', 'peak*', 'horizontal*'),
+    'Compliance & Standards': ('complian*', 'regulat*', 'standard*', 'gdpr', 'hipaa', 'pci', 'sox', 'iso'),
+
+    # CR
+    'change_request_id': ('cr-*', 'change request*', 'ticket*', 'reference'),
+    'business_justification': ('because', 'justif*', 'so that', 'in order to', 'benefit*', 'reason*',
+                               'business need*'),
+    'requestor_information': ('requested by', 'requestor*', 'requester*', 'on behalf of', 'raised by',
+                              'submitted by'),
+    'impact_analysis': ('impact*', 'affect*', 'downstream'),
+    'current_state': CURRENT_STATE_TERMS,
+    'proposed_changes': ('chang*', 'replac*', 'add', 'adding', 'remov*', 'updat*', 'upgrad*', 'migrat*',
+                         'modif*', 'introduc*', 'propos*'),
+    'risk_assessment': RISK_TERMS,
+    'cost_benefit_analysis': ('cost*', 'budget*', 'saving*', 'roi', 'price*', 'expense*', 'effort'),
+    'implementation_timeline': ('timeline*', 'deadline*', 'sprint*', 'week*', 'month*', 'schedul*', 'milestone*',
+                                'phase*', 'quarter*'),
+    'stakeholder_impact': STAKEHOLDER_TERMS,
+    'testing_requirements': TESTING_TERMS,
+    'approval_workflow': APPROVAL_TERMS,
+    'rollback_plan': ('rollback*', 'roll back', 'revert*', 'backout', 'back out', 'fallback'),
+    'success_metrics': ('metric*', 'kpi*', 'measur*', 'success*', 'target*'),
+    'supporting_documents': ('document*', 'attach*', 'diagram*', 'spec', 'specs', 'specification*',
+                             'screenshot*', 'link*')
+}
+
+def _cr_question(field):
+    return get_cr_field_question(field)['question']
+
+def _cr_recommended_answer(field):
+    return get_cr_field_question(field)['example']
+
+# Required fields, question and suggested answer of each document type
+DOCUMENT_FIELDS = {
+    'story': (REQUIRED_FIELDS, get_field_question, get_recommended_answer),
+    'brd': (BRD_REQUIRED_FIELDS, get_brd_field_question, get_brd_recommended_answer),
+    'frd': (FRD_REQUIRED_FIELDS, get_frd_field_question, get_frd_recommended_answer),
+    'srd': (SRD_REQUIRED_FIELDS, get_srd_field_question, get_srd_recommended_answer),
+    'cr': (CR_REQUIRED_FIELDS, _cr_question, _cr_recommended_answer)
+}
+
+def _field_label(field):
+    return field.replace('_', ' ')
+
+def _is_word_char(char):
+    return char.isalnum() or char in '_-'
+
+def _lower(text):
+    """Lowercase text without changing its length, so match offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting every occurrence of a set of terms in one pass over the text"""
+
+    def __init__(self, terms):
+        """terms is an iterable of (term, payload) pairs"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for term, payload in terms:
+            state = 0
+            for char in term:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(term), payload))
+
+        # Failure links point to the longest proper suffix that is also a prefix of some term
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def finditer(self, text):
+        """Yield (start, end, payload) for every term occurrence, overlapping ones included"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                yield index + 1 - length, index + 1, payload
+
+def _field_terms(field):
+    """(term, is_stem) pairs of a field: its own name and its FIELD_TERMS"""
+    terms = [(_field_label(field).lower(), False)]
+    for term in FIELD_TERMS.get(field, ()):
+        terms.append((term[:-1], True) if term.endswith('*') else (term, False))
+    return terms
+
+def _build_automaton(fields):
+    """One automaton over the terms of all fields of a document type"""
+    fields_by_term = {}
+    for field in fields:
+        for term in _field_terms(field):
+            fields_by_term.setdefault(term, []).append(field)
+    return KeywordAutomaton((term, (is_stem, tuple(term_fields)))
+                            for (term, is_stem), term_fields in fields_by_term.items())
+
+# Compiled once at import; a lookup is a single pass over the requirement
+AUTOMATA = {document_type: _build_automaton(fields) for document_type, (fields, _, _) in DOCUMENT_FIELDS.items()}
+
+def _field_matches(document_type, requirement):
+    """{field: [(start, end), ...]} for the term occurrences that stand on word boundaries"""
+    text = _lower(requirement)
+    matches = {}
+    for start, end, (is_stem, fields) in AUTOMATA[document_type].finditer(text):
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if is_stem:
+            while end < len(text) and _is_word_char(text[end]):
+                end += 1
+        elif end < len(text) and _is_word_char(text[end]):
+            continue
+        for field in fields:
+            matches.setdefault(field, []).append((start, end))
+    return matches
+
+def _readiness(score):
+    if score >= 80:
+        return 'Enterprise Ready'
+    if score >= 50:
+        return 'Needs Enhancement'
+    return 'Needs Significant Enhancement'
+
+def _sentence_at(text, position):
+    """The sentence of text containing position"""
+    start = max(text.rfind(mark, 0, position) for mark in '.!?\n') + 1
+    ends = [index for index in (text.find(mark, position) for mark in '.!?\n') if index != -1]
+    return text[start:min(ends) if ends else len(text)].strip()
+
+def local_coverage_analysis(document_type, requirement):
+    """Score a requirement against the required fields of a document type without calling the LLM.
+
+    Returns a coverage analysis shaped like the LLM's, marked with
+    analysis_source 'local'. It is a keyword heuristic: fields count as
+    present when the requirement mentions their name or one of their terms.
+    Used as the instant first answer of live analysis and whenever the LLM
+    analysis fails.
+    """
+    fields, question, recommended_answer = DOCUMENT_FIELDS[document_type]
+    requirement = requirement or ''
+    field_matches = _field_matches(document_type, requirement)
+
+    present, missing, recommendations = [], [], []
+    for field in fields:
+        matches = sorted(field_matches.get(field, ()))
+        if matches:
+            terms = list(dict.fromkeys(requirement[start:end].lower() for start, end in matches))
+            present.append({
+                'element': field,
+                'status': 'present',
+                'details': f"Mentions {', '.join(terms[:5])}",
+                'content': _sentence_at(requirement, matches[0][0])
+            })
+        else:
+            missing.append({
+                'element': field,
+                'status': 'missing',
+                'details': CR_FIELD_QUESTIONS[field]['description'] if field in CR_FIELD_QUESTIONS
+                           else f"No {_field_label(field).lower()} details found",
+                'suggested_content': recommended_answer(field),
+                'editable': True
+            })
+            recommendations.append({
+                'element': field,
+                'question': question(field),
+                'suggested_answer': recommended_answer(field),
+                'field_type': 'textarea'
+            })
+
+    score = round(100 * len(present) / len(fields)) if fields else 0
+    return {
+        'coverage_analysis': {
+            'present_elements': present,
+            'missing_elements': missing,
+            'overall_score': score,
+            'enterprise_readiness': _readiness(score),
+            'editable_recommendations': recommendations
+        },
+        'critical_gaps': [element['element'] for element in missing],
+        'analysis_source': 'local'
+    }
@@ -0,0 +1,64 @@
+from sqlalchemy import text
+from models import db
+from compressed_json import compress_payload, decompress_payload, is_compressed
+
+PAYLOAD_COLUMNS = ('requirements', 'analysis', 'user_stories')
+BATCH_SIZE = 500
+
+def _convert_columns_to_binary(conn):
+    """Switch PostgreSQL text payload columns to BYTEA, keeping their contents"""
+    for column in PAYLOAD_COLUMNS:
+        data_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'story' AND column_name = :column"
+        ), {'column': column}).scalar()
+        if data_type == 'text':
+            conn.execute(text(
+                f"ALTER TABLE story ALTER COLUMN {column} TYPE BYTEA USING convert_to({column}, 'UTF8')"
+            ))
+
+def migrate_payloads(batch_size=BATCH_SIZE):
+    """Compress every Story payload that is still stored as plain text"""
+    engine = db.engine
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as conn:
+            _convert_columns_to_binary(conn)
+
+    migrated = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, requirements, analysis, user_stories FROM story "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ), {'last_id': last_id, 'limit': batch_size}).fetchall()
+            if not rows:
+                break
+
+            for row in rows:
+                updates = {}
+                for column in PAYLOAD_COLUMNS:
+                    raw = getattr(row, column)
+                    if raw is None or is_compressed(raw):
+                        continue
+                    value = decompress_payload(raw, legacy_text=(column == 'requirements'))
+                    updates[column] = compress_payload(value)
+
+                if updates:
+                    assignments = ', '.join(f"{column} = :{column}" for column in updates)
+                    conn.execute(text(f"UPDATE story SET {assignments} WHERE id = :id"), {**updates, 'id': row.id})
+                    migrated += 1
+
+            last_id = rows[-1].id
+
+    return migrated
+
+def main():
+    """Run the payload compression migration against the app database"""
+    from app import app
+    with app.app_context():
+        migrated = migrate_payloads()
+        print(f"Compressed payloads for {migrated} stories")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+from sqlalchemy import inspect, text
+from models import db, Story
+
+# Story columns added after the original schema, with the DDL that adds them
+# to an existing table; db.create_all() never alters tables that already exist
+ADDED_COLUMNS = {
+    'document_type': "ALTER TABLE story ADD COLUMN document_type VARCHAR(20) NOT NULL DEFAULT 'story'"
+}
+
+def migrate_schema():
+    """Bring a story table created before document history up to date; returns the changes made"""
+    engine = db.engine
+    db.create_all()
+    inspector = inspect(engine)
+    columns = {column['name'] for column in inspector.get_columns('story')}
+    indexes = {index['name'] for index in inspector.get_indexes('story')}
+
+    changes = []
+    with engine.begin() as conn:
+        for column, ddl in ADDED_COLUMNS.items():
+            if column not in columns:
+                conn.execute(text(ddl))
+                changes.append(f"added column story.{column}")
+
+        for index in sorted(Story.__table__.indexes, key=lambda index: index.name):
+            if index.name not in indexes:
+                index.create(conn)
+                changes.append(f"created index {index.name}")
+
+    return changes
+
+def main():
+    """Run the history schema migration against the app database"""
+    from app import app
+    with app.app_context():
+        changes = migrate_schema()
+        for change in changes:
+            print(f"Migrated: {change}")
+        print(f"History schema up to date ({len(changes)} changes)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Mock Tracker Server
+Local issue tracker implementing the generic bulk API and the Jira bulk/search
+subset used by tracker_connectors, for tests and demos
+
+Usage: python mock_tracker_server.py [--port 8765] [--throttle N]
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockTracker:
+    """In-memory issue store shared by the request handlers"""
+
+    def __init__(self, throttle_every=0):
+        self.issues = {}
+        self.by_key = {}
+        self.batch_responses = {}
+        self.requests = []
+        self.throttle_every = throttle_every
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _create(self, project, fields):
+        self._counter += 1
+        issue_id = f"{project or 'MOCK'}-{self._counter}"
+        self.issues[issue_id] = dict(fields, id=issue_id)
+        return issue_id
+
+    def bulk(self, payload, batch_key=None):
+        """Generic bulk create, deduplicated per issue and replayed per batch key"""
+        with self._lock:
+            if batch_key and batch_key in self.batch_responses:
+                return self.batch_responses[batch_key]
+            project = payload.get('project')
+            results = []
+            for issue in payload.get('issues', []):
+                key = issue.get('idempotency_key')
+                if key in self.by_key:
+                    status = 'existing'
+                else:
+                    self.by_key[key] = self._create(project, issue)
+                    status = 'created'
+                issue_id = self.by_key[key]
+                results.append({'idempotency_key': key, 'id': issue_id,
+                                'url': f'/issues/{issue_id}', 'status': status})
+            response = {'results': results}
+            if batch_key:
+                self.batch_responses[batch_key] = response
+            return response
+
+    def jira_bulk(self, payload):
+        with self._lock:
+            created, errors = [], []
+            for index, update in enumerate(payload.get('issueUpdates', [])):
+                fields = update.get('fields', {})
+                if not fields.get('summary'):
+                    errors.append({'failedElementNumber': index, 'status': 400,
+                                   'elementErrors': {'errors': {'summary': 'You must specify a summary'}}})
+                    continue
+                issue_id = self._create(fields.get('project', {}).get('key'), fields)
+                created.append({'id': str(self._counter), 'key': issue_id, 'self': f'/rest/api/2/issue/{issue_id}'})
+            return {'issues': created, 'errors': errors}
+
+    def jira_search(self, payload):
+        """Only the `labels in (...)` clause of the connector's JQL is understood"""
+        jql = payload.get('jql', '')
+        wanted = set()
+        if 'labels in (' in jql:
+            inside = jql.split('labels in (', 1)[1].rsplit(')', 1)[0]
+            wanted = {label.strip().strip('"') for label in inside.split(',')}
+        with self._lock:
+            found = [{'key': issue_id, 'fields': {'labels': fields.get('labels', [])}}
+                     for issue_id, fields in self.issues.items() if wanted & set(fields.get('labels', []))]
+        return {'issues': found, 'total': len(found)}
+
+    def should_throttle(self):
+        with self._lock:
+            self.requests.append(len(self.requests) + 1)
+            return bool(self.throttle_every) and len(self.requests) % self.throttle_every == 0
+
+class MockTrackerHandler(BaseHTTPRequestHandler):
+    tracker = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.tracker.should_throttle():
+            self._send(429, {'error': 'Too many requests'}, {'Retry-After': '0.05'})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send(400, {'error': 'Invalid JSON'})
+            return
+
+        if self.path == '/issues/bulk':
+            self._send(200, self.tracker.bulk(payload, self.headers.get('Idempotency-Key')))
+        elif self.path == '/rest/api/2/issue/bulk':
+            self._send(201, self.tracker.jira_bulk(payload))
+        elif self.path == '/rest/api/2/search':
+            self._send(200, self.tracker.jira_search(payload))
+        else:
+            self._send(404, {'error': f'Unknown endpoint {self.path}'})
+
+    def do_GET(self):
+        if self.path == '/issues':
+            with self.tracker._lock:
+                issues = list(self.tracker.issues.values())
+            self._send(200, {'issues': issues, 'total': len(issues)})
+        else:
+            self._send(404, {'error': f'Unknown endpoint {self.path}'})
+
+def start_mock_tracker(port=0, throttle_every=0):
+    """Start a mock tracker on a background thread; returns (server, tracker, base_url)"""
+    tracker = MockTracker(throttle_every)
+    handler = type('BoundMockTrackerHandler', (MockTrackerHandler,), {'tracker': tracker})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, tracker, f'http://127.0.0.1:{server.server_address[1]}'
+
+def main():
+    """Run the mock tracker in the foreground"""
+    parser = argparse.ArgumentParser(description='Local mock issue tracker')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--throttle', type=int, default=0, help='answer every Nth POST with 429')
+    args = parser.parse_args()
+
+    server, _, base_url = start_mock_tracker(args.port, args.throttle)
+    print(f"🧪 Mock tracker listening on {base_url}")
+    print(f"   Generic: TRACKER_TYPE=generic TRACKER_URL={base_url}")
+    print(f"   Jira:    TRACKER_TYPE=jira TRACKER_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
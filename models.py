@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import uuid
+from compressed_json import CompressedJSON
 
 db = SQLAlchemy()
 
@@ -8,15 +9,23 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    stories = db.relationship('Story', backref='user', lazy=True, cascade='all, delete-orphan')
+    stories = db.relationship('Story', backref='user', lazy='dynamic', cascade='all, delete-orphan')
 
 class Story(db.Model):
+    __table_args__ = (
+        db.Index('ix_story_user_created', 'user_id', 'created_at'),
+        db.Index('ix_story_user_status', 'user_id', 'status'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    document_type = db.Column(db.String(20), nullable=False, default='story')
     title = db.Column(db.String(200), nullable=False)
-    requirements = db.Column(db.Text, nullable=False)
-    analysis = db.Column(db.Text)
-    user_stories = db.Column(db.Text)
+    # Large payloads are stored compressed and only loaded (and decompressed)
+    # when one of them is first accessed; all three load together
+    requirements = db.deferred(db.Column(CompressedJSON(legacy_text=True), nullable=False), group='payload')
+    analysis = db.deferred(db.Column(CompressedJSON()), group='payload')
+    user_stories = db.deferred(db.Column(CompressedJSON()), group='payload')
     domain = db.Column(db.String(100))
     status = db.Column(db.String(20), default='draft')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -25,6 +34,7 @@ class Story(db.Model):
     def to_dict(self):
         return {
             'id': self.id,
+            'document_type': self.document_type,
             'title': self.title,
             'requirements': self.requirements,
             'analysis': self.analysis,
@@ -33,4 +43,12 @@ class Story(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+class AnalysisSession(db.Model):
+    # Content hash of document type, requirement and analysis
+    id = db.Column(db.String(32), primary_key=True)
+    document_type = db.Column(db.String(20), nullable=False, default='story')
+    analysis = db.Column(CompressedJSON(), nullable=False)
+    digest = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
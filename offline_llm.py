@@ -0,0 +1,21 @@
+"""
+Offline LLM
+GroqClient on canned fixture completions, for tests and benchmarks
+"""
+
+from llm_client import GroqClient
+from llm_providers import FixtureProvider
+
+def offline_client(fixtures=None, default_response='', provider=None):
+    """A quiet GroqClient that never leaves the process.
+
+    fixtures are FixtureProvider (match, response) pairs; unmatched
+    requests get default_response, by default an empty completion that
+    the client treats as a failed call. provider replaces the fixtures
+    with any other LLMProvider, e.g. one that records what it was sent.
+    """
+    if provider is None:
+        provider = FixtureProvider(fixtures, path=None, default_response=default_response)
+    client = GroqClient(provider)
+    client.debug_mode = False
+    return client
@@ -0,0 +1,130 @@
+"""
+OOXML Table Writer
+Builds a whole Word table as one w:tbl element from row data, instead of
+creating and styling python-docx objects cell by cell
+"""
+
+import re
+from xml.sax.saxutils import escape
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.table import Table
+
+# Characters that are not allowed in XML 1.0 documents
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_EMU_PER_TWIP = 635
+
+def run_properties(font='Calibri', size=11, bold=False, italic=False, color=None):
+    """Serialized w:rPr for a run; size is in points"""
+    parts = [f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{font}"/>']
+    if bold:
+        parts.append('<w:b/>')
+    if italic:
+        parts.append('<w:i/>')
+    if color:
+        parts.append(f'<w:color w:val="{color}"/>')
+    half_points = int(round(size * 2))
+    parts.append(f'<w:sz w:val="{half_points}"/><w:szCs w:val="{half_points}"/>')
+    return '<w:rPr>' + ''.join(parts) + '</w:rPr>'
+
+def _runs(text, rpr):
+    """Runs for a cell's text; line breaks and tabs become w:br / w:tab"""
+    if text is None or text == '':
+        return ''
+    text = _INVALID_XML_CHARS.sub('', str(text))
+    pieces = []
+    for line_number, line in enumerate(text.split('\n')):
+        if line_number:
+            pieces.append('<w:br/>')
+        for tab_number, chunk in enumerate(line.split('\t')):
+            if tab_number:
+                pieces.append('<w:tab/>')
+            if chunk:
+                pieces.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    return f'<w:r>{rpr}{"".join(pieces)}</w:r>'
+
+class TableFormat:
+    """Pre-serialized cell properties shared by every row of a table"""
+
+    def __init__(self, col_widths, font_size=10, header_font_size=11, fill='E8E8E8',
+                 shade_first_column=False, font='Calibri'):
+        self.col_widths = col_widths
+        self.shade_first_column = shade_first_column
+        self.body_rpr = run_properties(font, font_size)
+        self.header_rpr = run_properties(font, header_font_size, bold=True)
+        self.label_rpr = run_properties(font, font_size, bold=True)
+
+        shading = f'<w:shd w:val="clear" w:color="auto" w:fill="{fill}"/>'
+        self.plain_tcpr = [f'<w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>' for width in col_widths]
+        self.shaded_tcpr = [f'<w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{shading}</w:tcPr>' for width in col_widths]
+
+    def header_row(self, values):
+        cells = ''.join(
+            f'<w:tc>{tcpr}<w:p><w:pPr><w:jc w:val="center"/></w:pPr>{_runs(value, self.header_rpr)}</w:p></w:tc>'
+            for tcpr, value in zip(self.shaded_tcpr, values)
+        )
+        # Repeat the header row at the top of every page the table spans
+        return f'<w:tr><w:trPr><w:tblHeader/></w:trPr>{cells}</w:tr>'
+
+    def body_row(self, values):
+        cells = []
+        for index, value in enumerate(values):
+            if index == 0 and self.shade_first_column:
+                cells.append(f'<w:tc>{self.shaded_tcpr[0]}<w:p>{_runs(value, self.label_rpr)}</w:p></w:tc>')
+            else:
+                cells.append(f'<w:tc>{self.plain_tcpr[index]}<w:p>{_runs(value, self.body_rpr)}</w:p></w:tc>')
+        return '<w:tr>' + ''.join(cells) + '</w:tr>'
+
+def content_width_twips(doc):
+    """Usable text width of a document's first section, in twips"""
+    section = doc.sections[0]
+    return int((section.page_width - section.left_margin - section.right_margin) / _EMU_PER_TWIP)
+
+def build_table_xml(headers, rows, table_format, style_id='TableGrid'):
+    """Serialize a complete w:tbl element"""
+    columns = len(table_format.col_widths)
+    parts = [
+        f'<w:tbl {nsdecls("w")}>',
+        '<w:tblPr>',
+        f'<w:tblStyle w:val="{style_id}"/>' if style_id else '',
+        '<w:tblW w:type="auto" w:w="0"/>',
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+        'w:noHBand="0" w:noVBand="1" w:val="04A0"/>',
+        '</w:tblPr>',
+        '<w:tblGrid>',
+        ''.join(f'<w:gridCol w:w="{width}"/>' for width in table_format.col_widths),
+        '</w:tblGrid>'
+    ]
+    if headers:
+        parts.append(table_format.header_row(headers))
+    for row in rows:
+        # Pad or trim ragged rows so every row has one cell per column
+        values = list(row[:columns]) + [''] * (columns - len(row))
+        parts.append(table_format.body_row(values))
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+def append_table(doc, headers, rows, font_size=10, header_font_size=11, shade_first_column=False,
+                 col_widths=None, style='Table Grid'):
+    """Append a table to a document in one pass and return it as a python-docx Table"""
+    columns = len(headers) if headers else max((len(row) for row in rows), default=1)
+    if col_widths is None:
+        width = content_width_twips(doc) // columns
+        col_widths = [width] * columns
+
+    try:
+        style_id = doc.styles[style].style_id if style else None
+    except KeyError:
+        style_id = None
+
+    table_format = TableFormat(col_widths, font_size, header_font_size, shade_first_column=shade_first_column)
+    tbl = parse_xml(build_table_xml(headers, rows, table_format, style_id))
+
+    # Tables go before the body's closing section properties
+    body = doc.element.body
+    if body.sectPr is not None:
+        body.sectPr.addprevious(tbl)
+    else:
+        body.append(tbl)
+    return Table(tbl, doc._body)
@@ -0,0 +1,210 @@
+"""
+PDF Fonts
+TrueType font registration, parsed-font cache and per-glyph fallback for PDF exports
+"""
+
+import os
+import threading
+from xml.sax.saxutils import escape
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+# Core PDF fonts, used when no TrueType family is available or PDF_FONT_FAMILY=core
+CORE_FONTS = {
+    'family': 'Helvetica',
+    'normal': 'Helvetica',
+    'bold': 'Helvetica-Bold',
+    'italic': 'Helvetica-Oblique',
+    'bold_italic': 'Helvetica-BoldOblique'
+}
+
+# Body font families in order of preference: regular, bold, italic, bold italic files.
+# Vera ships with ReportLab, so a TrueType family is always available.
+FONT_FAMILIES = (
+    ('DejaVuSans', ('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf', 'DejaVuSans-Oblique.ttf', 'DejaVuSans-BoldOblique.ttf')),
+    ('NotoSans', ('NotoSans-Regular.ttf', 'NotoSans-Bold.ttf', 'NotoSans-Italic.ttf', 'NotoSans-BoldItalic.ttf')),
+    ('Vera', ('Vera.ttf', 'VeraBd.ttf', 'VeraIt.ttf', 'VeraBI.ttf'))
+)
+
+# Fonts consulted, in order, for characters the body font has no glyph for.
+# ReportLab cannot embed colour emoji fonts; use the monochrome Noto Emoji.
+FALLBACK_FONTS = (
+    'NotoEmoji-Regular.ttf',
+    'NotoSansSymbols2-Regular.ttf',
+    'NotoSansSymbols-Regular.ttf',
+    'DejaVuSans.ttf',
+    'NotoSansDevanagari-Regular.ttf',
+    'NotoSansArabic-Regular.ttf',
+    'NotoSansHebrew-Regular.ttf',
+    'NotoSansThai-Regular.ttf'
+)
+
+FONT_DIRS = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'fonts'),
+    '/usr/share/fonts/truetype/dejavu',
+    '/usr/share/fonts/truetype/noto',
+    '/usr/share/fonts/noto',
+    os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+)
+
+# Emoji presentation selectors are dropped when no font can draw them
+_VARIATION_SELECTORS = {0xFE0E, 0xFE0F}
+
+_font_lock = threading.Lock()
+_fonts_by_path = {}
+
+def font_dirs():
+    """Directories searched for font files; PDF_FONT_DIRS entries come first"""
+    configured = [path for path in os.getenv('PDF_FONT_DIRS', '').split(os.pathsep) if path]
+    return configured + list(FONT_DIRS)
+
+def find_font_file(filename, dirs=None):
+    """Full path of a font file in the search directories, or None"""
+    if os.path.isabs(filename):
+        return filename if os.path.exists(filename) else None
+    for directory in dirs or font_dirs():
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+def _font_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def load_font(path):
+    """Parse and register a TrueType font once per process.
+
+    The parsed TTFont is kept and shared by every later export. ReportLab
+    embeds a per-document subset holding only the glyphs that document used.
+    """
+    font = _fonts_by_path.get(path)
+    if font is None:
+        with _font_lock:
+            font = _fonts_by_path.get(path)
+            if font is None:
+                font = TTFont(_font_name(path), path)
+                pdfmetrics.registerFont(font)
+                _fonts_by_path[path] = font
+                if os.getenv('FLASK_ENV') == 'development':
+                    print(f"DEBUG - Registered PDF font {font.fontName} from {path}")
+    return font
+
+def _core_charset():
+    """Characters the core fonts can draw (WinAnsi encoding)"""
+    chars = set()
+    for byte in range(32, 256):
+        try:
+            chars.add(ord(bytes([byte]).decode('cp1252')))
+        except UnicodeDecodeError:
+            pass
+    return frozenset(chars)
+
+def _charset(font):
+    return frozenset(font.face.charToGlyph)
+
+class FontSet:
+    """Body font family plus fallback fonts for glyphs the family lacks"""
+
+    def __init__(self, fonts, charset, fallbacks=()):
+        self.fonts = dict(fonts)
+        self._charset = charset
+        self._fallbacks = list(fallbacks)
+        self._char_fonts = {}
+
+    @property
+    def fallback_names(self):
+        return [name for name, _ in self._fallbacks]
+
+    def _fallback_for(self, codepoint):
+        try:
+            return self._char_fonts[codepoint]
+        except KeyError:
+            name = next((name for name, chars in self._fallbacks if codepoint in chars), None)
+            self._char_fonts[codepoint] = name
+            return name
+
+    def markup(self, text):
+        """Escape text for a Paragraph, switching to a fallback font where the body font has no glyph"""
+        if self._charset.issuperset(map(ord, text)):
+            return escape(text)
+
+        pieces = []
+        run, run_font = [], None
+        for char in text:
+            codepoint = ord(char)
+            font = None if codepoint in self._charset else self._fallback_for(codepoint)
+            if font is None and codepoint in _VARIATION_SELECTORS and codepoint not in self._charset:
+                continue
+            if font != run_font and run:
+                pieces.append(self._run(''.join(run), run_font))
+                run = []
+            run.append(char)
+            run_font = font
+        if run:
+            pieces.append(self._run(''.join(run), run_font))
+        return ''.join(pieces)
+
+    @staticmethod
+    def _run(text, font):
+        return f'<font name="{font}">{escape(text)}</font>' if font else escape(text)
+
+def _family_fonts(family, filenames, dirs):
+    """Register a family's variants, standing in the bold or regular face for missing ones"""
+    regular, bold, italic, bold_italic = (find_font_file(filename, dirs) for filename in filenames)
+    if not regular:
+        return None
+    paths = [regular, bold or regular, italic or regular, bold_italic or bold or regular]
+    names = [load_font(path).fontName for path in paths]
+    return dict(zip(('normal', 'bold', 'italic', 'bold_italic'), names), family=family), load_font(regular)
+
+def build_font_set(family=None, fallback_fonts=None, dirs=None):
+    """Resolve the configured body family and fallbacks into a FontSet"""
+    family = family or os.getenv('PDF_FONT_FAMILY', '')
+    if fallback_fonts is None:
+        configured = [name for name in os.getenv('PDF_FALLBACK_FONTS', '').split(',') if name.strip()]
+        fallback_fonts = [name.strip() for name in configured] + list(FALLBACK_FONTS)
+
+    fonts, charset = CORE_FONTS, _core_charset()
+    if family.lower() != 'core':
+        candidates = [entry for entry in FONT_FAMILIES if entry[0] == family] or FONT_FAMILIES
+        for name, filenames in candidates:
+            try:
+                resolved = _family_fonts(name, filenames, dirs)
+            except Exception as e:
+                print(f"ERROR: Could not load PDF font family {name}: {e}")
+                continue
+            if resolved:
+                fonts, regular = resolved
+                charset = _charset(regular)
+                break
+
+    fallbacks = []
+    for filename in fallback_fonts:
+        path = find_font_file(filename, dirs)
+        if not path:
+            continue
+        try:
+            font = load_font(path)
+        except Exception as e:
+            print(f"ERROR: Could not load PDF fallback font {path}: {e}")
+            continue
+        if font.fontName != fonts['normal'] and font.fontName not in dict(fallbacks):
+            fallbacks.append((font.fontName, _charset(font)))
+    return FontSet(fonts, charset, fallbacks)
+
+_font_set = None
+_font_set_lock = threading.Lock()
+
+def get_font_set():
+    """The process-wide FontSet, resolved on first use"""
+    global _font_set
+    if _font_set is None:
+        with _font_set_lock:
+            if _font_set is None:
+                _font_set = build_font_set()
+    return _font_set
+
+def markup(text):
+    """Paragraph markup for plain text using the process-wide FontSet"""
+    return get_font_set().markup(text)
@@ -0,0 +1,203 @@
+"""
+PDF Styles
+Process-wide ReportLab style registry and flowable factories shared by PDF exports
+"""
+
+import threading
+from types import MappingProxyType
+from reportlab.lib import colors
+from reportlab.lib.fonts import addMapping
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Image as RLImage
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+from pdf_fonts import CORE_FONTS, get_font_set, markup
+
+PRIMARY_COLOR = colors.HexColor('#1e40af')
+SECONDARY_COLOR = colors.HexColor('#64748b')
+HEADER_FILL = colors.HexColor('#E8E8E8')
+
+# Table cell styles are prebuilt for this range of font sizes
+CELL_FONT_SIZES = range(8, 13)
+
+def register_font_family(fonts):
+    """Map a family's bold/italic variants so <b> and <i> markup resolves"""
+    family = fonts['family']
+    addMapping(family, 0, 0, fonts['normal'])
+    addMapping(family, 1, 0, fonts['bold'])
+    addMapping(family, 0, 1, fonts['italic'])
+    addMapping(family, 1, 1, fonts['bold_italic'])
+
+class StyleRegistry:
+    """Read-only paragraph and table styles built once per process.
+
+    Styles are shared between threads and exports; derive a new
+    ParagraphStyle from one instead of modifying it.
+    """
+
+    def __init__(self, fonts=CORE_FONTS):
+        register_font_family(fonts)
+        self.fonts = MappingProxyType(dict(fonts))
+
+        sample = getSampleStyleSheet()
+        styles = {}
+        for name in ('Normal', 'BodyText', 'Heading1', 'Heading2', 'Heading3'):
+            base = sample[name]
+            font = fonts['bold'] if base.fontName.endswith('Bold') else fonts['normal']
+            styles[name] = ParagraphStyle(name, parent=base, fontName=font)
+
+        styles['CustomTitle'] = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            textColor=PRIMARY_COLOR,
+            spaceAfter=30,
+            alignment=1,
+            fontName=fonts['bold']
+        )
+        styles['Subtitle'] = ParagraphStyle('Subtitle', parent=styles['Normal'], alignment=1,
+                                            fontSize=13, leading=17, textColor=SECONDARY_COLOR)
+        styles['Indented'] = ParagraphStyle('Indented', parent=styles['Normal'], leftIndent=18)
+        styles['Caption'] = ParagraphStyle('Caption', parent=styles['Normal'], alignment=1, fontSize=9,
+                                           textColor=SECONDARY_COLOR, fontName=fonts['italic'])
+        for size in CELL_FONT_SIZES:
+            styles[f'Cell{size}'] = ParagraphStyle(f'Cell{size}', parent=styles['BodyText'],
+                                                   fontSize=size, leading=size * 1.2)
+            styles[f'CellBold{size}'] = ParagraphStyle(f'CellBold{size}', parent=styles[f'Cell{size}'],
+                                                       fontName=fonts['bold'])
+        self._styles = MappingProxyType(styles)
+
+        self.grid_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HEADER_FILL),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.75, colors.black)
+        ])
+        self.details_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), HEADER_FILL),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.75, colors.black),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
+        ])
+        self.metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HEADER_FILL),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 0.75, colors.black)
+        ])
+
+    def __getitem__(self, name):
+        return self._styles[name]
+
+    def __contains__(self, name):
+        return name in self._styles
+
+    def cell_style(self, font_size, bold=False):
+        """Prebuilt table cell style for a font size"""
+        size = min(max(int(font_size), CELL_FONT_SIZES[0]), CELL_FONT_SIZES[-1])
+        return self._styles[f'CellBold{size}' if bold else f'Cell{size}']
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_style_registry():
+    """The process-wide style registry, created on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StyleRegistry(get_font_set().fonts)
+    return _registry
+
+# ----------------------------------------------------------------------
+# Flowable factories
+# ----------------------------------------------------------------------
+
+def cover_page(title, subtitle=None, logo_path=None):
+    """Logo, title and optional subtitle of a cover page"""
+    styles = get_style_registry()
+    flowables = []
+    if logo_path:
+        flowables.append(RLImage(logo_path, width=3*inch, height=1.2*inch))
+    flowables.append(Spacer(1, 50))
+    flowables.append(Paragraph(markup(title), styles['CustomTitle']))
+    flowables.append(Spacer(1, 20))
+    if subtitle:
+        flowables.append(Paragraph(markup(subtitle), styles['Subtitle']))
+    return flowables
+
+def heading(text, level=1):
+    """Section heading followed by a little space"""
+    styles = get_style_registry()
+    style = styles['Heading1'] if level == 1 else styles['Heading2'] if level == 2 else styles['Heading3']
+    return [Paragraph(markup(text), style), Spacer(1, 6)]
+
+def paragraph(text, style='Normal'):
+    """Body paragraph of plain (escaped) text"""
+    return Paragraph(markup(text), get_style_registry()[style])
+
+def labelled(label, text):
+    """Paragraph with a bold label"""
+    return Paragraph(f"<b>{markup(label)}:</b> {markup(text)}", get_style_registry()['Normal'])
+
+def bullet_list(items):
+    """Indented bullet paragraphs"""
+    style = get_style_registry()['Indented']
+    return [Paragraph(f"• {markup(item)}", style) for item in items]
+
+def data_table(headers, rows, width, font_size=10):
+    """Wrapped grid table with a shaded header row repeated across pages"""
+    styles = get_style_registry()
+    header_style = styles.cell_style(font_size, bold=True)
+    cell_style = styles.cell_style(font_size)
+
+    data = [[Paragraph(markup(header), header_style) for header in headers]]
+    data.extend([Paragraph(markup(value), cell_style) for value in row] for row in rows)
+    table = Table(data, colWidths=[width / len(headers)] * len(headers), repeatRows=1)
+    table.setStyle(styles.grid_table_style)
+    return [table, Spacer(1, 12)]
+
+def details_table(rows, width, font_size=11):
+    """Two-column label/value table with a shaded label column"""
+    styles = get_style_registry()
+    label_style = styles.cell_style(font_size, bold=True)
+    value_style = styles.cell_style(font_size)
+
+    data = [[Paragraph(markup(label), label_style), Paragraph(markup(value), value_style)]
+            for label, value in rows]
+    table = Table(data, colWidths=[2*inch, width - 2*inch])
+    table.setStyle(styles.details_table_style)
+    return [table, Spacer(1, 12)]
+
+def metrics_table(metrics, font_size=11):
+    """Coverage metrics with a Metric/Value header"""
+    styles = get_style_registry()
+    header_style = styles.cell_style(font_size, bold=True)
+    cell_style = styles.cell_style(font_size)
+
+    data = [[Paragraph('Metric', header_style), Paragraph('Value', header_style)]]
+    data.extend([Paragraph(markup(label), cell_style), Paragraph(markup(value), cell_style)]
+                for label, value in metrics)
+    table = Table(data, colWidths=[3*inch, 2*inch])
+    table.setStyle(styles.metrics_table_style)
+    return [table, Spacer(1, 20)]
+
+def dashboard(title, fields, metrics, metrics_heading=None):
+    """Coverage dashboard: heading, summary fields and metrics table"""
+    flowables = heading(title, 1)
+    for label, value in fields:
+        flowables.append(labelled(label, value))
+    if fields:
+        flowables.append(Spacer(1, 12))
+    if metrics_heading:
+        flowables.extend(heading(metrics_heading, 2))
+    flowables.extend(metrics_table(metrics))
+    return flowables
+
+def image(stream, width, height, caption=None):
+    """Image with an optional caption"""
+    flowables = [RLImage(stream, width=width, height=height)]
+    if caption:
+        flowables.append(Paragraph(markup(caption), get_style_registry()['Caption']))
+    flowables.append(Spacer(1, 12))
+    return flowables
@@ -0,0 +1,168 @@
+"""
+Prompt Registry
+Prompt templates loaded and compiled once, reloaded in the background when edited
+"""
+
+import hashlib
+import os
+import string
+import threading
+import time
+
+PROMPT_DIR = os.getenv('PROMPT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts')
+RELOAD_INTERVAL = float(os.getenv('PROMPT_RELOAD_INTERVAL', '2'))
+
+def _version(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+def field_label(field):
+    """Heading a field's value gets in the prefix layout, e.g. COVERAGE ANALYSIS"""
+    return field.replace('_', ' ').upper()
+
+class PromptTemplate:
+    """A prompt file split into literal text and {field} slots.
+
+    Literal braces are unescaped at compile time, so rendering is a single
+    join instead of re-parsing the whole template with str.format.
+    """
+
+    def __init__(self, name, text):
+        self.name = name
+        self.text = text
+        self.version = _version(text)
+
+        segments = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise ValueError(f"{name}: invalid placeholder {{{field}}} (escape literal braces as {{{{ }}}})")
+            segments.append((literal, field))
+        self._segments = tuple(segments)
+        self.fields = frozenset(field for _, field in segments if field)
+        self.field_order = tuple(dict.fromkeys(field for _, field in segments if field))
+
+        # Prefix layout: the template with every slot pointing at the values
+        # appended after it, identical for every request
+        self.static_text = ''.join(
+            literal + (f"[{field_label(field)} - provided in the user message]" if field else '')
+            for literal, field in segments
+        )
+
+    def render(self, **values):
+        """Fill the template; a missing field raises KeyError like str.format"""
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return ''.join(parts)
+
+    def render_dynamic(self, **values):
+        """Only the request values, labelled, for appending after static_text"""
+        return '\n\n'.join(f"{field_label(field)}:\n{values[field]}" for field in self.field_order)
+
+class PromptSet:
+    """Immutable snapshot of every template, swapped in whole on reload"""
+
+    def __init__(self, templates, signature):
+        self.templates = templates
+        self.signature = signature
+        self.version = _version(''.join(f"{name}:{template.version};" for name, template in sorted(templates.items())))
+
+class PromptRegistry:
+    """Every prompts/*.txt file, compiled at startup.
+
+    Lookups only read the current PromptSet, so the request path does no
+    disk I/O. A watcher thread polls file mtimes and, on a change, builds
+    a new set and replaces the old one in a single assignment. A file that
+    no longer compiles keeps its previous version.
+    """
+
+    def __init__(self, directory=PROMPT_DIR, reload_interval=RELOAD_INTERVAL):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.debug_mode = os.getenv('FLASK_ENV') == 'development'
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._prompts = PromptSet({}, {})
+        self.reload()
+
+    def _signature(self):
+        """(mtime, size) of each prompt file, or None if the directory is missing"""
+        signature = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.txt') and entry.is_file():
+                        stat = entry.stat()
+                        signature[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+        return signature
+
+    def reload(self):
+        """Re-read changed prompt files and swap in the new set; returns True if anything changed"""
+        with self._reload_lock:
+            current = self._prompts
+            signature = self._signature()
+            if signature is None:
+                # Keep serving what is loaded, e.g. while a deploy swaps the directory
+                if current.signature is not None:
+                    print(f"ERROR: Prompt directory not found: {self.directory}")
+                    self._prompts = PromptSet(current.templates, None)
+                return False
+            if signature == current.signature:
+                return False
+
+            templates = {}
+            for name, stat in signature.items():
+                previous = current.templates.get(name)
+                if previous and (current.signature or {}).get(name) == stat:
+                    templates[name] = previous
+                    continue
+                try:
+                    with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                        templates[name] = PromptTemplate(name, f.read().strip())
+                except (OSError, UnicodeDecodeError, ValueError) as e:
+                    print(f"ERROR: Could not load prompt {name}: {str(e)}")
+                    if previous:
+                        templates[name] = previous
+
+            self._prompts = PromptSet(templates, signature)
+            if self.debug_mode:
+                print(f"DEBUG - Loaded {len(templates)} prompts, version {self._prompts.version}")
+            return True
+
+    def get(self, name):
+        """Compiled template for a prompt file name, or None"""
+        return self._prompts.templates.get(name)
+
+    def render(self, name, **values):
+        """Rendered prompt, or None if the prompt file is missing"""
+        template = self._prompts.templates.get(name)
+        return template.render(**values) if template else None
+
+    @property
+    def version(self):
+        """Version of the whole prompt set, for cache keys and metrics"""
+        return self._prompts.version
+
+    def versions(self):
+        return {name: template.version for name, template in sorted(self._prompts.templates.items())}
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"ERROR: Prompt reload failed: {str(e)}")
+
+    def start_watching(self):
+        """Start the background reload thread (no-op if the interval is 0)"""
+        with self._reload_lock:
+            if self.reload_interval <= 0 or self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name='prompt-watcher', daemon=True)
+            self._watcher.start()
+
+prompt_registry = PromptRegistry()
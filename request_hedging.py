@@ -0,0 +1,149 @@
+"""
+Request Hedging
+Fires a backup LLM request when the first one is slower than recent calls of its kind
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait, FIRST_COMPLETED
+
+HEDGE_ENABLED = os.getenv('LLM_HEDGE_ENABLED', 'false').lower() == 'true'
+HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+HEDGE_MIN_DELAY = float(os.getenv('LLM_HEDGE_MIN_DELAY', '1.0'))
+HEDGE_INITIAL_DELAY = float(os.getenv('LLM_HEDGE_INITIAL_DELAY', '10.0'))
+HEDGE_MAX_RATE = float(os.getenv('LLM_HEDGE_MAX_RATE', '0.05'))
+HEDGE_WINDOW = int(os.getenv('LLM_HEDGE_WINDOW', '200'))
+HEDGE_WORKERS = int(os.getenv('LLM_HEDGE_WORKERS', '32'))
+
+# Latency samples a kind of request needs before its percentile is trusted
+MIN_SAMPLES = 20
+# Hedges the budget can bank for a burst of slow requests
+MAX_BUDGET = 3.0
+
+class LatencyTracker:
+    """Rolling latency window per kind of request (e.g. per prompt)"""
+
+    def __init__(self, window=HEDGE_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds):
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, kind, percentile):
+        """Latency at the given percentile, or None until MIN_SAMPLES are in"""
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+class RequestHedger:
+    """Runs a call and, past the hedge delay, races a second copy against it.
+
+    The hedge delay is the configured percentile of recent latencies of
+    the same kind, so only the slow tail is hedged. Each request adds
+    max_rate to a budget and each hedge spends one, capping hedges at
+    max_rate of traffic. The losing call is cancelled if it has not
+    started; otherwise its result is discarded when it finishes.
+    Latencies are measured with clock, a perf_counter-like callable;
+    attempts run on executor, by default a pool of `workers` threads.
+    """
+
+    def __init__(self, enabled=HEDGE_ENABLED, percentile=HEDGE_PERCENTILE, min_delay=HEDGE_MIN_DELAY,
+                 initial_delay=HEDGE_INITIAL_DELAY, max_rate=HEDGE_MAX_RATE, window=HEDGE_WINDOW,
+                 workers=HEDGE_WORKERS, clock=time.perf_counter, executor=None):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.max_rate = max_rate
+        self.latencies = LatencyTracker(window)
+        self.clock = clock
+        self._workers = workers
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._budget = 1.0
+        self._counts = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'primary_wins': 0,
+                        'budget_denied': 0, 'losers_cancelled': 0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='llm-hedge')
+            return self._executor
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def hedge_delay(self, kind):
+        """Seconds to wait for the first call before hedging"""
+        observed = self.latencies.percentile(kind, self.percentile)
+        return max(self.min_delay, observed if observed is not None else self.initial_delay)
+
+    def _take_budget(self):
+        with self._lock:
+            if self._budget >= 1.0:
+                self._budget -= 1.0
+                return True
+            self._counts['budget_denied'] += 1
+            return False
+
+    def _timed(self, kind, call, *args):
+        """Run one attempt, recording its latency when it succeeds"""
+        started = self.clock()
+        result = call(*args)
+        self.latencies.record(kind, self.clock() - started)
+        return result
+
+    def call(self, kind, call, primary_args=(), hedge_args=None):
+        """Return call(*primary_args), hedged with call(*hedge_args) if it is slow"""
+        with self._lock:
+            self._counts['requests'] += 1
+            self._budget = min(MAX_BUDGET, self._budget + self.max_rate)
+        if not self.enabled:
+            return self._timed(kind, call, *primary_args)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, kind, call, *primary_args)
+        try:
+            return primary.result(timeout=self.hedge_delay(kind))
+        except FuturesTimeout:
+            pass
+        if not self._take_budget():
+            return primary.result()
+
+        self._count('hedged')
+        # The hedge may target another model, so its latency is kept out of the window
+        hedge = executor.submit(call, *(primary_args if hedge_args is None else hedge_args))
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        # Both may have finished by now; a failed finisher is no reason to give up on the other attempt
+        succeeded = [future for future in (primary, hedge) if future in done and future.exception() is None]
+        if succeeded:
+            winner = succeeded[0]
+        elif pending:
+            winner = pending.pop()
+            winner.exception()
+        else:
+            winner = primary
+        loser = hedge if winner is primary else primary
+
+        self._count('primary_wins' if winner is primary else 'hedge_wins')
+        if loser.cancel():
+            self._count('losers_cancelled')
+        return winner.result()
+
+    def stats(self):
+        """Hedging counters, for metrics"""
+        with self._lock:
+            stats = dict(self._counts, enabled=self.enabled, budget=round(self._budget, 2))
+        hedged = stats['hedged']
+        stats['hedge_rate'] = round(hedged / stats['requests'], 4) if stats['requests'] else 0.0
+        stats['hedge_win_rate'] = round(stats['hedge_wins'] / hedged, 4) if hedged else 0.0
+        return stats
@@ -0,0 +1,135 @@
+"""
+Requirement Similarity Index
+MinHash index over analyzed requirements, used to reuse near-duplicate analyses
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+import zlib
+import numpy as np
+
+# Modulus of the MinHash permutation family (Mersenne prime 2^31 - 1)
+_PRIME = np.uint64((1 << 31) - 1)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_requirement(requirement):
+    """Lower-case and collapse whitespace so formatting edits don't count"""
+    return _WHITESPACE.sub(' ', requirement.lower()).strip()
+
+class SimilarAnalysis:
+    """Closest previously analyzed requirement and its coverage analysis"""
+
+    def __init__(self, similarity, requirement, analysis):
+        self.similarity = similarity
+        self.requirement = requirement
+        self.analysis = analysis
+
+    def to_dict(self):
+        # The requirement may have been typed by anyone with the same owner
+        # key; only the score goes back to clients
+        return {'similarity': round(self.similarity, 3)}
+
+class RequirementSimilarityIndex:
+    """Per-document-type MinHash signatures held in preallocated NumPy arrays.
+
+    Every entry belongs to an owner (a browser session) and lookups only
+    match entries of the same owner. They compare the query signature
+    against the owner's stored signatures in one vectorized pass. When a
+    document type reaches capacity the oldest entries are overwritten.
+    """
+
+    def __init__(self, num_permutations=128, shingle_size=5, capacity=5000, seed=7):
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        self.capacity = capacity
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._owners = {}
+        self._entries = {}
+        self._counts = {}
+
+    def _shingles(self, requirement):
+        """Hash the character shingles of a normalized requirement"""
+        text = normalize_requirement(requirement)
+        size = self.shingle_size
+        if len(text) <= size:
+            grams = {text}
+        else:
+            grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+        hashes = [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+        return np.array(hashes, dtype=np.uint64) % _PRIME
+
+    def signature(self, requirement):
+        """MinHash signature of a requirement"""
+        shingles = self._shingles(requirement)
+        return ((self._a * shingles + self._b) % _PRIME).min(axis=1)
+
+    @staticmethod
+    def _owner_id(owner):
+        """64-bit hash standing for an owner key in the owners array (0 marks an empty slot)"""
+        digest = hashlib.blake2b(str(owner).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True) or 1
+
+    def add(self, owner, document_type, requirement, analysis):
+        """Record a completed analysis for an owner"""
+        signature = self.signature(requirement)
+        with self._lock:
+            if document_type not in self._signatures:
+                self._signatures[document_type] = np.zeros((self.capacity, self.num_permutations), dtype=np.uint64)
+                self._owners[document_type] = np.zeros(self.capacity, dtype=np.int64)
+                self._entries[document_type] = [None] * self.capacity
+                self._counts[document_type] = 0
+
+            slot = self._counts[document_type] % self.capacity
+            self._signatures[document_type][slot] = signature
+            self._owners[document_type][slot] = self._owner_id(owner)
+            self._entries[document_type][slot] = (requirement, copy.deepcopy(analysis))
+            self._counts[document_type] += 1
+
+    def find_similar(self, owner, document_type, requirement):
+        """Return the owner's closest stored analysis for a document type, or None"""
+        if not requirement or not requirement.strip():
+            return None
+
+        signature = self.signature(requirement)
+        owner_id = self._owner_id(owner)
+        with self._lock:
+            count = min(self._counts.get(document_type, 0), self.capacity)
+            if not count:
+                return None
+
+            rows = np.flatnonzero(self._owners[document_type][:count] == owner_id)
+            if not rows.size:
+                return None
+
+            # Fraction of agreeing MinHash slots estimates Jaccard similarity
+            scores = (self._signatures[document_type][rows] == signature).mean(axis=1)
+            best = int(scores.argmax())
+            stored_requirement, analysis = self._entries[document_type][rows[best]]
+            return SimilarAnalysis(float(scores[best]), stored_requirement, copy.deepcopy(analysis))
+
+    def clear(self):
+        """Forget every recorded analysis"""
+        with self._lock:
+            self._signatures.clear()
+            self._owners.clear()
+            self._entries.clear()
+            self._counts.clear()
+
+# Analyses at or above REUSE_THRESHOLD are returned instead of calling the
+# LLM; matches at or above SUGGEST_THRESHOLD are only surfaced to the client
+REUSE_THRESHOLD = float(os.getenv('ANALYSIS_REUSE_THRESHOLD', '0.9'))
+SUGGEST_THRESHOLD = float(os.getenv('ANALYSIS_SUGGEST_THRESHOLD', '0.6'))
+
+similarity_index = RequirementSimilarityIndex(
+    capacity=int(os.getenv('ANALYSIS_REUSE_CAPACITY', '5000'))
+)
@@ -0,0 +1,275 @@
+"""
+Document Search Index
+Full-text index over stored requirements and generated documents
+"""
+
+import html
+import os
+import re
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import undefer_group
+from models import db, Story
+
+# Private-use markers wrapped around matches by the database, swapped for
+# <mark> tags after the rest of the text has been HTML-escaped
+_MATCH_START = '\ue000'
+_MATCH_END = '\ue001'
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+def flatten_document(value):
+    """Collect every text leaf of a generated document into one string"""
+    parts = []
+
+    def _walk(item):
+        if isinstance(item, dict):
+            for child in item.values():
+                _walk(child)
+        elif isinstance(item, (list, tuple)):
+            for child in item:
+                _walk(child)
+        elif isinstance(item, str):
+            if item.strip():
+                parts.append(item.strip())
+        elif item is not None and not isinstance(item, bool):
+            parts.append(str(item))
+
+    _walk(value)
+    return '\n'.join(parts)
+
+def _render_highlight(fragment):
+    """Escape a highlighted fragment and turn match markers into <mark> tags"""
+    if not fragment:
+        return ''
+    escaped = html.escape(fragment)
+    return escaped.replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+
+class SearchUnavailable(Exception):
+    """No full-text search backend exists for the configured database"""
+
+class SearchBackend:
+    """Interface for full-text search backends.
+
+    Backends receive the SQLAlchemy connection of the surrounding unit of
+    work, so index updates commit or roll back together with the Story row.
+    """
+
+    name = None
+
+    def create_schema(self, connection):
+        """Create index structures; return True if they did not exist before"""
+        raise NotImplementedError
+
+    def index_document(self, connection, story_id, fields):
+        """Insert or replace the indexed fields of a story"""
+        raise NotImplementedError
+
+    def update_fields(self, connection, story_id, fields):
+        """Update only the given indexed fields of a story"""
+        raise NotImplementedError
+
+    def remove_document(self, connection, story_id):
+        """Drop a story from the index"""
+        raise NotImplementedError
+
+    def search(self, connection, user_id, query, limit=20, document_type=None):
+        """Return ranked, highlighted matches for a user's documents"""
+        raise NotImplementedError
+
+class SQLiteFTS5Backend(SearchBackend):
+    """SQLite FTS5 index keyed by Story.id (the FTS rowid)"""
+
+    name = 'sqlite_fts5'
+    table = 'story_fts'
+
+    # bm25 weights for title, requirements and content
+    weights = (10.0, 4.0, 1.0)
+
+    def create_schema(self, connection):
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {'name': self.table}).first()
+        if exists:
+            return False
+
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+            "title, requirements, content, user_id UNINDEXED, document_type UNINDEXED, "
+            "tokenize = 'porter unicode61')"
+        ))
+        return True
+
+    def index_document(self, connection, story_id, fields):
+        self.remove_document(connection, story_id)
+        connection.execute(text(
+            f"INSERT INTO {self.table} (rowid, title, requirements, content, user_id, document_type) "
+            "VALUES (:rowid, :title, :requirements, :content, :user_id, :document_type)"
+        ), {'rowid': story_id, **fields})
+
+    def update_fields(self, connection, story_id, fields):
+        assignments = ', '.join(f"{column} = :{column}" for column in fields)
+        connection.execute(text(
+            f"UPDATE {self.table} SET {assignments} WHERE rowid = :rowid"
+        ), {'rowid': story_id, **fields})
+
+    def remove_document(self, connection, story_id):
+        connection.execute(text(f"DELETE FROM {self.table} WHERE rowid = :rowid"), {'rowid': story_id})
+
+    def _match_expression(self, query):
+        """Turn free text into a safe FTS5 query (AND of terms, last term as prefix)"""
+        tokens = _TOKEN_PATTERN.findall(query)
+        if not tokens:
+            return None
+        terms = [f'"{token}"' for token in tokens[:-1]]
+        terms.append(f'"{tokens[-1]}"*')
+        return ' '.join(terms)
+
+    def search(self, connection, user_id, query, limit=20, document_type=None):
+        match = self._match_expression(query)
+        if not match:
+            return []
+
+        sql = (
+            f"SELECT rowid AS id, document_type, "
+            f"highlight({self.table}, 0, :start, :end) AS title, "
+            f"snippet({self.table}, 1, :start, :end, '…', 16) AS requirement_snippet, "
+            f"snippet({self.table}, 2, :start, :end, '…', 24) AS content_snippet, "
+            f"bm25({self.table}, {', '.join(str(w) for w in self.weights)}) AS rank "
+            f"FROM {self.table} WHERE {self.table} MATCH :match AND user_id = :user_id"
+        )
+        params = {'start': _MATCH_START, 'end': _MATCH_END, 'match': match,
+                  'user_id': user_id, 'limit': limit}
+        if document_type:
+            sql += " AND document_type = :document_type"
+            params['document_type'] = document_type
+        sql += " ORDER BY rank LIMIT :limit"
+
+        results = []
+        for row in connection.execute(text(sql), params):
+            results.append({
+                'id': row.id,
+                'document_type': row.document_type,
+                'title': row.title.replace(_MATCH_START, '').replace(_MATCH_END, ''),
+                'title_highlight': _render_highlight(row.title),
+                'requirement_snippet': _render_highlight(row.requirement_snippet),
+                'content_snippet': _render_highlight(row.content_snippet),
+                # bm25 is lower-is-better; expose a higher-is-better score
+                'score': round(-row.rank, 4)
+            })
+        return results
+
+SEARCH_BACKENDS = {
+    SQLiteFTS5Backend.name: SQLiteFTS5Backend
+}
+
+# Backend used when SEARCH_BACKEND is not set, per database dialect
+DEFAULT_BACKENDS = {
+    'sqlite': SQLiteFTS5Backend.name
+}
+
+_backends = {}
+
+def get_search_backend(dialect_name):
+    """Get the configured search backend for a database dialect, if any"""
+    if dialect_name not in _backends:
+        name = os.getenv('SEARCH_BACKEND') or DEFAULT_BACKENDS.get(dialect_name)
+        backend_class = SEARCH_BACKENDS.get(name)
+        _backends[dialect_name] = backend_class() if backend_class else None
+    return _backends[dialect_name]
+
+def _story_fields(story):
+    """Indexed field values for a Story instance"""
+    return {
+        'title': story.title or '',
+        'requirements': story.requirements or '',
+        'content': flatten_document(story.user_stories),
+        'user_id': story.user_id,
+        'document_type': story.document_type
+    }
+
+def _after_insert(mapper, connection, story):
+    backend = get_search_backend(connection.dialect.name)
+    if backend:
+        backend.index_document(connection, story.id, _story_fields(story))
+
+def _after_update(mapper, connection, story):
+    backend = get_search_backend(connection.dialect.name)
+    if not backend:
+        return
+
+    # Only re-index columns that actually changed; unchanged payloads may
+    # still be deferred and must not be loaded in the middle of a flush
+    state = inspect(story)
+    changed = {}
+    if state.attrs.title.history.has_changes():
+        changed['title'] = story.title or ''
+    if state.attrs.requirements.history.has_changes():
+        changed['requirements'] = story.requirements or ''
+    if state.attrs.user_stories.history.has_changes():
+        changed['content'] = flatten_document(story.user_stories)
+    if state.attrs.document_type.history.has_changes():
+        changed['document_type'] = story.document_type
+    if changed:
+        backend.update_fields(connection, story.id, changed)
+
+def _after_delete(mapper, connection, story):
+    backend = get_search_backend(connection.dialect.name)
+    if backend:
+        backend.remove_document(connection, story.id)
+
+def _after_create_table(table, connection, **kwargs):
+    backend = get_search_backend(connection.dialect.name)
+    if backend:
+        backend.create_schema(connection)
+
+def register_search_sync():
+    """Keep the search index in sync with Story inserts, updates and deletes"""
+    for name, handler in (('after_insert', _after_insert),
+                          ('after_update', _after_update),
+                          ('after_delete', _after_delete)):
+        if not event.contains(Story, name, handler):
+            event.listen(Story, name, handler)
+
+    # Databases created from scratch get the index alongside the story table
+    if not event.contains(Story.__table__, 'after_create', _after_create_table):
+        event.listen(Story.__table__, 'after_create', _after_create_table)
+
+def rebuild_search_index():
+    """Index every stored story from scratch"""
+    backend = get_search_backend(db.engine.dialect.name)
+    if not backend:
+        return 0
+
+    count = 0
+    connection = db.session.connection()
+    for story in Story.query.options(undefer_group('payload')).yield_per(200):
+        backend.index_document(connection, story.id, _story_fields(story))
+        count += 1
+    db.session.commit()
+    return count
+
+def init_search(app):
+    """Create the search index for an app's database and start syncing it"""
+    register_search_sync()
+    with app.app_context():
+        backend = get_search_backend(db.engine.dialect.name)
+        if not backend:
+            return
+        try:
+            with db.engine.begin() as connection:
+                created = backend.create_schema(connection)
+        except OperationalError as e:
+            app.logger.error(f"Search index unavailable: {str(e)}")
+            _backends[db.engine.dialect.name] = None
+            return
+        if created:
+            rebuild_search_index()
+
+def search_documents(user_id, query, limit=20, document_type=None):
+    """Search a user's stored documents"""
+    backend = get_search_backend(db.engine.dialect.name)
+    if not backend:
+        raise SearchUnavailable("No search backend is configured for this database")
+    limit = max(1, min(int(limit), 100))
+    return backend.search(db.session.connection(), user_id, query, limit, document_type)
@@ -0,0 +1,141 @@
+"""
+Speculative Generation
+Generates a document from the suggested answers while the user is still reviewing them
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SPECULATION_ENABLED = os.getenv('SPECULATIVE_GENERATION', 'true').lower() == 'true'
+SPECULATION_WORKERS = int(os.getenv('SPECULATION_WORKERS', '4'))
+SPECULATION_TTL_SECONDS = int(os.getenv('SPECULATION_TTL_SECONDS', '900'))
+SPECULATION_MAX_WAIT = float(os.getenv('SPECULATION_MAX_WAIT', '120'))
+
+def suggested_answers(analysis):
+    """The answers the Q&A step starts out with for an analysis.
+
+    Mirrors the frontend: recommendations come from the coverage block's
+    editable_recommendations, or are derived from its missing_elements,
+    and each textarea is pre-filled with the suggested answer.
+    """
+    if not isinstance(analysis, dict):
+        return {}
+    coverage = analysis.get('coverage_analysis')
+    coverage = coverage if isinstance(coverage, dict) else analysis
+
+    recommendations = coverage.get('editable_recommendations') or []
+    if not recommendations:
+        recommendations = [
+            {'element': element.get('element'),
+             'suggested_answer': element.get('suggested_content') or f"Provide {str(element.get('element')).lower()} requirements"}
+            for element in coverage.get('missing_elements') or [] if isinstance(element, dict)
+        ]
+
+    answers = {}
+    for recommendation in recommendations:
+        if not isinstance(recommendation, dict) or not recommendation.get('element'):
+            continue
+        value = str(recommendation.get('suggested_answer') or '').strip()
+        if value:
+            answers[recommendation['element']] = value
+    return answers
+
+class Speculation:
+    """One background generation and the inputs it was started with"""
+
+    def __init__(self, document_type, requirement, answers, future):
+        self.document_type = document_type
+        self.requirement = requirement
+        self.answers = answers
+        self.future = future
+        self.started = time.time()
+
+    def result(self, timeout=SPECULATION_MAX_WAIT):
+        """The speculative document, or None if it failed or is not ready in time"""
+        try:
+            document = self.future.result(timeout=timeout)
+        except Exception:
+            return None
+        return document if isinstance(document, dict) and document else None
+
+class SpeculativeGenerator:
+    """Background generations keyed by analysis_id, each claimable once.
+
+    Speculations nobody claims are cancelled when their analysis is
+    replaced or after SPECULATION_TTL_SECONDS. A generation that has
+    already reached the LLM cannot be interrupted; its result is dropped.
+    """
+
+    def __init__(self, enabled=SPECULATION_ENABLED, workers=SPECULATION_WORKERS, ttl_seconds=SPECULATION_TTL_SECONDS):
+        self.enabled = enabled
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+        self._speculations = {}
+        self._counts = {'started': 0, 'skipped': 0, 'hits': 0, 'patched': 0, 'misses': 0, 'cancelled': 0}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='speculation')
+        return self._executor
+
+    def _drop(self, analysis_id):
+        """Remove and cancel a speculation (caller holds the lock)"""
+        speculation = self._speculations.pop(analysis_id, None)
+        if speculation:
+            speculation.future.cancel()
+            self._counts['cancelled'] += 1
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        for analysis_id in [key for key, spec in self._speculations.items() if spec.started < cutoff]:
+            self._drop(analysis_id)
+
+    def start(self, analysis_id, document_type, requirement, answers, generate):
+        """Start generate(requirement, answers) in the background; returns False if skipped"""
+        if not self.enabled or not analysis_id:
+            return False
+        with self._lock:
+            self._expire()
+            if analysis_id in self._speculations:
+                return True
+            # Speculation must never queue up behind itself and delay real requests
+            running = sum(1 for spec in self._speculations.values() if not spec.future.done())
+            if running >= self.workers:
+                self._counts['skipped'] += 1
+                return False
+            future = self._get_executor().submit(generate, requirement, dict(answers))
+            self._speculations[analysis_id] = Speculation(document_type, requirement, dict(answers), future)
+            self._counts['started'] += 1
+            return True
+
+    def claim(self, analysis_id, document_type, requirement):
+        """Take the speculation for an analysis if it was started for this request, else None"""
+        if not analysis_id:
+            return None
+        with self._lock:
+            self._expire()
+            speculation = self._speculations.pop(str(analysis_id), None)
+        if speculation and (speculation.document_type != document_type or speculation.requirement != requirement):
+            speculation.future.cancel()
+            return None
+        return speculation
+
+    def cancel(self, analysis_id):
+        """Cancel an unused speculation, e.g. when the user re-analyzes"""
+        with self._lock:
+            self._drop(analysis_id)
+
+    def record(self, outcome):
+        """Count a claimed speculation as a hit, a patch or a miss"""
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, enabled=self.enabled, pending=len(self._speculations))
+
+speculative_generator = SpeculativeGenerator()
@@ -1,11 +1,19 @@
+// Live analysis starts once the requirement text has stopped changing for a moment
+const LIVE_ANALYSIS_DELAY_MS = 800;
+const LIVE_ANALYSIS_MIN_LENGTH = 20;
+
 class DocumentGeneratorApp {
     constructor() {
         this.currentRequirement = '';
         this.currentAnswers = {};
         this.currentDocument = null;
         this.coverageData = null;
+        this.analysisId = null; // Server-side analysis session used by generate
         this.documentType = 'user-story'; // default
         this.sectionImages = {}; // Store images per section
+        this.lastGeneration = null; // Previous generate request, for incremental regeneration
+        this.live = null; // Live analysis of the requirement being typed
+        this.liveTimer = null;
         this.initializeEventListeners();
     }
 
@@ -25,10 +33,19 @@ class DocumentGeneratorApp {
         // Export buttons
         document.getElementById('export-word').addEventListener('click', () => this.exportDocument('word'));
         document.getElementById('export-pdf').addEventListener('click', () => this.exportDocument('pdf'));
+        document.getElementById('export-markdown').addEventListener('click', () => this.exportDocument('markdown'));
+        document.getElementById('export-html').addEventListener('click', () => this.exportDocument('html'));
+        document.getElementById('export-json').addEventListener('click', () => this.exportDocument('json'));
+        document.getElementById('preview-document').addEventListener('click', () => this.previewDocument());
+        document.getElementById('push-tracker').addEventListener('click', () => this.pushToTracker());
 
         // Modal close
         document.querySelector('.close').addEventListener('click', () => this.hideError());
         
+        // Live analysis while typing
+        document.getElementById('requirement-input').addEventListener('input', () => this.scheduleLiveAnalysis());
+        document.getElementById('live-analysis-toggle').addEventListener('change', () => this.scheduleLiveAnalysis());
+        
         // Enter key handling
         document.getElementById('requirement-input').addEventListener('keypress', (e) => {
             if (e.key === 'Enter' && e.ctrlKey) {
@@ -64,6 +81,9 @@ class DocumentGeneratorApp {
                 
                 // Update button text
                 this.updateAnalyzeButton(docType);
+                
+                // Re-analyze the requirement for the new document type
+                this.scheduleLiveAnalysis();
             });
             
             // Keyboard navigation
@@ -151,6 +171,23 @@ class DocumentGeneratorApp {
         }
 
         this.currentRequirement = requirement;
+        
+        // In live mode this text has usually been analyzed (or is being analyzed) already
+        if (this.isLiveAnalysisEnabled()) {
+            const live = this.startLiveAnalysis(requirement);
+            if (!live.done) {
+                this.showLoading('Finishing analysis...');
+            }
+            const result = await live.promise;
+            this.hideLoading();
+            if (result) {
+                const replacedAnalysisId = this.analysisId;
+                this.applyAnalysis(result);
+                this.speculateOnAnalysis(requirement, replacedAnalysisId);
+                return;
+            }
+        }
+        
         this.showLoading('Analyzing requirement...');
 
         try {
@@ -165,8 +202,10 @@ class DocumentGeneratorApp {
                 headers: {
                     'Content-Type': 'application/json',
                 },
+                // Lets the server cancel the document it was speculatively generating for the last analysis
                 body: JSON.stringify({ 
-                    requirement
+                    requirement,
+                    replaces_analysis_id: this.analysisId
                 })
             });
 
@@ -180,25 +219,7 @@ class DocumentGeneratorApp {
                 throw new Error(data.error || 'Analysis failed');
             }
 
-            this.coverageData = data.coverage_analysis;
-            this.renderCoverageAnalysis(data.coverage_analysis);
-            this.showStep('coverage');
-            
-            // Check if we need additional Q&A based on coverage
-            if (data.coverage_analysis && data.coverage_analysis.editable_recommendations && 
-                data.coverage_analysis.editable_recommendations.length === 0) {
-                // If no recommendations needed, skip to generation
-                const buttonText = this.documentType === 'brd' ? 'Generate BRD' : 
-                                 this.documentType === 'frd' ? 'Generate FRD' : 
-                                 this.documentType === 'srd' ? 'Generate SRD' : 'Generate Enterprise Story';
-                document.getElementById('generate-btn').textContent = buttonText;
-            } else {
-                // Set appropriate button text for generation with Q&A
-                const buttonText = this.documentType === 'brd' ? 'Generate BRD from Analysis' : 
-                                 this.documentType === 'frd' ? 'Generate FRD from Analysis' : 
-                                 this.documentType === 'srd' ? 'Generate SRD from Analysis' : 'Generate Enterprise Story';
-                document.getElementById('generate-btn').textContent = buttonText;
-            }
+            this.applyAnalysis(data);
 
         } catch (error) {
             this.showError(`Analysis failed: ${error.message}`);
@@ -207,6 +228,178 @@ class DocumentGeneratorApp {
         }
     }
 
+    applyAnalysis(data) {
+        this.coverageData = data.coverage_analysis;
+        this.analysisId = data.analysis_id || null;
+        this.renderCoverageAnalysis(data.coverage_analysis);
+        
+        // The server answers with the local keyword analysis when the LLM is unavailable
+        document.getElementById('analysis-source-notice').style.display =
+            data.analysis_source === 'local' ? 'block' : 'none';
+        this.showStep('coverage');
+        
+        // Check if we need additional Q&A based on coverage
+        if (data.coverage_analysis && data.coverage_analysis.editable_recommendations && 
+            data.coverage_analysis.editable_recommendations.length === 0) {
+            // If no recommendations needed, skip to generation
+            const buttonText = this.documentType === 'brd' ? 'Generate BRD' : 
+                             this.documentType === 'frd' ? 'Generate FRD' : 
+                             this.documentType === 'srd' ? 'Generate SRD' : 'Generate Enterprise Story';
+            document.getElementById('generate-btn').textContent = buttonText;
+        } else {
+            // Set appropriate button text for generation with Q&A
+            const buttonText = this.documentType === 'brd' ? 'Generate BRD from Analysis' : 
+                             this.documentType === 'frd' ? 'Generate FRD from Analysis' : 
+                             this.documentType === 'srd' ? 'Generate SRD from Analysis' : 'Generate Enterprise Story';
+            document.getElementById('generate-btn').textContent = buttonText;
+        }
+    }
+
+    isLiveAnalysisEnabled() {
+        const toggle = document.getElementById('live-analysis-toggle');
+        return Boolean(toggle && toggle.checked);
+    }
+
+    analysisDocumentType() {
+        // The document type analyzeRequirement picks its endpoint for
+        return ['brd', 'frd', 'srd'].includes(this.documentType) ? this.documentType : 'story';
+    }
+
+    scheduleLiveAnalysis() {
+        clearTimeout(this.liveTimer);
+        const requirement = document.getElementById('requirement-input').value.trim();
+        
+        if (!this.isLiveAnalysisEnabled() || requirement.length < LIVE_ANALYSIS_MIN_LENGTH) {
+            this.cancelLiveAnalysis();
+            this.live = null;
+            this.renderLiveAnalysis(null);
+            return;
+        }
+        
+        this.liveTimer = setTimeout(() => this.startLiveAnalysis(requirement), LIVE_ANALYSIS_DELAY_MS);
+    }
+
+    cancelLiveAnalysis() {
+        clearTimeout(this.liveTimer);
+        if (this.live && !this.live.done) {
+            this.live.controller.abort();
+        }
+    }
+
+    startLiveAnalysis(requirement) {
+        const documentType = this.analysisDocumentType();
+        if (this.live && this.live.requirement === requirement && this.live.documentType === documentType) {
+            return this.live;
+        }
+        
+        // Superseded requests are aborted so only the latest text is analyzed
+        this.cancelLiveAnalysis();
+        const live = {
+            requirement,
+            documentType,
+            controller: new AbortController(),
+            local: null,
+            result: null,
+            error: null,
+            done: false
+        };
+        live.promise = this.streamLiveAnalysis(live).finally(() => { live.done = true; });
+        this.live = live;
+        return live;
+    }
+
+    async streamLiveAnalysis(live) {
+        // Resolves to the LLM analysis, or null if it failed or was aborted
+        try {
+            const response = await fetch('/analyze/live', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    requirement: live.requirement,
+                    document_type: live.documentType
+                }),
+                signal: live.controller.signal
+            });
+            if (!response.ok) {
+                return null;
+            }
+            
+            // The local pre-analysis arrives first, the LLM analysis when it is done
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffered += decoder.decode(value, { stream: true });
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                lines.filter(line => line.trim()).forEach(line => {
+                    const data = JSON.parse(line);
+                    if (data.stage === 'local') {
+                        live.local = data;
+                    } else if (data.stage === 'llm') {
+                        live.result = data;
+                    } else {
+                        live.error = data.error || 'Analysis failed';
+                    }
+                    if (this.live === live) {
+                        this.renderLiveAnalysis(live);
+                    }
+                });
+            }
+            return live.result;
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                console.error('Live analysis failed:', error);
+            }
+            return null;
+        }
+    }
+
+    renderLiveAnalysis(live) {
+        const container = document.getElementById('live-analysis');
+        if (!container) return;
+        
+        if (!live || !live.local) {
+            container.innerHTML = '';
+            return;
+        }
+        
+        const analysis = live.result || live.local;
+        const coverage = analysis.coverage_analysis || {};
+        const score = coverage.overall_score !== undefined ? coverage.overall_score : analysis.overall_score;
+        const present = (coverage.present_elements || []).map(element => element.element);
+        const missing = (coverage.missing_elements || []).map(element => element.element);
+        const aiUnavailable = live.error || (live.result && live.result.analysis_source === 'local');
+        const status = aiUnavailable ? 'Quick check only (AI analysis unavailable)' :
+                       live.result ? 'AI analysis ready' : 'Quick check, AI analysis in progress...';
+        
+        container.innerHTML = `
+            <div class="live-status">${status}${score !== undefined ? ` · ${score}% covered` : ''}</div>
+            ${present.length ? `<div class="live-present">✅ ${present.join(', ')}</div>` : ''}
+            ${missing.length ? `<div class="live-missing">❌ ${missing.join(', ')}</div>` : ''}
+        `;
+    }
+
+    speculateOnAnalysis(requirement, replacedAnalysisId) {
+        // Live analyses are only speculated on once the user moves on with one
+        if (!this.analysisId) return;
+        fetch(`/analyze/${this.analysisId}/speculate`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                requirement,
+                document_type: this.analysisDocumentType(),
+                replaces_analysis_id: replacedAnalysisId
+            })
+        }).catch(error => console.error('Speculation request failed:', error));
+    }
+
     renderCoverageAnalysis(coverageData) {
         console.log('Rendering coverage data:', coverageData);
         
@@ -353,19 +546,50 @@ class DocumentGeneratorApp {
                            this.documentType === 'frd' ? '/generate_frd' : 
                            this.documentType === 'srd' ? '/generate_srd' : '/generate';
             
-            const response = await fetch(endpoint, {
+            // The server keeps the analysis; only its id travels back
+            const body = {
+                requirement: this.currentRequirement,
+                answers: this.currentAnswers
+            };
+            if (this.analysisId) {
+                body.analysis_id = this.analysisId;
+            } else {
+                body.coverage_analysis = this.coverageData;
+            }
+
+            // Regenerating the same document: only sections tied to changed answers are rebuilt
+            const last = this.lastGeneration;
+            if (last && last.documentType === this.documentType && last.requirement === this.currentRequirement) {
+                body.mode = 'incremental';
+                body.previous_requirement = last.requirement;
+                body.previous_answers = last.answers;
+                body.previous_document = last.document;
+            }
+
+            let response = await fetch(endpoint, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({
-                    requirement: this.currentRequirement,
-                    answers: this.currentAnswers,
-                    coverage_analysis: this.coverageData
-                })
+                body: JSON.stringify(body)
             });
 
-            const data = await response.json();
+            let data = await response.json();
+
+            // Session expired on the server: fall back to sending the analysis itself
+            if (response.status === 404 && data.analysis_expired) {
+                this.analysisId = null;
+                delete body.analysis_id;
+                body.coverage_analysis = this.coverageData;
+                response = await fetch(endpoint, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(body)
+                });
+                data = await response.json();
+            }
 
             if (!response.ok) {
                 const errorMessage = this.documentType === 'brd' ? 'BRD generation failed' : 'Story generation failed';
@@ -373,6 +597,12 @@ class DocumentGeneratorApp {
             }
 
             this.currentDocument = data;
+            this.lastGeneration = {
+                documentType: this.documentType,
+                requirement: this.currentRequirement,
+                answers: { ...this.currentAnswers },
+                document: data
+            };
             
             if (this.documentType === 'brd') {
                 this.renderBRD(data);
@@ -968,10 +1198,12 @@ class DocumentGeneratorApp {
             // Choose endpoint based on document type
             const endpoint = this.documentType === 'brd' ? `/export_brd/${format}` : 
                            this.documentType === 'frd' ? `/export_frd/${format}` : 
-                           this.documentType === 'srd' ? `/export_srd/${format}` : `/export/${format}`;
+                           this.documentType === 'srd' ? `/export_srd/${format}` : 
+                           this.documentType === 'cr' ? `/export_cr/${format}` : `/export/${format}`;
             const dataKey = this.documentType === 'brd' ? 'brd_data' : 
                           this.documentType === 'frd' ? 'frd_data' : 
-                          this.documentType === 'srd' ? 'srd_data' : 'story_data';
+                          this.documentType === 'srd' ? 'srd_data' : 
+                          this.documentType === 'cr' ? 'cr_data' : 'story_data';
             
             const response = await fetch(endpoint, {
                 method: 'POST',
@@ -996,14 +1228,17 @@ class DocumentGeneratorApp {
             const a = document.createElement('a');
             a.href = url;
             
+            const extensions = { word: 'docx', pdf: 'pdf', markdown: 'md', html: 'html', json: 'json' };
+            const extension = extensions[format] || format;
             const fileNames = {
-                'user-story': `enterprise_user_story.${format === 'word' ? 'docx' : format}`,
-                'brd': `business_requirements_document.${format === 'word' ? 'docx' : format}`,
-                'frd': `functional_requirements_document.${format === 'word' ? 'docx' : format}`,
-                'srd': `system_requirements_document.${format === 'word' ? 'docx' : format}`
+                'user-story': `enterprise_user_story.${extension}`,
+                'brd': `business_requirements_document.${extension}`,
+                'frd': `functional_requirements_document.${extension}`,
+                'srd': `system_requirements_document.${extension}`,
+                'cr': `change_request_document.${extension}`
             };
             
-            a.download = fileNames[this.documentType] || `document.${format === 'word' ? 'docx' : format}`;
+            a.download = fileNames[this.documentType] || `document.${extension}`;
             document.body.appendChild(a);
             a.click();
             window.URL.revokeObjectURL(url);
@@ -1016,17 +1251,103 @@ class DocumentGeneratorApp {
         }
     }
 
+    async previewDocument() {
+        if (!this.currentDocument) {
+            this.showError('No document to preview');
+            return;
+        }
+
+        const previewType = this.documentType === 'user-story' ? 'story' : this.documentType;
+        const container = document.getElementById('preview-container');
+        this.showLoading('Preparing page preview...');
+
+        try {
+            const response = await fetch(`/preview/${previewType}?format=png&width=360`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    [`${previewType}_data`]: this.currentDocument,
+                    coverage_data: this.coverageData,
+                    section_images: this.sectionImages
+                })
+            });
+
+            const manifest = await response.json();
+            if (!response.ok) {
+                throw new Error(manifest.error || 'Preview failed');
+            }
+
+            // Pages are rendered server-side only when the browser scrolls them into view
+            container.innerHTML = manifest.pages.map((url, index) => `
+                <figure class="preview-page">
+                    <img src="${url}" loading="lazy" width="${manifest.width}" alt="Page ${index + 1}">
+                    <figcaption>Page ${index + 1} of ${manifest.page_count}</figcaption>
+                </figure>
+            `).join('');
+        } catch (error) {
+            this.showError(`Preview failed: ${error.message}`);
+        } finally {
+            this.hideLoading();
+        }
+    }
+
+    async pushToTracker() {
+        if (!this.currentDocument) {
+            this.showError('No document to push');
+            return;
+        }
+        if (this.documentType !== 'user-story' && this.documentType !== 'brd') {
+            this.showError('Only user stories and BRD business requirements can be pushed to a tracker');
+            return;
+        }
+
+        const dataKey = this.documentType === 'brd' ? 'brd_data' : 'story_data';
+        this.showLoading('Pushing to tracker...');
+
+        try {
+            const response = await fetch('/tracker/push', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ [dataKey]: this.currentDocument })
+            });
+
+            const result = await response.json();
+            if (!response.ok) {
+                throw new Error(result.error || 'Push failed');
+            }
+
+            const { created, existing, error } = result.summary;
+            document.getElementById('tracker-status').textContent =
+                `Tracker: ${created} created, ${existing} already present, ${error} failed`;
+        } catch (error) {
+            this.showError(`Tracker push failed: ${error.message}`);
+        } finally {
+            this.hideLoading();
+        }
+    }
+
     startOver() {
         this.currentRequirement = '';
         this.currentAnswers = {};
         this.currentDocument = null;
+        this.lastGeneration = null;
         this.coverageData = null;
+        this.analysisId = null;
         this.sectionImages = {};
+        this.cancelLiveAnalysis();
+        this.live = null;
+        this.renderLiveAnalysis(null);
         
         document.getElementById('requirement-input').value = '';
         document.getElementById('coverage-container').innerHTML = '';
         document.getElementById('questions-container').innerHTML = '';
         document.getElementById('story-container').innerHTML = '';
+        document.getElementById('preview-container').innerHTML = '';
+        document.getElementById('tracker-status').textContent = '';
         document.getElementById('generate-btn').style.display = 'none';
         document.getElementById('generate-from-qa').style.display = 'none';
         
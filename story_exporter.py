@@ -10,13 +10,15 @@ from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.platypus import Image as RLImage
 from reportlab.graphics.shapes import Drawing, Circle, Rect, String
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics import renderPDF
+from pdf_fonts import markup
+from pdf_styles import get_style_registry
 try:
     from PIL import Image, ImageDraw, ImageFont
 except ImportError:
@@ -254,7 +256,7 @@ class StoryExporter:
         filepath = os.path.join(self.temp_dir, filename)
         
         doc = SimpleDocTemplate(filepath, pagesize=letter)
-        styles = getSampleStyleSheet()
+        styles = get_style_registry()
         story = []
         
         # Custom styles
@@ -301,8 +303,8 @@ class StoryExporter:
         
         # Business Goal
         if story_data.get('business_goal'):
-            goal_text = story_data['business_goal'][:150]
-            story.append(Paragraph(goal_text, styles['Normal']))
+            goal_text = str(story_data['business_goal'])[:150]
+            story.append(Paragraph(markup(goal_text), styles['Normal']))
         
         story.append(Spacer(1, 50))
         
@@ -318,7 +320,7 @@ class StoryExporter:
             ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
             ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 0), (0, -1), styles.fonts['bold']),
             ('FONTSIZE', (0, 0), (-1, -1), 12),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
             ('GRID', (0, 0), (-1, -1), 1, colors.grey)
@@ -328,7 +330,7 @@ class StoryExporter:
     
     def _add_pdf_dashboard(self, story, coverage_data, styles):
         """Add visual dashboard to PDF"""
-        story.append(Paragraph("📊 Enterprise Coverage Dashboard", styles['Heading1']))
+        story.append(Paragraph(markup("📊 Enterprise Coverage Dashboard"), styles['Heading1']))
         story.append(Spacer(1, 20))
         
         # Coverage Score Circle
@@ -348,13 +350,17 @@ class StoryExporter:
             ['Missing Elements', str(missing_count), '❌'],
             ['Enterprise Readiness', coverage_data.get('enterprise_readiness', 'Unknown'), '📊']
         ]
+        # Status emoji need the fallback fonts, which only Paragraph markup can switch to
+        for row in summary_data[1:]:
+            row[2] = Paragraph(markup(row[2]), styles['Normal'])
+        summary_data[4][1] = Paragraph(markup(str(summary_data[4][1])), styles['Normal'])
         
         summary_table = Table(summary_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
         summary_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 0), (-1, 0), styles.fonts['bold']),
             ('FONTSIZE', (0, 0), (-1, 0), 14),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
@@ -393,34 +399,34 @@ class StoryExporter:
     
     def _add_pdf_executive_summary(self, story, story_data, coverage_data, styles):
         """Add executive summary to PDF"""
-        story.append(Paragraph("📋 Executive Summary", styles['Heading1']))
+        story.append(Paragraph(markup("📋 Executive Summary"), styles['Heading1']))
         story.append(Spacer(1, 12))
         
         # Business Objective
         story.append(Paragraph("<b>Business Objective:</b>", styles['Heading2']))
-        story.append(Paragraph(story_data.get('business_goal', 'Not specified'), styles['Normal']))
+        story.append(Paragraph(markup(str(story_data.get('business_goal', 'Not specified'))), styles['Normal']))
         story.append(Spacer(1, 12))
         
         # Key Stakeholder
         story.append(Paragraph("<b>Key Stakeholder:</b>", styles['Heading2']))
-        story.append(Paragraph(story_data.get('actor', 'Not specified'), styles['Normal']))
+        story.append(Paragraph(markup(str(story_data.get('actor', 'Not specified'))), styles['Normal']))
         story.append(Spacer(1, 12))
         
         # Timeline
         story.append(Paragraph("<b>Estimated Timeline:</b>", styles['Heading2']))
         timeline = self._estimate_timeline(story_data)
-        story.append(Paragraph(timeline, styles['Normal']))
+        story.append(Paragraph(markup(timeline), styles['Normal']))
         story.append(Spacer(1, 12))
         
         # Key Risks
         if story_data.get('risks'):
             story.append(Paragraph("<b>Key Risks:</b>", styles['Heading2']))
             for risk in story_data['risks'][:3]:
-                story.append(Paragraph(f"• {risk}", styles['Normal']))
+                story.append(Paragraph(markup(f"• {risk}"), styles['Normal']))
     
     def _add_pdf_content(self, story, story_data, styles):
         """Add main content to PDF"""
-        story.append(Paragraph("📝 Detailed Requirements", styles['Heading1']))
+        story.append(Paragraph(markup("📝 Detailed Requirements"), styles['Heading1']))
         story.append(Spacer(1, 20))
         
         sections = [
@@ -438,14 +444,14 @@ class StoryExporter:
         
         for title, key, is_list in sections:
             if story_data.get(key):
-                story.append(Paragraph(title, styles['Heading2']))
+                story.append(Paragraph(markup(title), styles['Heading2']))
                 story.append(Spacer(1, 6))
                 
                 if is_list:
                     for item in story_data[key]:
-                        story.append(Paragraph(f"• {item}", styles['Normal']))
+                        story.append(Paragraph(markup(f"• {item}"), styles['Normal']))
                 else:
-                    story.append(Paragraph(story_data[key], styles['Normal']))
+                    story.append(Paragraph(markup(str(story_data[key])), styles['Normal']))
                 
                 story.append(Spacer(1, 12))
     
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Analysis Sessions Test
+Tests stored analyses, their LRU/database lookup and the prompt digest
+"""
+
+import json
+from datetime import datetime, timedelta
+from constants import DEFAULT_COVERAGE_ANALYSIS
+from offline_llm import offline_client
+from local_analyzer import local_coverage_analysis
+from in_memory_app import create_test_app
+from models import db, AnalysisSession
+from analysis_sessions import AnalysisSessionStore, digest_coverage_analysis
+
+BRD_REQUIREMENT = ("Finance managers need a monthly revenue report exported to Excel "
+                   "to reduce manual reconciliation effort")
+
+def test_digest_is_compact():
+    """The digest keeps elements, suggestions and gaps in a fraction of the JSON size"""
+    analysis = local_coverage_analysis('brd', BRD_REQUIREMENT)
+    digest = digest_coverage_analysis(analysis)
+    assert digest.startswith(f'Present: Business Objectives: {BRD_REQUIREMENT}; Stakeholders:')
+    assert '\nMissing: Project Name: Business Process Enhancement Project; Executive Summary:' in digest
+    assert '\nCritical gaps: Project Name; Executive Summary; Scope' in digest
+    assert 'question' not in digest and 'editable' not in digest
+    assert len(digest) < len(json.dumps(analysis, indent=2)) / 2
+
+    digest = digest_coverage_analysis(DEFAULT_COVERAGE_ANALYSIS)
+    assert 'Present: Business Goal: System improvement' in digest
+    assert 'Security: Authentication and authorization required' in digest
+    assert digest_coverage_analysis({}) == digest_coverage_analysis(None) == "None provided"
+
+def test_save_and_load():
+    """Analyses round-trip by id, through the cache and from the database"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        store = AnalysisSessionStore(capacity=2)
+        analysis_id = store.save('story', 'Users reset passwords', DEFAULT_COVERAGE_ANALYSIS)
+        assert store.save('story', 'Users reset passwords', DEFAULT_COVERAGE_ANALYSIS) == analysis_id
+        assert AnalysisSession.query.count() == 1
+
+        stored = store.get(analysis_id, 'story')
+        assert stored.analysis == DEFAULT_COVERAGE_ANALYSIS
+        assert stored.digest == digest_coverage_analysis(DEFAULT_COVERAGE_ANALYSIS)
+        assert store.get(analysis_id, 'brd') is None
+        assert store.get('unknown') is None
+
+        # Evicted from the LRU (or another worker's session): loaded from the database
+        store.save('brd', 'Requirement two', {'overall_score': 10})
+        store.save('frd', 'Requirement three', {'overall_score': 20})
+        assert analysis_id not in store._sessions
+        assert AnalysisSessionStore().get(analysis_id).analysis == DEFAULT_COVERAGE_ANALYSIS
+        db.drop_all()
+
+def test_expiry_and_purge():
+    """Expired sessions are not returned and are purged from the database"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        store = AnalysisSessionStore(ttl_hours=1)
+        old_id = store.save('story', 'Old requirement', DEFAULT_COVERAGE_ANALYSIS)
+        new_id = store.save('story', 'New requirement', DEFAULT_COVERAGE_ANALYSIS)
+        db.session.get(AnalysisSession, old_id).created_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+        store.clear()
+
+        assert store.get(old_id) is None
+        assert store.purge_expired() == 1
+        assert store.get(new_id) is not None
+        assert [row.id for row in AnalysisSession.query.all()] == [new_id]
+        db.drop_all()
+
+def test_generation_prompt_uses_digest():
+    """Generation prompts carry the digest instead of indented analysis JSON"""
+    client = offline_client()
+    digest = digest_coverage_analysis(DEFAULT_COVERAGE_ANALYSIS)
+    from_digest = client._build_generation_messages('story', 'Users reset passwords', {}, digest)[1]['content']
+    from_json = client._build_generation_messages('story', 'Users reset passwords', {},
+                                                  DEFAULT_COVERAGE_ANALYSIS)[1]['content']
+    assert digest in from_digest and '"present_elements"' not in from_digest
+    assert '"present_elements":[' in from_json
+    assert len(from_digest) < len(from_json)
+
+def main():
+    """Run analysis session tests"""
+    print("🗂️ ANALYSIS SESSIONS TEST SUITE")
+    print("=" * 40)
+    for test in (test_digest_is_compact, test_save_and_load, test_expiry_and_purge,
+                 test_generation_prompt_uses_digest):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL ANALYSIS SESSION TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
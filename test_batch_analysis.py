@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Test
+Tests backlog parsing, bounded fan-out and resumable NDJSON streaming
+"""
+
+import json
+import threading
+import time
+from batch_analysis import BatchConflict, parse_batch_rows, detect_format, make_batch_id, stream_batch, batch_progress
+
+def _lines(stream):
+    return [json.loads(line) for line in stream]
+
+def test_parse_csv_and_jsonl():
+    """CSV with or without headers and JSONL objects or strings are accepted"""
+    csv_content = 'id,requirement\nREQ-1,Users can log in\nREQ-2,"Admins export, filter reports"\n'
+    assert parse_batch_rows(csv_content, 'csv') == [('REQ-1', 'Users can log in'), ('REQ-2', 'Admins export, filter reports')]
+    assert parse_batch_rows('Users can log in\nAdmins export reports\n', 'csv')[1] == ('2', 'Admins export reports')
+
+    jsonl_content = '{"id": "A", "requirement": "Reset password"}\n\n"Track orders"\n'
+    assert parse_batch_rows(jsonl_content, 'jsonl') == [('A', 'Reset password'), ('3', 'Track orders')]
+    assert detect_format('backlog.csv') == 'csv'
+    assert detect_format(content='{"requirement": "x"}') == 'jsonl'
+
+def test_bounded_concurrency_and_streaming():
+    """Rows stream back as they finish without exceeding the concurrency limit"""
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    def analyze(requirement):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(0.02)
+        with lock:
+            active['now'] -= 1
+        if requirement == 'fail':
+            raise RuntimeError('LLM unavailable')
+        return {'overall_score': len(requirement)}
+
+    rows = [(str(i), f"Requirement {i}") for i in range(12)] + [('bad', 'fail')]
+    lines = _lines(stream_batch('test-bounded', rows, analyze, concurrency=3))
+
+    assert lines[0]['event'] == 'start' and lines[0]['total'] == 13
+    assert lines[-1] == {'event': 'complete', 'batch_id': 'test-bounded', 'total': 13, 'succeeded': 12, 'failed': 1}
+    assert active['peak'] <= 3
+    assert sorted(line['row'] for line in lines[1:-1]) == list(range(13))
+
+def test_resume_after_disconnect():
+    """A dropped stream keeps working and a resume only runs what is left"""
+    calls = []
+
+    def analyze(requirement):
+        calls.append(requirement)
+        time.sleep(0.01)
+        return {'requirement': requirement}
+
+    rows = [(str(i), f"Requirement {i}") for i in range(8)]
+    batch_id = make_batch_id('story', 'resume-test')
+
+    stream = stream_batch(batch_id, rows, analyze, concurrency=2, owner='alice')
+    next(stream)
+    next(stream)
+    stream.close()
+
+    deadline = time.time() + 5
+    while batch_progress(batch_id, 'alice')['in_flight'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert batch_progress(batch_id, 'alice') == {'batch_id': batch_id, 'completed': 8, 'in_flight': 0}
+
+    lines = _lines(stream_batch(batch_id, rows, analyze, concurrency=2, owner='alice'))
+    assert lines[0]['pending'] == 0
+    assert all(line.get('resumed') for line in lines[1:-1])
+    assert len(calls) == 8
+
+def test_batches_are_scoped():
+    """Other sessions cannot see a batch, and its id cannot be reused for different rows"""
+    rows = [('1', 'Users can log in')]
+    _lines(stream_batch('shared-id', rows, lambda requirement: {'ok': True}, owner='alice'))
+    assert batch_progress('shared-id', 'bob') is None
+    assert batch_progress('shared-id', 'alice')['completed'] == 1
+
+    try:
+        stream_batch('shared-id', [('1', 'Admins export reports')], lambda requirement: {'ok': True}, owner='alice')
+    except BatchConflict:
+        pass
+    else:
+        raise AssertionError("Reused a batch id for a different backlog")
+    lines = _lines(stream_batch('shared-id', [('1', 'Admins export reports')], lambda requirement: {'ok': True},
+                                owner='bob'))
+    assert lines[0]['completed'] == 0 and lines[-1]['succeeded'] == 1
+
+def main():
+    """Run batch analysis tests"""
+    print("📥 BATCH ANALYSIS TEST SUITE")
+    print("=" * 40)
+    for test in (test_parse_csv_and_jsonl, test_bounded_concurrency_and_streaming, test_resume_after_disconnect,
+                 test_batches_are_scoped):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL BATCH ANALYSIS TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
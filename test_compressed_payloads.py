@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compressed Payload Test
+Tests the compressed JSON column type and the legacy row migration
+"""
+
+import json
+from sqlalchemy import text
+from in_memory_app import create_test_app
+from models import db, Story
+from compressed_json import compress_payload, decompress_payload, is_compressed
+from document_history import get_or_create_user, record_document, get_document
+from migrate_compress_payloads import migrate_payloads
+
+SAMPLE_BRD = {
+    "project_name": "Customer Onboarding Modernisation",
+    "executive_summary": {
+        "background": "Onboarding is handled through paper forms and email follow-ups.",
+        "problem_statement": "Average onboarding takes 9 days and 18% of applications are abandoned.",
+        "business_need": "Reduce onboarding time and abandonment to stay competitive.",
+        "solution": "Digital onboarding portal with e-KYC and automated approvals.",
+        "benefits": ["Faster onboarding", "Lower abandonment", "Audit-ready records"]
+    },
+    "business_objectives": [
+        {"objective": "Reduce onboarding time to 2 days", "kpi": "Median onboarding duration"},
+        {"objective": "Cut abandonment below 5%", "kpi": "Abandonment rate"}
+    ],
+    "stakeholders": [
+        {"name": "Head of Operations", "role": "Owner", "department": "Operations", "responsibilities": "Decision making and approval"},
+        {"name": "Compliance Lead", "role": "Reviewer", "department": "Compliance", "responsibilities": "KYC policy sign-off"}
+    ],
+    "business_requirements": [
+        {"br_id": f"BR-{i:03d}", "title": f"Requirement {i}", "description": "The system shall capture and validate customer identity documents.",
+         "priority": "High", "source": "Business", "acceptance_criteria": "Documents are validated within 30 seconds"}
+        for i in range(1, 21)
+    ],
+    "risks": [
+        {"risk_id": "R-001", "description": "e-KYC provider outage", "impact": "High", "likelihood": "Medium", "mitigation": "Fallback to manual review queue"}
+    ]
+}
+
+def test_roundtrip_and_ratio():
+    """Payloads round-trip exactly and shrink several-fold"""
+    compressed = compress_payload(SAMPLE_BRD)
+    original_size = len(json.dumps(SAMPLE_BRD, indent=2).encode('utf-8'))
+    print(f"  📦 {original_size} bytes -> {len(compressed)} bytes")
+
+    assert is_compressed(compressed)
+    assert decompress_payload(compressed) == SAMPLE_BRD
+    assert original_size / len(compressed) >= 4
+
+def test_legacy_values():
+    """Plain-text rows written before compression still decode"""
+    assert decompress_payload('Build a login page', legacy_text=True) == 'Build a login page'
+    assert decompress_payload('{"a": 1}') == {'a': 1}
+    assert decompress_payload(b'{"a": 1}') == {'a': 1}
+    assert decompress_payload(None) is None
+
+def test_model_roundtrip_is_deferred():
+    """Payload columns decode transparently and only load on access"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-1')
+        story_id = record_document(user, 'brd', 'Onboard customers digitally', {'overall_score': 40}, SAMPLE_BRD).id
+        db.session.expire_all()
+
+        story = db.session.get(Story, story_id)
+        assert 'user_stories' not in story.__dict__
+        assert story.user_stories == SAMPLE_BRD
+        assert story.requirements == 'Onboard customers digitally'
+
+        story = get_document(user.id, story_id)
+        assert story.to_dict()['analysis'] == {'overall_score': 40}
+
+def test_migration_of_legacy_rows():
+    """The migration compresses text rows in place and is idempotent"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-2')
+        db.session.execute(text(
+            "INSERT INTO story (user_id, document_type, title, requirements, analysis, user_stories, status, created_at, updated_at) "
+            "VALUES (:user_id, 'brd', 'Legacy', 'Legacy requirement', :analysis, :document, 'draft', '2024-01-01', '2024-01-01')"
+        ), {'user_id': user.id, 'analysis': json.dumps({'overall_score': 10}), 'document': json.dumps(SAMPLE_BRD)})
+        db.session.commit()
+
+        assert migrate_payloads() == 1
+        assert migrate_payloads() == 0
+
+        raw = db.session.execute(text("SELECT requirements, user_stories FROM story")).one()
+        assert is_compressed(raw.requirements) and is_compressed(raw.user_stories)
+
+        story = Story.query.one()
+        assert story.requirements == 'Legacy requirement'
+        assert story.user_stories == SAMPLE_BRD
+
+def main():
+    """Run compressed payload tests"""
+    print("📦 COMPRESSED PAYLOAD TEST SUITE")
+    print("=" * 40)
+    for test in (test_roundtrip_and_ratio, test_legacy_values,
+                 test_model_roundtrip_is_deferred, test_migration_of_legacy_rows):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL COMPRESSION TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
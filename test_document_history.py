@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Document History Test
+Tests history recording and keyset pagination against an in-memory database
+"""
+
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import inspect, text
+from in_memory_app import create_test_app
+from models import db, User, Story
+from document_history import get_or_create_user, record_document, list_documents, decode_cursor
+from migrate_history_schema import migrate_schema
+
+def _seed(user, count):
+    """Insert count documents with distinct timestamps"""
+    base = datetime(2024, 1, 1)
+    db.session.bulk_save_objects([
+        Story(
+            user_id=user.id,
+            document_type='brd' if i % 2 else 'story',
+            title=f"Document {i}",
+            requirements='x' * 2000,
+            user_stories={},
+            status='draft' if i % 3 else 'generated',
+            created_at=base + timedelta(minutes=i // 2),
+            updated_at=base
+        )
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def test_record_document():
+    """Generated documents are stored with a derived title"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-1')
+        story = record_document(user, 'brd', 'Build a login page', {'requirement_category': 'Security'},
+                                {'project_name': 'Login Revamp'})
+        
+        assert story.id is not None
+        assert story.title == 'Login Revamp'
+        assert story.domain == 'Security'
+        assert get_or_create_user('session-1').id == user.id
+
+def test_keyset_pagination():
+    """Pages are newest first, never overlap and skip payload columns"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-2')
+        other = get_or_create_user('session-3')
+        _seed(user, 250)
+        _seed(other, 10)
+
+        seen = []
+        cursor = None
+        while True:
+            documents, cursor = list_documents(user.id, limit=40, cursor=cursor)
+            seen.extend(documents)
+            if not cursor:
+                break
+
+        assert len(seen) == 250
+        assert len({doc['id'] for doc in seen}) == 250
+        keys = [(doc['created_at'], doc['id']) for doc in seen]
+        assert keys == sorted(keys, reverse=True)
+        assert 'requirements' not in seen[0]
+
+def test_filters_and_cursor_validation():
+    """Status filters apply and malformed cursors are rejected"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-4')
+        _seed(user, 30)
+
+        documents, _ = list_documents(user.id, limit=100, status='generated')
+        assert documents and all(doc['status'] == 'generated' for doc in documents)
+
+        try:
+            decode_cursor('not-a-cursor')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Invalid cursor was accepted')
+
+def test_listing_speed():
+    """Listing a page out of thousands of documents stays in the millisecond range"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_user('session-5')
+        _seed(user, 5000)
+
+        _, cursor = list_documents(user.id, limit=50)
+        start = time.perf_counter()
+        for _ in range(20):
+            list_documents(user.id, limit=50, cursor=cursor)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 20
+        print(f"  ⏱️  Average page time: {elapsed_ms:.2f} ms")
+        assert elapsed_ms < 50
+
+def test_schema_migration_of_legacy_database():
+    """A story table from before document history gains document_type and its indexes"""
+    app = create_test_app()
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE user (id INTEGER PRIMARY KEY, session_id VARCHAR(36) NOT NULL UNIQUE, "
+                              "created_at DATETIME)"))
+            conn.execute(text("CREATE TABLE story (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES user(id), "
+                              "title VARCHAR(200) NOT NULL, requirements TEXT NOT NULL, analysis TEXT, "
+                              "user_stories TEXT, domain VARCHAR(100), status VARCHAR(20), created_at DATETIME, "
+                              "updated_at DATETIME)"))
+            conn.execute(text("INSERT INTO user (id, session_id) VALUES (1, 'legacy-session')"))
+            conn.execute(text("INSERT INTO story (user_id, title, requirements, created_at, updated_at) "
+                              "VALUES (1, 'Old story', 'Users can log in', '2023-05-01', '2023-05-01')"))
+
+        assert migrate_schema() == ['added column story.document_type', 'created index ix_story_user_created',
+                                    'created index ix_story_user_status']
+        assert migrate_schema() == []
+        assert {'ix_story_user_created', 'ix_story_user_status'} <= {
+            index['name'] for index in inspect(db.engine).get_indexes('story')}
+
+        user = get_or_create_user('legacy-session')
+        record_document(user, 'brd', 'Finance exports reports', None, {'title': 'Exports'})
+        documents, _ = list_documents(user.id)
+        assert sorted(document['document_type'] for document in documents) == ['brd', 'story']
+
+def main():
+    """Run document history tests"""
+    print("📚 DOCUMENT HISTORY TEST SUITE")
+    print("=" * 40)
+    for test in (test_record_document, test_keyset_pagination,
+                 test_filters_and_cursor_validation, test_listing_speed, test_schema_migration_of_legacy_database):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL HISTORY TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Document Pack Test
+Tests pack validation, the combined analysis split and concurrent generation
+"""
+
+import io
+import json
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from bulk_export import stream_bulk_export
+from constants import DEFAULT_STORY_DATA
+from document_pack import (pack_answers, pack_export_jobs, parse_pack_request, split_pack_analysis,
+                           stream_pack)
+from llm_client import GroqClient
+from llm_providers import FixtureProvider
+from offline_llm import offline_client
+
+REQUIREMENT = "As a customer I want to reset my password via email"
+DELAYS = {'story': 0.3, 'brd': 0.2, 'frd': 0.1, 'srd': 0.25}
+
+PACK_PROMPT = 'several document types'
+
+class BudgetRecordingProvider(FixtureProvider):
+    """Fixture completions that also record each request's token budget"""
+
+    def __init__(self, fixtures, default_response):
+        super().__init__(fixtures, path=None, default_response=default_response)
+        self.budgets = []
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        self.budgets.append(max_tokens)
+        return super()._complete(messages, model, temperature, max_tokens)
+
+def _analyze():
+    return {document_type: {'coverage_analysis': {'missing_elements': []}, 'analysis_id': f'id-{document_type}'}
+            for document_type in DELAYS}
+
+def _generate(document_type, result):
+    time.sleep(DELAYS[document_type])
+    return dict(DEFAULT_STORY_DATA, business_goal=f'{document_type} for {result["analysis_id"]}')
+
+def test_parse_pack_request():
+    """Defaults to the four main documents; invalid types and formats are rejected"""
+    requirement, document_types, answers, formats = parse_pack_request({'requirement': f'  {REQUIREMENT} '})
+    assert (requirement, document_types, answers, formats) == (REQUIREMENT, ['story', 'brd', 'frd', 'srd'], {}, [])
+    assert parse_pack_request({'requirement': 'x', 'document_types': ['cr', 'cr', 'brd']})[1] == ['cr', 'brd']
+    for payload in ({}, {'requirement': 'x', 'document_types': ['memo']}, {'requirement': 'x', 'formats': ['rtf']},
+                    {'requirement': 'x', 'answers': ['Security']}):
+        try:
+            parse_pack_request(payload)
+        except ValueError:
+            continue
+        raise AssertionError(f"Accepted invalid pack request {payload}")
+
+def test_combined_analysis_split():
+    """Each type takes its part of the combined analysis, or the local analysis if it has none"""
+    client = offline_client([(PACK_PROMPT, {'story': {'coverage_analysis': {'present_elements': [],
+                                                                            'missing_elements': []}}})])
+    combined = client.analyze_pack_coverage(REQUIREMENT, ['story', 'cr'])
+    prompt = ' '.join(message['content'] for message in client.provider.calls[-1])
+    assert 'story: User Story - Business Goal, Actor' in prompt and 'cr: Change Request - change_request_id' in prompt
+    assert REQUIREMENT in prompt
+
+    analyses = split_pack_analysis(combined, ['story', 'cr'], REQUIREMENT)
+    assert analyses['story'] == combined['story']
+    assert analyses['cr']['analysis_source'] == 'local'
+    assert split_pack_analysis(None, ['brd'], REQUIREMENT)['brd']['analysis_source'] == 'local'
+
+    suggested = {'coverage_analysis': {'missing_elements': [{'element': 'Security', 'suggested_content': 'SSO'},
+                                                            {'element': 'Risks', 'suggested_content': 'Lockouts'}]}}
+    assert pack_answers(suggested, {'Security': 'MFA'}) == {'Security': 'MFA', 'Risks': 'Lockouts'}
+
+def test_truncated_pack_analysis_is_split():
+    """The pack call gets its own token budget; a cut-off reply falls back to one analysis per type"""
+    analysis = {'coverage_analysis': {'present_elements': [], 'missing_elements': []}, 'overall_score': 42}
+    provider = BudgetRecordingProvider([(PACK_PROMPT, '{"story": {"coverage_analysis": {"present_elements": [{"ele')],
+                                       json.dumps(analysis))
+    client = offline_client(provider=provider)
+    combined = client.analyze_pack_coverage(REQUIREMENT, ['story', 'brd', 'cr'])
+    assert provider.budgets == [GroqClient.PACK_MAX_TOKENS] + [client.max_tokens] * 3
+    assert {document_type: analysis['overall_score'] for document_type, analysis in combined.items()} == {
+        'story': 42, 'brd': 42, 'cr': 42}
+    assert all('analysis_source' not in analysis
+               for analysis in split_pack_analysis(combined, ['story', 'brd', 'cr'], REQUIREMENT).values())
+
+def test_pack_takes_as_long_as_the_slowest_document():
+    """Documents are generated concurrently and streamed as each one finishes"""
+    recorded = []
+    started = time.perf_counter()
+    events = [json.loads(line) for line in stream_pack(
+        list(DELAYS), _analyze, _generate, lambda document_type, result, document: recorded.append(document_type),
+        ThreadPoolExecutor(max_workers=4)
+    )]
+    elapsed = time.perf_counter() - started
+
+    assert max(DELAYS.values()) <= elapsed < sum(DELAYS.values()) * 0.6
+    assert [event['event'] for event in events] == ['start'] + ['analysis'] * 4 + ['document'] * 4 + ['done']
+    assert [event['document_type'] for event in events[5:9]] == ['frd', 'brd', 'srd', 'story']
+    assert events[5]['document']['business_goal'] == 'frd for id-frd' and events[5]['analysis_id'] == 'id-frd'
+    assert recorded == ['frd', 'brd', 'srd', 'story']
+    assert events[-1]['generated'] == 4 and events[-1]['failed'] == 0
+
+def test_pack_streams_into_exports():
+    """With formats, finished documents are rendered into one ZIP"""
+    executor = ThreadPoolExecutor(max_workers=4)
+    jobs = pack_export_jobs(['story', 'frd'], ['markdown', 'json'], _analyze, _generate, executor=executor)
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_bulk_export(jobs, executor=executor))))
+    assert sorted(archive.namelist()) == ['01_user_story.json', '01_user_story.md',
+                                          '02_functional_requirements_document.json',
+                                          '02_functional_requirements_document.md', 'manifest.json']
+    assert all(entry['status'] == 'ok' for entry in json.loads(archive.read('manifest.json')))
+
+def test_failed_documents_are_reported():
+    """A document whose generation fails gets an error event and manifest entry, not the default document"""
+    failing = offline_client()
+
+    def generate(document_type, result):
+        if document_type == 'brd':
+            return failing.try_generate_document('brd', REQUIREMENT, {}, None)
+        return _generate(document_type, result)
+
+    recorded = []
+    events = [json.loads(line) for line in stream_pack(
+        ['story', 'brd'], _analyze, generate, lambda document_type, result, document: recorded.append(document_type),
+        ThreadPoolExecutor(max_workers=2)
+    )]
+    assert {event['document_type']: event['event'] for event in events[3:5]} == {'story': 'document', 'brd': 'error'}
+    assert recorded == ['story']
+    assert events[-1]['generated'] == 1 and events[-1]['failed'] == 1
+    assert len(failing.provider.calls) == 1
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    jobs = pack_export_jobs(['story', 'brd'], ['markdown'], _analyze, generate, executor=executor)
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_bulk_export(jobs, executor=executor))))
+    assert sorted(archive.namelist()) == ['01_user_story.md', 'manifest.json']
+    manifest = {entry['entry']: entry for entry in json.loads(archive.read('manifest.json'))}
+    assert manifest['02_business_requirements_document.md'] == {
+        'entry': '02_business_requirements_document.md', 'status': 'error', 'error': 'Generation failed'}
+
+def main():
+    """Run document pack tests"""
+    print("📦 DOCUMENT PACK TEST SUITE")
+    print("=" * 40)
+    for test in (test_parse_pack_request, test_combined_analysis_split, test_truncated_pack_analysis_is_split,
+                 test_pack_takes_as_long_as_the_slowest_document, test_pack_streams_into_exports,
+                 test_failed_documents_are_reported):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL DOCUMENT PACK TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
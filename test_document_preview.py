@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Document Preview Test
+Tests page layout, lazy PNG/SVG thumbnails and the document-hash preview cache
+"""
+
+import io
+import json
+import time
+from PIL import Image
+from constants import DEFAULT_COVERAGE_ANALYSIS, DEFAULT_STORY_DATA
+from offline_llm import offline_client
+from document_preview import (PreviewCache, PAGE_HEIGHT, MARGIN, document_hash, paginate,
+                              stream_preview, thumbnail_width, wrap_text)
+
+def _large_brd(rows):
+    brd = offline_client()._get_default_brd_data()
+    brd['business_requirements'] = [
+        {'br_id': f'BR-{i:04d}', 'title': 'Auto triage', 'description': 'Route claims and flag fraud for review',
+         'priority': 'High', 'source': 'Business', 'acceptance_criteria': 'Criteria'}
+        for i in range(rows)
+    ]
+    return brd
+
+def _texts(page):
+    return [item[3] for item in page if item[0] == 'text']
+
+def test_wrap_text():
+    """Lines fit the width and over-long words are broken"""
+    lines = wrap_text('alpha beta gamma delta ' * 10 + 'x' * 200, 200, 10)
+    assert len(lines) > 3
+    assert all(line for line in lines)
+    assert ''.join(lines).endswith('x' * 20)
+
+def test_paginate_story():
+    """Cover page, dashboard and sections flow onto pages inside the margins"""
+    pages = paginate('story', DEFAULT_STORY_DATA, DEFAULT_COVERAGE_ANALYSIS)
+    assert 'AGILE USER STORY DOCUMENT' in _texts(pages[0])
+    assert 'Coverage Score' in _texts(pages[1])
+    for page in pages:
+        assert page
+        assert all(item[2] <= PAGE_HEIGHT - MARGIN + 1 for item in page if item[0] == 'text')
+
+def test_large_table_repeats_header():
+    """A long requirements table spans pages with its header on each one"""
+    pages = paginate('brd', _large_brd(300), DEFAULT_COVERAGE_ANALYSIS)
+    table_pages = [page for page in pages if 'BR-0150' in _texts(page) or 'BR-0299' in _texts(page)]
+    assert len(pages) > 10 and len(table_pages) >= 2
+    assert all('BR ID' in _texts(page) for page in table_pages)
+
+def test_thumbnails_are_lazy_and_cached():
+    """Pages render on first request only, as PNG or SVG at a snapped width"""
+    cache = PreviewCache(capacity=2)
+    preview, cached = cache.get_or_create('brd', _large_brd(500), DEFAULT_COVERAGE_ANALYSIS)
+    assert not cached and preview.page_count > 10
+    assert not preview._thumbnails
+
+    started = time.perf_counter()
+    png = preview.thumbnail(7, 'png', 365)
+    assert time.perf_counter() - started < 2.0
+    assert len(preview._thumbnails) == 1
+    assert preview.thumbnail(7, 'png', 365) is png
+    assert Image.open(io.BytesIO(png)).size[0] == thumbnail_width(365) == 360
+
+    svg = preview.thumbnail(7, 'svg').decode('utf-8')
+    assert svg.startswith('<svg') and 'BR ID' in svg
+
+    try:
+        preview.thumbnail(preview.page_count + 1)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("Out of range page rendered")
+
+def test_cache_keyed_by_document_hash():
+    """Identical documents share a preview; the least recently used is evicted"""
+    cache = PreviewCache(capacity=2)
+    first, _ = cache.get_or_create('story', DEFAULT_STORY_DATA)
+    again, cached = cache.get_or_create('story', dict(DEFAULT_STORY_DATA))
+    assert cached and again is first
+    assert first.preview_id == document_hash('story', DEFAULT_STORY_DATA)
+
+    cache.get_or_create('story', {**DEFAULT_STORY_DATA, 'actor': 'Auditor'})
+    cache.get_or_create('story', {**DEFAULT_STORY_DATA, 'actor': 'Reviewer'})
+    assert cache.get(first.preview_id) is None
+
+def test_stream_preview():
+    """The stream sends the manifest first, then one data URL per page"""
+    preview, _ = PreviewCache().get_or_create('cr', offline_client()._get_default_cr_data())
+    lines = [json.loads(line) for line in stream_preview(preview, 'svg', 240)]
+    assert lines[0]['type'] == 'manifest' and lines[0]['page_count'] == preview.page_count
+    assert lines[0]['pages'][0] == f'/preview/{preview.preview_id}/1.svg?width=240'
+    assert [line['page'] for line in lines[1:]] == list(range(1, preview.page_count + 1))
+    assert lines[1]['data_url'].startswith('data:image/svg+xml;base64,')
+
+def main():
+    """Run document preview tests"""
+    print("🖼️ DOCUMENT PREVIEW TEST SUITE")
+    print("=" * 40)
+    for test in (test_wrap_text, test_paginate_story, test_large_table_repeats_header,
+                 test_thumbnails_are_lazy_and_cached, test_cache_keyed_by_document_hash, test_stream_preview):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL DOCUMENT PREVIEW TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Document Specs Test
+Tests the declarative section specs and the Word/PDF backends that render them
+"""
+
+import base64
+import io
+import os
+from docx import Document
+from PIL import Image
+from constants import DEFAULT_COVERAGE_ANALYSIS, DEFAULT_STORY_DATA
+from offline_llm import offline_client
+from document_specs import DOCUMENT_SPECS, Field, layout_document, layout_sections, resolve_field
+from story_exporter_enhanced import EnhancedStoryExporter
+
+def _sample_documents():
+    client = offline_client()
+    return {
+        'story': DEFAULT_STORY_DATA,
+        'brd': client._get_default_brd_data(),
+        'frd': client._get_default_frd_data(),
+        'srd': client._get_default_srd_data(),
+        'cr': client._get_default_cr_data()
+    }
+
+def _png_data_url():
+    buffer = io.BytesIO()
+    Image.new('RGB', (40, 20), (30, 64, 175)).save(buffer, format='PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def test_resolve_field():
+    """Fields follow nested paths, fall back to defaults and truncate"""
+    data = {'system_overview': {'architecture': 'Microservices on Kubernetes'}}
+    assert resolve_field(data, Field(('system_overview', 'architecture'), max_length=13)) == 'Microservices'
+    assert resolve_field(data, Field('business_goal', 'Primary Feature')) == 'Primary Feature'
+    assert resolve_field(data, Field(('scope', 'in_scope'))) is None
+
+def test_layout_brd():
+    """BRD sections flatten to headings, labelled fields, bullets and tables"""
+    brd = _sample_documents()['brd']
+    ops = layout_sections(DOCUMENT_SPECS['brd'], brd)
+    headings = [op[1] for op in ops if op[0] == 'heading' and op[2] == 1]
+    assert headings == ['EXECUTIVE SUMMARY', 'BUSINESS OBJECTIVES', 'PROJECT SCOPE', 'STAKEHOLDER LIST',
+                        'BUSINESS REQUIREMENTS', 'RISKS & MITIGATION', 'APPROVAL SECTION']
+    assert ('labelled', 'Background', 'Project background to be defined') in ops
+    assert ('indented', 'KPI: KPI 1') in ops
+    assert ('heading', 'Out-of-Scope', 2) in ops
+    tables = [op for op in ops if op[0] == 'table']
+    assert tables[1][1][0] == 'BR ID' and tables[1][2] == [['BR-001', 'Requirement 1', 'Description',
+                                                            'High', 'Business', 'Criteria']]
+    assert ('images', 'business-objectives') in ops
+
+def test_layout_skips_missing_sections():
+    """Absent sections are skipped and prose in a structured slot still renders"""
+    ops = layout_sections(DOCUMENT_SPECS['frd'], {'data_requirements': 'Customer records only'})
+    assert ops[:2] == [('heading', 'DATA REQUIREMENTS', 1), ('paragraph', 'Customer records only')]
+    assert not any(op[0] == 'heading' and op[1] == 'SYSTEM OVERVIEW' for op in ops)
+
+def test_layout_dashboard_and_control():
+    """Document control and the coverage dashboard precede the content"""
+    ops = layout_document(DOCUMENT_SPECS['srd'], {}, DEFAULT_COVERAGE_ANALYSIS)
+    assert ops[0] == ('heading', 'DOCUMENT CONTROL', 1)
+    assert ops[1][1][1] == ('Document ID', 'SRD-001')
+    dashboard = next(op for op in ops if op[0] == 'dashboard')
+    assert dashboard[1] == 'SRD COVERAGE ANALYSIS' and dashboard[4][0][0] == 'Coverage Score'
+    assert [op[0] for op in ops].count('page_break') == 2
+
+def test_word_and_pdf_exports():
+    """Every document type renders to a readable DOCX and a PDF"""
+    exporter = EnhancedStoryExporter()
+    section_images = {'functional_flow': [{'data': _png_data_url(), 'caption': 'Flow diagram'}]}
+    for document_type, data in _sample_documents().items():
+        word_path = exporter.export_document(document_type, data, 'word', DEFAULT_COVERAGE_ANALYSIS, section_images)
+        pdf_path = exporter.export_document(document_type, data, 'pdf', DEFAULT_COVERAGE_ANALYSIS, section_images)
+        try:
+            text = '\n'.join(p.text for p in Document(word_path).paragraphs)
+            assert DOCUMENT_SPECS[document_type]['cover_title'] in text
+            with open(pdf_path, 'rb') as f:
+                assert f.read(4) == b'%PDF'
+            if document_type == 'story':
+                assert len(Document(word_path).inline_shapes) >= 1
+        finally:
+            os.remove(word_path)
+            os.remove(pdf_path)
+
+def test_layout_cr():
+    """All 15 CR sections are laid out, prose and tables alike"""
+    cr = _sample_documents()['cr']
+    ops = layout_sections(DOCUMENT_SPECS['cr'], cr)
+    headings = [op[1] for op in ops if op[0] == 'heading' and op[2] == 1]
+    assert len(headings) == 15
+    assert ('paragraph', 'Business justification to be defined') in ops
+    assert ('labelled', 'Rollback Steps', 'Step 1: Stop services, Step 2: Restore backup, Step 3: Verify system') in ops
+    assert any(op[0] == 'table' and op[1][0] == 'Stakeholder Group' for op in ops)
+
+def test_templates_are_cached():
+    """The Word base template is built once per exporter and document type"""
+    exporter = EnhancedStoryExporter()
+    cr = _sample_documents()['cr']
+    paths = [exporter.export_cr(cr, 'word') for _ in range(2)]
+    paths.extend(exporter.export_cr(cr, 'pdf') for _ in range(2))
+    try:
+        assert list(exporter._word_templates) == ['Change_Request_Document']
+        header = Document(paths[1]).sections[0].header.paragraphs[0].text
+        assert 'Change Request Document' in header
+    finally:
+        for path in paths:
+            os.remove(path)
+
+def test_unknown_type_and_format():
+    """Unsupported document types and formats are rejected"""
+    exporter = EnhancedStoryExporter()
+    for args in (('memo', {}, 'word'), ('story', DEFAULT_STORY_DATA, 'png')):
+        try:
+            exporter.export_document(*args)
+        except ValueError:
+            continue
+        raise AssertionError(f"Export accepted {args[0]}/{args[2]}")
+
+def main():
+    """Run document spec tests"""
+    print("📐 DOCUMENT SPECS TEST SUITE")
+    print("=" * 40)
+    for test in (test_resolve_field, test_layout_brd, test_layout_skips_missing_sections,
+                 test_layout_dashboard_and_control, test_layout_cr, test_word_and_pdf_exports,
+                 test_templates_are_cached, test_unknown_type_and_format):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL DOCUMENT SPEC TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
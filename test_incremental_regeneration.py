@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Incremental Regeneration Test
+Tests answer diffing, field-to-section mapping and section merging
+"""
+
+import json
+from incremental_regeneration import diff_answers, sections_for_fields, plan_regeneration, merge_sections
+from offline_llm import offline_client
+
+PREVIOUS_BRD = {
+    "project_name": "Onboarding Portal",
+    "scope": {"in_scope": ["Web onboarding"], "out_of_scope": ["Branch onboarding"]},
+    "risks": [{"risk_id": "R-001", "description": "Vendor outage"}],
+    "approval_workflow": [{"step": 1, "approver_role": "Business Owner"}]
+}
+
+def test_diff_answers():
+    """Added, removed and edited answers are detected; whitespace is ignored"""
+    previous = {'Scope': 'Web only', 'Risks': 'Vendor outage', 'Assumptions': 'None'}
+    current = {'Scope': 'Web and mobile', 'Risks': ' Vendor outage ', 'Glossary': 'KYC'}
+    assert diff_answers(previous, current) == ['Scope', 'Assumptions', 'Glossary']
+
+def test_sections_for_fields():
+    """Fields map to sections, with overrides and full-regeneration fallback"""
+    assert sections_for_fields('brd', ['Scope', 'Risks'], PREVIOUS_BRD) == ['scope', 'risks']
+    assert sections_for_fields('brd', ['Approval Section'], PREVIOUS_BRD) == ['approval_workflow']
+    assert sections_for_fields('brd', ['Document Control'], PREVIOUS_BRD) == []
+    assert sections_for_fields('srd', ['Backup & Recovery'], {}) == ['backup_recovery']
+    assert sections_for_fields('brd', ['Something Unexpected'], PREVIOUS_BRD) is None
+
+def test_plan_and_merge():
+    """Only changed sections are replaced in the previous document"""
+    sections = plan_regeneration('brd', {'Scope': 'Web only'}, {'Scope': 'Web and mobile'}, PREVIOUS_BRD)
+    assert sections == ['scope']
+    assert plan_regeneration('brd', {'Scope': 'Web only'}, {'Scope': 'Web only'}, PREVIOUS_BRD) == []
+    assert plan_regeneration('brd', {}, {'Scope': 'x'}, None) is None
+
+    merged = merge_sections(PREVIOUS_BRD, {'scope': {'in_scope': ['Web', 'Mobile'], 'out_of_scope': []}})
+    assert merged['scope']['in_scope'] == ['Web', 'Mobile']
+    assert merged['risks'] == PREVIOUS_BRD['risks']
+    assert PREVIOUS_BRD['scope']['in_scope'] == ['Web onboarding']
+
+def test_generate_sections_prompt_and_result():
+    """Only the requested sections are asked for and accepted"""
+    client = offline_client(default_response=json.dumps({'scope': {'in_scope': ['Mobile']}, 'risks': []}))
+    sections = client.generate_sections('brd', 'Onboard customers', {'Scope': 'Mobile'}, None,
+                                        ['scope'], PREVIOUS_BRD)
+    assert sections == {'scope': {'in_scope': ['Mobile']}}
+    prompt = client.provider.calls[0][1]['content']
+    assert 'INCREMENTAL UPDATE' in prompt and 'Branch onboarding' in prompt
+
+    client = offline_client(default_response=json.dumps({'risks': []}))
+    assert client.generate_sections('brd', 'Onboard customers', {}, None, ['scope'], PREVIOUS_BRD) is None
+
+def main():
+    """Run incremental regeneration tests"""
+    print("♻️  INCREMENTAL REGENERATION TEST SUITE")
+    print("=" * 40)
+    for test in (test_diff_answers, test_sections_for_fields, test_plan_and_merge,
+                 test_generate_sections_prompt_and_result):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL INCREMENTAL REGENERATION TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
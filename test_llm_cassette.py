@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+LLM Cassette Test
+Tests recording completions with their timing and replaying them deterministically
+"""
+
+import gzip
+import os
+import tempfile
+import time
+from llm_cassette import Cassette, request_key
+from llm_client import GroqClient
+from llm_providers import CassetteProvider, FixtureProvider, LLMProvider, ProviderError
+
+REQUIREMENT = "As a customer I want to reset my password via email"
+MESSAGES = [{"role": "system", "content": "Return JSON"}, {"role": "user", "content": REQUIREMENT}]
+
+class FlakyProvider(LLMProvider):
+    """Answers after a fixed delay, numbering its responses; fails on requests mentioning 'fail'"""
+
+    name = 'flaky'
+
+    def __init__(self, delay=0.0):
+        super().__init__('flaky-model', 3)
+        self.delay = delay
+        self.served = 0
+
+    def _complete(self, messages, model, temperature, max_tokens):
+        time.sleep(self.delay)
+        if 'fail' in messages[-1]['content']:
+            raise RuntimeError('rate limited')
+        self.served += 1
+        return f'{{"call": {self.served}}}'
+
+def _cassette_path():
+    return os.path.join(tempfile.mkdtemp(), 'llm.jsonl.gz')
+
+def test_request_key():
+    """Keys cover messages, model and sampling settings, not dict ordering"""
+    key = request_key(MESSAGES, 'model', 0.3, 3000)
+    reordered = [{"content": message["content"], "role": message["role"]} for message in MESSAGES]
+    assert request_key(reordered, 'model', 0.3, 3000) == key
+    assert len({key, request_key(MESSAGES, 'other', 0.3, 3000), request_key(MESSAGES, 'model', 0.5, 3000),
+                request_key(MESSAGES, 'model', 0.3, 100), request_key(MESSAGES[:1], 'model', 0.3, 3000)}) == 5
+
+def test_record_then_replay():
+    """Replay returns the recorded completions and failures in order, without calling the source"""
+    path = _cassette_path()
+    source = FlakyProvider()
+    recorder = CassetteProvider(path, 'record', source)
+    assert (recorder.default_model, recorder.max_concurrency) == ('flaky-model', 3)
+    assert [recorder.complete(MESSAGES) for _ in range(2)] == ['{"call": 1}', '{"call": 2}']
+    try:
+        recorder.complete([{"role": "user", "content": "please fail"}])
+    except RuntimeError:
+        pass
+    recorder.cassette.close()
+
+    player = CassetteProvider(path, 'replay')
+    assert (player.default_model, player.max_concurrency) == ('flaky-model', 3)
+    assert [player.complete(MESSAGES) for _ in range(3)] == ['{"call": 1}', '{"call": 2}', '{"call": 1}']
+    for messages in ([{"role": "user", "content": "please fail"}], [{"role": "user", "content": "never recorded"}]):
+        try:
+            player.complete(messages)
+        except ProviderError:
+            continue
+        raise AssertionError(f"Replayed {messages}")
+    assert source.served == 2
+    stats = player.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (4, 1, 3)
+
+def test_paced_replay():
+    """With pacing, replay waits the recorded time scaled by the pacing factor"""
+    path = _cassette_path()
+    recorder = CassetteProvider(path, 'record', FlakyProvider(delay=0.1))
+    recorder.complete(MESSAGES)
+    recorder.cassette.close()
+    recorded = Cassette(path).replay(request_key(MESSAGES, 'flaky-model', 0.3, 3000))['seconds']
+    assert recorded >= 0.1
+
+    for pacing, expected in ((0, []), (0.5, [recorded * 0.5])):
+        waits = []
+        player = CassetteProvider(path, 'replay', pacing=pacing, sleep=waits.append)
+        assert player.complete(MESSAGES) == '{"call": 1}'
+        assert waits == expected
+
+def test_unclosed_recording_is_readable():
+    """Every completion flushed before a recording stopped can be replayed"""
+    path = _cassette_path()
+    recorder = CassetteProvider(path, 'record', FlakyProvider())
+    recorder.complete(MESSAGES)
+    with open(path, 'rb') as handle:
+        truncated = handle.read()
+    recorder.cassette.close()
+    with open(path, 'wb') as handle:
+        handle.write(truncated)
+    assert Cassette(path).replay(request_key(MESSAGES, 'flaky-model', 0.3, 3000))['response'] == '{"call": 1}'
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        assert '"version":1' in handle.readline()
+
+def test_groq_client_replay():
+    """A GroqClient on a replaying cassette produces the recorded analysis"""
+    path = _cassette_path()
+    analysis = {'coverage_analysis': {'present_elements': [], 'missing_elements': []}, 'overall_score': 70}
+    recording = GroqClient(CassetteProvider(path, 'record', FixtureProvider([(REQUIREMENT, analysis)])))
+    recording.debug_mode = False
+    assert recording.analyze_requirement_coverage(REQUIREMENT)['overall_score'] == 70
+    recording.provider.cassette.close()
+
+    replaying = GroqClient(CassetteProvider(path, 'replay'))
+    replaying.debug_mode = False
+    assert replaying.model == 'fixture'
+    assert replaying.analyze_requirement_coverage(REQUIREMENT)['overall_score'] == 70
+    assert replaying.analyze_requirement_coverage("Something else entirely")['analysis_source'] == 'local'
+
+def main():
+    """Run LLM cassette tests"""
+    print("📼 LLM CASSETTE TEST SUITE")
+    print("=" * 40)
+    for test in (test_request_key, test_record_then_replay, test_paced_replay, test_unclosed_recording_is_readable,
+                 test_groq_client_replay):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL LLM CASSETTE TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Local Analyzer Test
+Tests the keyword automaton, local coverage analysis and the LLM fallback
+"""
+
+from brd_field_questions import BRD_REQUIRED_FIELDS
+from cr_field_questions import CR_REQUIRED_FIELDS
+from field_questions import REQUIRED_FIELDS, get_field_question
+from local_analyzer import DOCUMENT_FIELDS, FIELD_TERMS, KeywordAutomaton, local_coverage_analysis
+from offline_llm import offline_client
+from speculation import suggested_answers
+
+REQUIREMENT = ("As a customer I want to reset my password via email when I forget it, so that I can log in again. "
+               "Reset links expire after 30 minutes.")
+
+def _elements(analysis, kind):
+    return [element['element'] for element in analysis['coverage_analysis'][kind]]
+
+def test_automaton_finds_overlapping_terms():
+    """Every occurrence is reported in one pass, including terms inside other terms"""
+    automaton = KeywordAutomaton((term, term) for term in ('he', 'she', 'his', 'hers'))
+    assert sorted(automaton.finditer('ushers')) == [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers')]
+    assert list(automaton.finditer('xyz')) == []
+
+def test_story_coverage():
+    """Fields the requirement mentions are present, the rest missing with their questions"""
+    analysis = local_coverage_analysis('story', REQUIREMENT)
+    assert _elements(analysis, 'present_elements') == ['Business Goal', 'Actor', 'Trigger', 'Security', 'Dependencies']
+    assert _elements(analysis, 'missing_elements') == analysis['critical_gaps']
+    assert analysis['coverage_analysis']['overall_score'] == 50
+    assert analysis['analysis_source'] == 'local'
+
+    actor = analysis['coverage_analysis']['present_elements'][1]
+    assert actor['details'] == 'Mentions as a, customer'
+    assert actor['content'].startswith('As a customer') and actor['content'].endswith('log in again')
+
+    recommendation = analysis['coverage_analysis']['editable_recommendations'][0]
+    assert recommendation['question'] == get_field_question('Preconditions')
+    assert list(suggested_answers(analysis)) == analysis['critical_gaps']
+
+def test_whole_words_and_stems():
+    """Plain terms match whole words only; starred terms match any word with the stem"""
+    login = local_coverage_analysis('srd', 'Users see their login history')
+    assert 'Monitoring & Logging' not in _elements(login, 'present_elements')
+    audited = local_coverage_analysis('srd', 'Every change is audited')
+    assert 'Monitoring & Logging' in _elements(audited, 'present_elements')
+    assert 'Acceptance Criteria' not in _elements(local_coverage_analysis('story', 'Pay the acceptances'), 'present_elements')
+    named = local_coverage_analysis('srd', 'Nightly BACKUP & RECOVERY drills')
+    assert named['coverage_analysis']['present_elements'][0]['details'] == 'Mentions backup, backup & recovery, recovery'
+
+def test_every_document_type():
+    """Each document type is scored against its own required fields"""
+    for document_type, required in (('story', REQUIRED_FIELDS), ('brd', BRD_REQUIRED_FIELDS), ('cr', CR_REQUIRED_FIELDS)):
+        analysis = local_coverage_analysis(document_type, REQUIREMENT)
+        assert sorted(_elements(analysis, 'present_elements') + _elements(analysis, 'missing_elements')) == sorted(required)
+    assert local_coverage_analysis('frd', '')['coverage_analysis']['overall_score'] == 0
+    cr = local_coverage_analysis('cr', 'Roll back the pricing change if conversion drops')
+    assert 'rollback_plan' in _elements(cr, 'present_elements')
+    assert cr['coverage_analysis']['enterprise_readiness'] == 'Needs Significant Enhancement'
+    assert all(field in FIELD_TERMS for fields, _, _ in DOCUMENT_FIELDS.values() for field in fields)
+
+def test_failed_llm_analysis_falls_back_to_local():
+    """When the completion cannot be used, the analyze methods answer with the local analysis"""
+    client = offline_client(default_response='Sorry, I cannot help with that.')
+    assert client.analyze_requirement_coverage(REQUIREMENT) == local_coverage_analysis('story', REQUIREMENT)
+    cr = client.analyze_cr_requirement_coverage('Roll back the pricing change if conversion drops')
+    assert cr['analysis_source'] == 'local' and 'rollback_plan' in _elements(cr, 'present_elements')
+    assert cr['coverage_analysis']['missing_elements'][0]['details'].startswith('Provide a unique CR ID')
+
+def main():
+    """Run local analyzer tests"""
+    print("⚡ LOCAL ANALYZER TEST SUITE")
+    print("=" * 40)
+    for test in (test_automaton_finds_overlapping_terms, test_story_coverage, test_whole_words_and_stems,
+                 test_every_document_type, test_failed_llm_analysis_falls_back_to_local):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL LOCAL ANALYZER TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+PDF Fonts Test
+Tests TrueType registration, glyph subsetting and per-glyph font fallback
+"""
+
+import io
+import os
+import threading
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import SimpleDocTemplate
+import pdf_fonts
+import pdf_styles
+from pdf_fonts import build_font_set, find_font_file, get_font_set, load_font
+
+def _build_pdf(flowables):
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(flowables)
+    return buffer.getvalue()
+
+def test_fonts_register_once():
+    """Concurrent loads parse and register a font file a single time"""
+    path = find_font_file('VeraBI.ttf')
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(load_font(path))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(font) for font in seen}) == 1
+    assert pdfmetrics.getFont('VeraBI') is seen[0]
+    assert get_font_set() is get_font_set()
+
+def test_styles_use_truetype_family():
+    """The shared style registry uses the resolved TrueType family"""
+    fonts = get_font_set().fonts
+    assert fonts['normal'] != pdf_fonts.CORE_FONTS['normal']
+    registry = pdf_styles.get_style_registry()
+    assert registry['Normal'].fontName == fonts['normal']
+    assert registry.cell_style(10, bold=True).fontName == fonts['bold']
+
+def test_pdf_embeds_glyph_subset():
+    """Only the used glyphs are embedded, so the PDF stays far smaller than the font files"""
+    flowables = pdf_styles.heading('Résumé – “Łódź” €') + [pdf_styles.paragraph('Plain body text')]
+    pdf = _build_pdf(flowables)
+    assert b'+Vera' in pdf or b'+DejaVu' in pdf or b'+Noto' in pdf
+    fonts = get_font_set().fonts
+    full_size = sum(os.path.getsize(pdfmetrics.getFont(fonts[variant]).face.filename) for variant in ('normal', 'bold'))
+    assert len(pdf) < full_size / 2
+
+def test_fallback_markup():
+    """Characters missing from the body font switch to a fallback font that has them"""
+    font_set = build_font_set(family='core', fallback_fonts=['Vera.ttf'])
+    assert font_set.fonts == pdf_fonts.CORE_FONTS
+    assert font_set.markup('Plain <text> & more') == 'Plain &lt;text&gt; &amp; more'
+    assert font_set.markup('Ćosić') == '<font name="Vera">Ć</font>osi<font name="Vera">ć</font>'
+    assert font_set.markup('Done ✅️') == 'Done ✅'
+
+    # Emoji without a fallback font still produce a valid PDF
+    flowables = pdf_styles.heading('📊 Coverage 🟢') + pdf_styles.bullet_list(['Привет', '日本語'])
+    assert _build_pdf(flowables).startswith(b'%PDF')
+
+def main():
+    """Run PDF font tests"""
+    print("🔤 PDF FONTS TEST SUITE")
+    print("=" * 40)
+    for test in (test_fonts_register_once, test_styles_use_truetype_family, test_pdf_embeds_glyph_subset,
+                 test_fallback_markup):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL PDF FONT TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+PDF Styles Test
+Tests the shared ReportLab style registry and flowable factories
+"""
+
+import io
+import threading
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table
+import pdf_styles
+from pdf_styles import get_style_registry
+
+def test_registry_is_shared_and_read_only():
+    """Every caller and thread gets the same registry, which cannot be edited"""
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_style_registry())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(registry) for registry in seen}) == 1
+
+    registry = get_style_registry()
+    assert registry['CustomTitle'].fontSize == 20
+    try:
+        registry._styles['Normal'] = None
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("Style registry accepted a new style")
+
+def test_cell_styles():
+    """Cell styles are prebuilt per size, clamped to the supported range"""
+    registry = get_style_registry()
+    assert registry.cell_style(9).fontSize == 9
+    assert registry.cell_style(9, bold=True).fontName == registry.fonts['bold']
+    assert registry.cell_style(40) is registry.cell_style(12)
+    assert registry.cell_style(9) is registry.cell_style(9)
+
+def test_factories_build_a_pdf():
+    """Headings, bullets, tables and the dashboard lay out into a valid PDF"""
+    flowables = pdf_styles.cover_page('CHANGE REQUEST DOCUMENT', 'CR-7 <draft> & notes')
+    flowables += pdf_styles.dashboard('CR COVERAGE ANALYSIS', [('Change Complexity', 'High')],
+                                      [('Coverage Score', '80%'), ('Missing Elements', '2')])
+    flowables += pdf_styles.heading('RISK ASSESSMENT')
+    flowables += pdf_styles.bullet_list(['Vendor outage', 'Data loss'])
+    flowables += pdf_styles.data_table(['Risk ID', 'Description'], [['R-1', 'Vendor outage']] * 60, 6 * 72, 9)
+    flowables += pdf_styles.details_table([('Version', '1.0')], 6 * 72)
+
+    tables = [item for item in flowables if isinstance(item, Table)]
+    assert len(tables) == 3 and tables[1].repeatRows == 1
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(flowables)
+    assert buffer.getvalue().startswith(b'%PDF')
+
+def main():
+    """Run PDF style tests"""
+    print("🎨 PDF STYLES TEST SUITE")
+    print("=" * 40)
+    for test in (test_registry_is_shared_and_read_only, test_cell_styles, test_factories_build_a_pdf):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL PDF STYLE TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Request Hedging Test
+Tests hedge timing, budget, failure handling and the GroqClient integration
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from llm_providers import LLMProvider
+from offline_llm import offline_client
+from request_hedging import MIN_SAMPLES, RequestHedger
+
+class FakeClock:
+    """perf_counter stand-in that only moves when a simulated call advances it, per thread"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __call__(self):
+        return getattr(self._local, 'now', 0.0)
+
+    def advance(self, seconds):
+        self._local.now = self() + seconds
+
+class TogetherExecutor:
+    """Runs nothing until the hedge is submitted, then finishes both attempts at once"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, call, *args):
+        future = Future()
+        self.submitted.append((future, call, args))
+        if len(self.submitted) == 2:
+            for attempt, attempt_call, attempt_args in self.submitted:
+                try:
+                    attempt.set_result(attempt_call(*attempt_args))
+                except Exception as e:
+                    attempt.set_exception(e)
+        return future
+
+def _hedger(**options):
+    settings = dict(enabled=True, min_delay=0.01, initial_delay=0.05, max_rate=0.05, workers=4, clock=FakeClock())
+    settings.update(options)
+    return RequestHedger(**settings)
+
+def _sleepy(seconds, value):
+    time.sleep(seconds)
+    return value
+
+def _attempt(gate, value):
+    """An attempt that stays in flight until its gate opens; None means it answers at once"""
+    if gate is not None:
+        gate.wait(5)
+    return value
+
+def test_disabled_and_fast_calls_are_not_hedged():
+    """Disabled hedgers call straight through; fast calls never hedge"""
+    hedger = RequestHedger(enabled=False)
+    assert hedger.call('kind', _attempt, (None, 'a')) == 'a'
+    hedger = _hedger()
+    assert hedger.call('kind', _attempt, (None, 'a'), (None, 'b')) == 'a'
+    assert hedger.stats()['requests'] == 1 and hedger.stats()['hedged'] == 0
+
+def test_slow_tail_is_hedged():
+    """The hedge delay follows recent latencies; a call stuck past it loses to its hedge"""
+    clock = FakeClock()
+    hedger = _hedger(clock=clock)
+
+    def simulated(seconds, value):
+        clock.advance(seconds)
+        return value
+
+    for _ in range(MIN_SAMPLES):
+        hedger.call('generate_brd', simulated, (0.03, 'warm'))
+    assert round(hedger.hedge_delay('generate_brd'), 6) == 0.03
+    assert hedger.hedge_delay('analyze') == 0.05
+    hedger.call('quick', simulated, (0.001, 'warm'))
+    assert hedger.hedge_delay('quick') == 0.05
+
+    gate = threading.Event()
+    try:
+        assert hedger.call('generate_brd', _attempt, (gate, 'slow'), (None, 'hedge')) == 'hedge'
+    finally:
+        gate.set()
+    stats = hedger.stats()
+    assert stats['hedged'] == 1 and stats['hedge_wins'] == 1 and stats['hedge_win_rate'] == 1.0
+
+def test_budget_caps_hedge_rate():
+    """Once the budget is spent, slow calls just wait"""
+    hedger = _hedger(max_rate=0)
+    gate = threading.Event()
+    try:
+        assert hedger.call('kind', _attempt, (gate, 'slow'), (None, 'hedge')) == 'hedge'
+    finally:
+        gate.set()
+    assert hedger.call('kind', _sleepy, (0.1, 'slow'), (0, 'hedge')) == 'slow'
+    stats = hedger.stats()
+    assert stats['hedged'] == 1 and stats['budget_denied'] == 1
+
+def test_failures():
+    """Early failures propagate; a failed first finisher falls back to the other attempt"""
+    def failing(seconds, value):
+        time.sleep(seconds)
+        if value == 'boom':
+            raise RuntimeError('upstream error')
+        return value
+
+    hedger = _hedger()
+    try:
+        hedger.call('kind', failing, (0, 'boom'))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Primary failure was swallowed")
+    assert hedger.call('kind', failing, (0.2, 'slow'), (0.06, 'boom')) == 'slow'
+    assert hedger.stats()['primary_wins'] == 1
+
+    # Both attempts done by the time the race is judged: the successful hedge wins over the failed primary
+    clock = FakeClock()
+    hedger = _hedger(clock=clock, min_delay=0, initial_delay=0, executor=TogetherExecutor())
+    assert hedger.call('kind', failing, (0, 'boom'), (0, 'hedge')) == 'hedge'
+    assert hedger.stats()['hedge_wins'] == 1 and hedger.latencies.percentile('kind', 50) is None
+
+def test_only_the_slow_tail_is_hedged():
+    """With a 4% slow tail, the hedge delay stays at the fast body and only the stuck calls hedge"""
+    clock = FakeClock()
+    hedger = _hedger(clock=clock, min_delay=0.05)
+    gates = {}
+
+    def upstream(index, attempt):
+        if index % 25 == 24 and attempt == 'primary':
+            gates[index].wait(5)
+            clock.advance(0.2)
+        else:
+            clock.advance(0.002)
+        return attempt
+
+    results = []
+    for index in range(100):
+        gates[index] = threading.Event()
+        try:
+            results.append(hedger.call('kind', upstream, (index, 'primary'), (index, 'hedge')))
+        finally:
+            gates[index].set()
+    assert [index for index, result in enumerate(results) if result == 'hedge'] == [24, 49, 74, 99]
+    assert round(hedger.latencies.percentile('kind', 95), 6) == 0.002
+    stats = hedger.stats()
+    assert stats['hedged'] == 4 and stats['hedge_wins'] == 4 and stats['hedge_rate'] == 0.04
+
+def test_groq_client_hedges_to_alternate_model():
+    """_make_request sends the backup request to LLM_HEDGE_MODEL"""
+    class SlowPrimaryProvider(LLMProvider):
+        def __init__(self):
+            super().__init__('primary-model', 4)
+            self.calls = []
+            self.gate = threading.Event()
+
+        def _complete(self, messages, model, temperature, max_tokens):
+            self.calls.append(model)
+            _attempt(self.gate if model == 'primary-model' else None, None)
+            return f'{{"model": "{model}"}}'
+
+    client = offline_client(provider=SlowPrimaryProvider())
+    client.hedge_model = 'backup-model'
+    client.hedger = _hedger(initial_delay=0.02)
+    messages = [{"role": "system", "content": "System"}, {"role": "user", "content": "Hi"}]
+    try:
+        assert client._make_request(messages) == '{"model": "backup-model"}'
+    finally:
+        client.provider.gate.set()
+    assert client.provider.calls == ['primary-model', 'backup-model']
+
+def main():
+    """Run request hedging tests"""
+    print("🛡️ REQUEST HEDGING TEST SUITE")
+    print("=" * 40)
+    for test in (test_disabled_and_fast_calls_are_not_hedged, test_slow_tail_is_hedged, test_budget_caps_hedge_rate,
+                 test_failures, test_only_the_slow_tail_is_hedged, test_groq_client_hedges_to_alternate_model):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL REQUEST HEDGING TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
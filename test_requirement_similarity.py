@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Requirement Similarity Test
+Tests near-duplicate detection used to reuse earlier coverage analyses
+"""
+
+import time
+from requirement_similarity import RequirementSimilarityIndex
+
+BASE_REQUIREMENT = ("Customers must be able to reset their password through a link sent to "
+                    "their registered email address, valid for 30 minutes.")
+
+def test_near_duplicate_is_found():
+    """A lightly edited requirement scores close to its original"""
+    index = RequirementSimilarityIndex()
+    index.add('alice', 'story', BASE_REQUIREMENT, {'overall_score': 70})
+    index.add('alice', 'story', 'Generate a monthly revenue report for finance managers.', {'overall_score': 40})
+
+    edited = BASE_REQUIREMENT.replace('30 minutes', '45 minutes')
+    match = index.find_similar('alice', 'story', edited)
+    assert match.requirement == BASE_REQUIREMENT
+    assert match.similarity > 0.8
+    assert match.analysis == {'overall_score': 70}
+
+def test_unrelated_and_other_types_score_low():
+    """Different requirements and document types are not reused"""
+    index = RequirementSimilarityIndex()
+    index.add('alice', 'story', BASE_REQUIREMENT, {'overall_score': 70})
+
+    match = index.find_similar('alice', 'story', 'Build a dashboard of warehouse stock levels by region.')
+    assert match.similarity < 0.3
+    assert index.find_similar('alice', 'brd', BASE_REQUIREMENT) is None
+
+def test_returned_analysis_is_a_copy():
+    """Callers cannot mutate stored analyses"""
+    index = RequirementSimilarityIndex()
+    index.add('alice', 'brd', BASE_REQUIREMENT, {'critical_gaps': ['Scope']})
+    index.find_similar('alice', 'brd', BASE_REQUIREMENT).analysis['critical_gaps'].append('Risks')
+    assert index.find_similar('alice', 'brd', BASE_REQUIREMENT).analysis == {'critical_gaps': ['Scope']}
+
+def test_sessions_are_isolated():
+    """Lookups only see the owner's own analyses, and clients never get the stored text"""
+    index = RequirementSimilarityIndex()
+    index.add('alice', 'story', BASE_REQUIREMENT, {'overall_score': 70})
+    assert index.find_similar('bob', 'story', BASE_REQUIREMENT) is None
+
+    index.add('bob', 'story', 'Generate a monthly revenue report for finance managers.', {'overall_score': 40})
+    assert index.find_similar('bob', 'story', BASE_REQUIREMENT).analysis == {'overall_score': 40}
+    assert index.find_similar('alice', 'story', BASE_REQUIREMENT).to_dict() == {'similarity': 1.0}
+
+def test_capacity_and_lookup_speed():
+    """The index wraps at capacity"""
+    index = RequirementSimilarityIndex(capacity=2000)
+    for i in range(2500):
+        index.add('alice', 'story', f"Requirement number {i} for module {i % 37}", {'id': i})
+
+    start = time.perf_counter()
+    match = index.find_similar('alice', 'story', 'Requirement number 2499 for module 20')
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"  ⏱️  Lookup over 2000 signatures: {elapsed_ms:.2f} ms")
+
+    assert match.analysis == {'id': 2499}
+    assert index.find_similar('alice', 'story', 'Requirement number 3 for module 3').analysis['id'] != 3
+
+def main():
+    """Run requirement similarity tests"""
+    print("🧬 REQUIREMENT SIMILARITY TEST SUITE")
+    print("=" * 40)
+    for test in (test_near_duplicate_is_found, test_unrelated_and_other_types_score_low,
+                 test_returned_analysis_is_a_copy, test_sessions_are_isolated, test_capacity_and_lookup_speed):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL SIMILARITY TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Search Index Test
+Tests the SQLite FTS5 document index and its incremental sync
+"""
+
+from in_memory_app import create_test_app
+from models import db, Story
+from document_history import get_or_create_user, record_document
+from search_index import init_search, search_documents, flatten_document
+
+def create_search_app():
+    """Create an app with an in-memory database and a live search index"""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+    init_search(app)
+    return app
+
+def test_flatten_document():
+    """Nested document values are flattened to text"""
+    text = flatten_document({'risks': [{'risk_id': 'R-001', 'description': 'Payment gateway outage'}], 'score': 7})
+    assert 'Payment gateway outage' in text
+    assert '7' in text
+    assert 'risk_id' not in text
+
+def test_ranked_highlighted_search():
+    """Matches are ranked, highlighted, escaped and scoped to the user"""
+    app = create_search_app()
+    with app.app_context():
+        user = get_or_create_user('session-1')
+        other = get_or_create_user('session-2')
+        record_document(user, 'brd', 'Integrate the SAP ledger with billing', None,
+                        {'project_name': 'SAP Ledger Integration',
+                         'risks': [{'description': 'SAP downtime during <month-end> close'}]})
+        record_document(user, 'story', 'Users reset their password by email', None,
+                        {'business_goal': 'Self-service password reset'})
+        record_document(other, 'brd', 'SAP migration for another team', None, {'project_name': 'Other SAP'})
+
+        results = search_documents(user.id, 'sap')
+        assert len(results) == 1
+        assert results[0]['title'] == 'SAP Ledger Integration'
+        assert '<mark>SAP</mark>' in results[0]['title_highlight']
+        assert '&lt;month-end&gt;' in results[0]['content_snippet']
+
+        assert search_documents(user.id, 'passw')[0]['document_type'] == 'story'
+        assert search_documents(user.id, '"unbalanced') == []
+
+def test_incremental_sync():
+    """Updates and deletes are reflected without a rebuild"""
+    app = create_search_app()
+    with app.app_context():
+        user = get_or_create_user('session-3')
+        story = record_document(user, 'story', 'Export invoices to CSV', None, {'business_goal': 'Invoice export', 'actor': 'Accountant'})
+        story_id = story.id
+        db.session.expire_all()
+
+        story = db.session.get(Story, story_id)
+        story.status = 'approved'
+        db.session.commit()
+        assert search_documents(user.id, 'accountant')
+
+        story.user_stories = {'business_goal': 'Quarterly revenue report'}
+        db.session.commit()
+        assert search_documents(user.id, 'revenue')
+        assert search_documents(user.id, 'accountant') == []
+
+        db.session.delete(story)
+        db.session.commit()
+        assert search_documents(user.id, 'invoices') == []
+
+def main():
+    """Run search index tests"""
+    print("🔎 SEARCH INDEX TEST SUITE")
+    print("=" * 40)
+    for test in (test_flatten_document, test_ranked_highlighted_search, test_incremental_sync):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL SEARCH TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Speculative Generation Test
+Tests suggested-answer extraction and the speculative generation lifecycle
+"""
+
+import time
+from constants import DEFAULT_COVERAGE_ANALYSIS, DEFAULT_STORY_DATA
+from incremental_regeneration import plan_regeneration
+from local_analyzer import local_coverage_analysis
+from offline_llm import offline_client
+from speculation import SpeculativeGenerator, suggested_answers
+
+def _slow_generate(seconds):
+    def generate(requirement, answers):
+        time.sleep(seconds)
+        return dict(DEFAULT_STORY_DATA, business_goal=requirement)
+    return generate
+
+def test_suggested_answers_match_the_form():
+    """Answers come from what the Q&A form pre-fills"""
+    answers = suggested_answers(DEFAULT_COVERAGE_ANALYSIS)
+    assert list(answers) == ['Security', 'Dependencies', 'Acceptance Criteria']
+    assert answers['Security'] == 'User authentication, role-based access control, data encryption'
+
+    # The form renders the nested coverage block; top-level recommendations are not shown,
+    # so its missing elements become the questions
+    brd = local_coverage_analysis('brd', 'Finance managers need a monthly revenue report exported to Excel')
+    assert suggested_answers(brd)['Project Name'] == 'Business Process Enhancement Project'
+    assert len(suggested_answers(brd)) == len(brd['coverage_analysis']['missing_elements'])
+
+    flat = {'editable_recommendations': [
+        {'element': 'Actor', 'suggested_answer': '  Store manager  '},
+        {'element': 'Trigger', 'suggested_answer': ''}
+    ]}
+    assert suggested_answers(flat) == {'Actor': 'Store manager'}
+    assert suggested_answers(None) == {}
+
+def test_claim_once_and_early():
+    """A claimed speculation is ready sooner than a fresh generation and is claimable once"""
+    generator = SpeculativeGenerator(enabled=True, workers=2)
+    assert generator.start('a1', 'story', 'Reset passwords', {'Security': 'MFA'}, _slow_generate(0.3))
+
+    time.sleep(0.2)  # the user reviews the answers
+    started = time.perf_counter()
+    speculation = generator.claim('a1', 'story', 'Reset passwords')
+    assert speculation.answers == {'Security': 'MFA'}
+    assert speculation.result()['business_goal'] == 'Reset passwords'
+    assert time.perf_counter() - started < 0.2
+    assert generator.claim('a1', 'story', 'Reset passwords') is None
+
+def test_mismatch_cancel_and_expiry():
+    """Speculations for other inputs, replaced analyses and stale ones are dropped"""
+    generator = SpeculativeGenerator(enabled=True, workers=2, ttl_seconds=60)
+    generator.start('a1', 'story', 'Reset passwords', {}, _slow_generate(0))
+    assert generator.claim('a1', 'brd', 'Reset passwords') is None
+
+    generator.start('a2', 'story', 'Reset passwords', {}, _slow_generate(0))
+    generator.cancel('a2')
+    assert generator.claim('a2', 'story', 'Reset passwords') is None
+
+    generator.start('a3', 'story', 'Reset passwords', {}, _slow_generate(0))
+    generator._speculations['a3'].started -= 120
+    assert generator.claim('a3', 'story', 'Reset passwords') is None
+    assert generator.stats()['cancelled'] == 2
+
+    assert SpeculativeGenerator(enabled=False).start('a4', 'story', 'x', {}, _slow_generate(0)) is False
+
+def test_speculation_never_queues():
+    """With every worker busy, new speculations are skipped rather than queued"""
+    generator = SpeculativeGenerator(enabled=True, workers=1)
+    assert generator.start('a1', 'story', 'One', {}, _slow_generate(0.2))
+    assert generator.start('a2', 'story', 'Two', {}, _slow_generate(0)) is False
+    assert generator.stats()['skipped'] == 1
+    assert generator.claim('a1', 'story', 'One').result() is not None
+
+def test_failed_speculation_is_not_a_result():
+    """A speculative call that fails yields no document, so the claim generates from scratch"""
+    client = offline_client(default_response='Sorry, the service is overloaded.')
+    generator = SpeculativeGenerator(enabled=True, workers=1)
+    assert generator.start('a1', 'story', 'Reset passwords', {},
+                           lambda requirement, answers: client.try_generate_document('story', requirement, answers))
+    assert generator.claim('a1', 'story', 'Reset passwords').result() is None
+    assert client.generate_story('Reset passwords', {}) == DEFAULT_STORY_DATA
+
+    client.provider.add('Reset passwords', dict(DEFAULT_STORY_DATA, business_goal='Reset passwords'))
+    assert client.try_generate_document('story', 'Reset passwords', {})['business_goal'] == 'Reset passwords'
+
+def test_changed_answers_patch_only_their_sections():
+    """Edits to suggested answers map to the sections the incremental path regenerates"""
+    speculated = suggested_answers(DEFAULT_COVERAGE_ANALYSIS)
+    submitted = dict(speculated, Security='SSO with hardware keys')
+    assert plan_regeneration('story', speculated, speculated, DEFAULT_STORY_DATA) == []
+    assert plan_regeneration('story', speculated, submitted, DEFAULT_STORY_DATA) == ['security']
+
+def main():
+    """Run speculative generation tests"""
+    print("🔮 SPECULATIVE GENERATION TEST SUITE")
+    print("=" * 40)
+    for test in (test_suggested_answers_match_the_form, test_claim_once_and_early, test_mismatch_cancel_and_expiry,
+                 test_speculation_never_queues, test_failed_speculation_is_not_a_result,
+                 test_changed_answers_patch_only_their_sections):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL SPECULATIVE GENERATION TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Text Exporters Test
+Tests the streaming Markdown, HTML and JSON-LD exports of every document type
+"""
+
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from constants import DEFAULT_COVERAGE_ANALYSIS, DEFAULT_STORY_DATA
+from offline_llm import offline_client
+from bulk_export import parse_export_jobs, stream_bulk_export
+from story_exporter_enhanced import EnhancedStoryExporter
+from text_exporters import render_text_export, stream_text_export
+
+def _sample_documents():
+    client = offline_client()
+    return {
+        'story': DEFAULT_STORY_DATA,
+        'brd': client._get_default_brd_data(),
+        'frd': client._get_default_frd_data(),
+        'srd': client._get_default_srd_data(),
+        'cr': client._get_default_cr_data()
+    }
+
+class _TagCounter(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.open_tags = {}
+
+    def handle_starttag(self, tag, attrs):
+        self.open_tags[tag] = self.open_tags.get(tag, 0) + 1
+
+    def handle_endtag(self, tag):
+        self.open_tags[tag] = self.open_tags.get(tag, 0) - 1
+
+def test_markdown():
+    """Sections, tables and bullets come out in spec order with cells escaped"""
+    brd = dict(_sample_documents()['brd'])
+    brd['business_requirements'] = [{'br_id': 'BR-1', 'title': 'Split | pipes', 'description': 'Line one\nline two'}]
+    text = render_text_export('brd', 'markdown', brd, DEFAULT_COVERAGE_ANALYSIS)
+    assert text.startswith('# BUSINESS REQUIREMENTS DOCUMENT\n')
+    assert text.index('## DOCUMENT CONTROL') < text.index('## EXECUTIVE SUMMARY') < text.index('## APPROVAL SECTION')
+    assert '| BR-1 | Split \\| pipes | Line one<br>line two |' in text
+    assert '- Feature 1\n- Feature 2\n\n' in text
+
+def test_markdown_escapes_generated_text():
+    """Generated text cannot inject HTML or Markdown, and image URLs stay inside their link"""
+    story = dict(DEFAULT_STORY_DATA, business_goal='Stop <script>alert(1)</script> & *bold* [link](http://x)')
+    images = {'functional_flow': [{'data': 'data:image/png;base64,iVBO) <img>', 'caption': '# Flow'}]}
+    text = render_text_export('story', 'markdown', story, DEFAULT_COVERAGE_ANALYSIS, images)
+    assert '<script>' not in text and '\\<script\\>' in text
+    assert '\\*bold\\* \\[link\\](http://x)' in text
+    assert '](<data:image/png;base64,iVBO)%20%3Cimg%3E>)' in text
+    assert '*\\# Flow*' in text
+
+def test_html_is_self_contained():
+    """HTML escapes content, balances tags and inlines styles and images"""
+    story = dict(DEFAULT_STORY_DATA, business_goal='Stop <script> & injection')
+    images = {'functional_flow': [{'data': 'iVBORw0KGgo=', 'caption': 'Flow "diagram"'}]}
+    text = render_text_export('story', 'html', story, DEFAULT_COVERAGE_ANALYSIS, images)
+    assert '<script>' not in text and 'Stop &lt;script&gt; &amp; injection' in text
+    assert '<style>' in text and '<link' not in text
+    assert 'src="data:image/png;base64,iVBORw0KGgo="' in text and 'alt="Flow &quot;diagram&quot;"' in text
+
+    counter = _TagCounter()
+    counter.feed(text)
+    assert all(count == 0 for tag, count in counter.open_tags.items() if tag not in ('meta', 'img', 'hr'))
+
+def test_json_ld():
+    """JSON-LD carries document metadata and each section's structured data"""
+    cr = _sample_documents()['cr']
+    document = json.loads(render_text_export('cr', 'json', cr, DEFAULT_COVERAGE_ANALYSIS))
+    assert document['@type'] == 'DigitalDocument' and document['identifier'] == 'CR-001'
+    assert document['additionalProperty'][0] == {'@type': 'PropertyValue', 'name': 'Coverage Score', 'value': '0%'}
+    parts = {part['identifier']: part for part in document['hasPart']}
+    assert parts['risk_assessment']['content'] == cr['risk_assessment']
+    assert [part['position'] for part in document['hasPart']] == list(range(1, len(parts) + 1))
+
+def test_all_types_are_streamed():
+    """Every type renders in every format, handed out as a chunk stream"""
+    for document_type, data in _sample_documents().items():
+        for format_type in ('markdown', 'html', 'json'):
+            chunks = list(stream_text_export(document_type, format_type, data, DEFAULT_COVERAGE_ANALYSIS))
+            assert chunks and all(isinstance(chunk, str) for chunk in chunks)
+    try:
+        stream_text_export('story', 'rtf', DEFAULT_STORY_DATA)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown text format accepted")
+
+def test_exporter_and_bulk_export():
+    """Text formats work through export_document and are deflated in bulk archives"""
+    path = EnhancedStoryExporter().export_document('frd', _sample_documents()['frd'], 'markdown')
+    try:
+        assert path.endswith('.md')
+        with open(path, encoding='utf-8') as f:
+            assert f.read().startswith('# FUNCTIONAL REQUIREMENTS DOCUMENT')
+    finally:
+        os.remove(path)
+
+    jobs = parse_export_jobs({'documents': [{'document_type': 'srd', 'data': _sample_documents()['srd']}],
+                              'formats': ['html', 'json']})
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_bulk_export(jobs, executor))))
+    names = {info.filename: info for info in archive.infolist()}
+    assert names['001_system_requirements_document.html'].compress_type == zipfile.ZIP_DEFLATED
+    assert json.loads(archive.read('001_system_requirements_document.json'))['name'] == 'System Requirements Document'
+
+def main():
+    """Run text exporter tests"""
+    print("📝 TEXT EXPORTERS TEST SUITE")
+    print("=" * 40)
+    for test in (test_markdown, test_markdown_escapes_generated_text, test_html_is_self_contained, test_json_ld,
+                 test_all_types_are_streamed, test_exporter_and_bulk_export):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL TEXT EXPORTER TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tracker Connectors Test
+Tests issue mapping and batched, idempotent pushes against the mock tracker server
+"""
+
+import time
+from constants import DEFAULT_STORY_DATA
+from mock_tracker_server import start_mock_tracker
+from offline_llm import offline_client
+from story_parser import StoryParser
+from tracker_connectors import (GenericRestConnector, JiraConnector, RateLimiter, TrackerError,
+                                issues_from_documents, jql_string, push_summary, resolve_project, story_to_issue)
+
+def _backlog(count):
+    parser = StoryParser()
+    return [parser.parse_story(dict(DEFAULT_STORY_DATA, business_goal=f'Goal {i}')) for i in range(count)]
+
+def test_story_and_brd_mapping():
+    """Stories keep their acceptance criteria; BRD requirements become one issue each"""
+    issue = story_to_issue(StoryParser().parse_story(DEFAULT_STORY_DATA), 'APP')
+    assert issue['summary'] == DEFAULT_STORY_DATA['business_goal']
+    assert issue['acceptance_criteria'] == DEFAULT_STORY_DATA['acceptance_criteria']
+    assert 'Functional Flow:\n- ' in issue['description']
+
+    brd = offline_client()._get_default_brd_data()
+    brd['business_requirements'].append(dict(brd['business_requirements'][0], br_id='BR-002'))
+    issues = issues_from_documents([DEFAULT_STORY_DATA, DEFAULT_STORY_DATA], brd, 'APP')
+    assert len(issues) == 3
+    assert issues[1]['summary'] == 'BR-001: Requirement 1' and issues[1]['priority'] == 'High'
+    assert len({issue['idempotency_key'] for issue in issues}) == 3
+
+def test_backlog_pushes_in_one_call_and_is_idempotent():
+    """100 stories go out in one bulk call; pushing them again creates no duplicates"""
+    server, tracker, base_url = start_mock_tracker()
+    try:
+        issues = issues_from_documents(_backlog(100), project='APP')
+        connector = GenericRestConnector(base_url, project='APP', rate_limit=0)
+        results = connector.push(issues)
+        assert connector.calls == 1
+        assert push_summary(results) == {'created': 100, 'existing': 0, 'error': 0}
+        assert [result['idempotency_key'] for result in results] == [issue['idempotency_key'] for issue in issues]
+
+        # Same batch: the tracker replays its first response instead of applying it again
+        assert GenericRestConnector(base_url, project='APP', rate_limit=0).push(issues) == results
+        # Overlapping batch: known issues are reported as existing
+        overlap = issues[:50] + issues_from_documents(_backlog(110)[100:], project='APP')
+        again = GenericRestConnector(base_url, project='APP', rate_limit=0).push(overlap)
+        assert push_summary(again) == {'created': 10, 'existing': 50, 'error': 0}
+        assert len(tracker.issues) == 110
+    finally:
+        server.shutdown()
+
+def test_throttling_is_retried():
+    """429 responses are retried after Retry-After without duplicating issues"""
+    server, tracker, base_url = start_mock_tracker(throttle_every=2)
+    try:
+        connector = GenericRestConnector(base_url, project='APP', batch_size=10, rate_limit=0)
+        results = connector.push(issues_from_documents(_backlog(30), project='APP'))
+        assert push_summary(results)['created'] == 30
+        assert connector.calls > 3
+        assert len(tracker.issues) == 30
+    finally:
+        server.shutdown()
+
+def test_jira_connector():
+    """Jira pushes in 50-issue batches and finds earlier pushes by key label"""
+    server, tracker, base_url = start_mock_tracker()
+    try:
+        issues = issues_from_documents(_backlog(60), project='APP')
+        connector = JiraConnector(base_url, project='APP', user='analyst@example.com', token='secret', rate_limit=0)
+        assert connector.batch_size == 50
+        results = connector.push(issues)
+        assert push_summary(results)['created'] == 60
+        assert connector.calls == 4  # a search and a bulk create per batch
+        assert results[0]['id'].startswith('APP-')
+
+        assert push_summary(connector.push(issues[:5]))['existing'] == 5
+        assert len(tracker.issues) == 60
+    finally:
+        server.shutdown()
+
+def test_project_allow_list_and_jql_escaping():
+    """Clients only reach allowed projects, and project keys cannot break out of the JQL string"""
+    assert resolve_project(None, 'APP', []) == 'APP'
+    assert resolve_project('OPS', 'APP', ['OPS']) == 'OPS'
+    for project in ('HR', 'APP" OR project = "HR'):
+        try:
+            resolve_project(project, 'APP', ['OPS'])
+        except ValueError:
+            continue
+        raise AssertionError(f"Allowed project {project}")
+
+    assert jql_string('APP" OR project = "HR') == '"APP\\" OR project = \\"HR"'
+    assert jql_string('a\\b') == '"a\\\\b"'
+
+def test_unreachable_tracker_and_rate_limit():
+    """Failed batches are reported per issue and calls are paced by the rate limit"""
+    connector = GenericRestConnector('http://127.0.0.1:9', rate_limit=0, max_retries=0, timeout=1)
+    results = connector.push(issues_from_documents(_backlog(3)))
+    assert push_summary(results)['error'] == 3
+    try:
+        connector.request('POST', '/issues/bulk', {})
+    except TrackerError:
+        pass
+    else:
+        raise AssertionError("Unreachable tracker did not raise")
+
+    limiter = RateLimiter(20)
+    started = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.perf_counter() - started >= 0.15
+
+def main():
+    """Run tracker connector tests"""
+    print("🚀 TRACKER CONNECTORS TEST SUITE")
+    print("=" * 40)
+    for test in (test_story_and_brd_mapping, test_backlog_pushes_in_one_call_and_is_idempotent,
+                 test_throttling_is_retried, test_jira_connector, test_project_allow_list_and_jql_escaping,
+                 test_unreachable_tracker_and_rate_limit):
+        test()
+        print(f"  ✅ {test.__name__} passed")
+    print("🎉 ALL TRACKER CONNECTOR TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
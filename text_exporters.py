@@ -0,0 +1,307 @@
+"""
+Text Exporters
+Streaming Markdown, self-contained HTML and JSON-LD renderings of document specs
+"""
+
+import html
+import json
+import re
+from datetime import datetime
+from document_specs import (DOCUMENT_SPECS, coverage_metrics, find_section_images, layout_document,
+                            layout_section, resolve_field)
+
+# File extension and MIME type of each text format
+TEXT_FORMATS = {
+    'markdown': ('md', 'text/markdown; charset=utf-8'),
+    'html': ('html', 'text/html; charset=utf-8'),
+    'json': ('json', 'application/ld+json; charset=utf-8')
+}
+
+# Rendered text is handed out in chunks of about this many characters
+CHUNK_SIZE = 16 * 1024
+
+def _buffered(pieces, size=CHUNK_SIZE):
+    """Join small rendered pieces into larger chunks for the response stream"""
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def _image_url(image_data):
+    """Data URL of a section image; bare base64 is assumed to be PNG"""
+    data = image_data.get('data', '')
+    return data if data.startswith('data:image/') else f'data:image/png;base64,{data}'
+
+def _subtitle(spec, data):
+    subtitle = resolve_field(data, spec['subtitle'])
+    return subtitle[:150] if subtitle else None
+
+# ----------------------------------------------------------------------
+# Markdown
+# ----------------------------------------------------------------------
+
+# Characters that Markdown reads as inline markup or raw HTML, and the
+# block markers that only count at the start of a line
+MD_INLINE = re.compile(r'([\\`*_\[\]<>|&!])')
+MD_LINE_START = re.compile(r'^(\s*)([#>+=-])', re.MULTILINE)
+
+def _md_text(value):
+    """Generated text as literal Markdown: markup and HTML are escaped, not rendered"""
+    return MD_LINE_START.sub(r'\1\\\2', MD_INLINE.sub(r'\\\1', str(value)))
+
+def _md_cell(value):
+    return _md_text(value).replace('\n', '<br>')
+
+def _md_url(url):
+    """Link destination in angle brackets, so spaces and parentheses cannot end it early"""
+    return '<' + re.sub(r'[\s<>\\]', lambda match: f'%{ord(match.group()):02X}', url) + '>'
+
+def _md_table(headers, rows):
+    lines = ['| ' + ' | '.join(_md_cell(header) for header in headers) + ' |',
+             '|' + '---|' * len(headers)]
+    for row in rows:
+        values = list(row) + [''] * (len(headers) - len(row))
+        lines.append('| ' + ' | '.join(_md_cell(value) for value in values[:len(headers)]) + ' |')
+    return '\n'.join(lines) + '\n\n'
+
+def _markdown_pieces(spec, data, coverage_data, section_images):
+    yield f"# {_md_text(spec['cover_title'])}\n\n"
+    subtitle = _subtitle(spec, data)
+    if subtitle:
+        yield f"*{_md_text(subtitle)}*\n\n"
+
+    in_list = False
+    for op in layout_document(spec, data, coverage_data):
+        kind = op[0]
+        if in_list and kind != 'bullet':
+            yield '\n'
+            in_list = False
+
+        if kind == 'heading':
+            yield f"{'#' * (op[2] + 1)} {_md_text(op[1])}\n\n"
+        elif kind == 'paragraph':
+            yield f"{_md_text(op[1])}\n\n"
+        elif kind == 'labelled':
+            yield f"**{_md_text(op[1])}:** {_md_text(op[2])}\n\n"
+        elif kind == 'bullet':
+            yield f"- {_md_text(op[1])}\n"
+            in_list = True
+        elif kind == 'indented':
+            # Indented text continues the numbered item above it
+            yield f"   {_md_text(op[1])}\n\n"
+        elif kind == 'table':
+            yield _md_table(op[1], op[2])
+        elif kind == 'details':
+            yield _md_table(['Field', 'Value'], op[1])
+        elif kind == 'dashboard':
+            yield f"## {_md_text(op[1])}\n\n"
+            for label, value in op[2]:
+                yield f"**{_md_text(label)}:** {_md_text(value)}\n\n"
+            if op[3]:
+                yield f"### {_md_text(op[3])}\n\n"
+            yield _md_table(['Metric', 'Value'], op[4])
+        elif kind == 'images':
+            for image_data in find_section_images(op[1], section_images):
+                caption = image_data.get('caption', '')
+                yield f"![{_md_cell(caption)}]({_md_url(_image_url(image_data))})\n\n"
+                if caption:
+                    yield f"*{_md_text(caption)}*\n\n"
+        elif kind == 'separator':
+            yield '---\n\n'
+    if in_list:
+        yield '\n'
+
+# ----------------------------------------------------------------------
+# HTML
+# ----------------------------------------------------------------------
+
+HTML_STYLE = """
+body { font-family: Calibri, 'Segoe UI', Arial, sans-serif; color: #1e293b; margin: 0; background: #f8fafc; }
+main { max-width: 880px; margin: 0 auto; padding: 48px 56px; background: #ffffff; }
+header.cover { text-align: center; padding: 48px 0; border-bottom: 2px solid #1e40af; margin-bottom: 32px; }
+header.cover h1 { color: #1e40af; font-size: 28px; margin: 0 0 12px; }
+header.cover p { color: #64748b; font-size: 16px; margin: 0; }
+h2 { color: #1e40af; font-size: 20px; margin: 32px 0 12px; }
+h3 { font-size: 16px; margin: 20px 0 8px; }
+p.indented { margin-left: 24px; }
+table { border-collapse: collapse; width: 100%; margin: 12px 0 20px; font-size: 14px; }
+th, td { border: 1px solid #1e293b; padding: 6px 8px; text-align: left; vertical-align: top; }
+thead th, th[scope="row"] { background: #e8e8e8; }
+th[scope="row"] { width: 30%; }
+figure { margin: 16px 0; }
+figure img { max-width: 60%; }
+figcaption { color: #64748b; font-size: 13px; font-style: italic; }
+hr { border: 0; border-top: 1px solid #cbd5e1; margin: 24px 0; }
+"""
+
+def _html_table(headers, rows):
+    escape = html.escape
+    pieces = ['<table>']
+    if headers:
+        pieces.append('<thead><tr>' + ''.join(f'<th>{escape(str(header))}</th>' for header in headers)
+                      + '</tr></thead>')
+    pieces.append('<tbody>')
+    for row in rows:
+        pieces.append('<tr>' + ''.join(f'<td>{escape(str(value))}</td>' for value in row) + '</tr>')
+    pieces.append('</tbody></table>\n')
+    return ''.join(pieces)
+
+def _html_details(rows):
+    escape = html.escape
+    body = ''.join(f'<tr><th scope="row">{escape(str(label))}</th><td>{escape(str(value))}</td></tr>'
+                   for label, value in rows)
+    return f'<table class="details"><tbody>{body}</tbody></table>\n'
+
+def _html_pieces(spec, data, coverage_data, section_images):
+    escape = html.escape
+    title = escape(spec['header_title'])
+    yield (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+           f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+           f'<title>{title}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n<main>\n')
+    yield f'<header class="cover"><h1>{escape(spec["cover_title"])}</h1>'
+    subtitle = _subtitle(spec, data)
+    if subtitle:
+        yield f'<p>{escape(subtitle)}</p>'
+    yield '</header>\n'
+
+    in_list = False
+    for op in layout_document(spec, data, coverage_data):
+        kind = op[0]
+        if in_list and kind != 'bullet':
+            yield '</ul>\n'
+            in_list = False
+
+        if kind == 'heading':
+            level = min(op[2] + 1, 6)
+            yield f'<h{level}>{escape(op[1])}</h{level}>\n'
+        elif kind == 'paragraph':
+            yield f'<p>{escape(op[1])}</p>\n'
+        elif kind == 'labelled':
+            yield f'<p><strong>{escape(op[1])}:</strong> {escape(op[2])}</p>\n'
+        elif kind == 'bullet':
+            if not in_list:
+                yield '<ul>\n'
+                in_list = True
+            yield f'<li>{escape(op[1])}</li>\n'
+        elif kind == 'indented':
+            yield f'<p class="indented">{escape(op[1])}</p>\n'
+        elif kind == 'table':
+            yield _html_table(op[1], op[2])
+        elif kind == 'details':
+            yield _html_details(op[1])
+        elif kind == 'dashboard':
+            yield f'<section class="dashboard"><h2>{escape(op[1])}</h2>\n'
+            for label, value in op[2]:
+                yield f'<p><strong>{escape(label)}:</strong> {escape(value)}</p>\n'
+            if op[3]:
+                yield f'<h3>{escape(op[3])}</h3>\n'
+            yield _html_table(['Metric', 'Value'], op[4])
+            yield '</section>\n'
+        elif kind == 'images':
+            for image_data in find_section_images(op[1], section_images):
+                caption = escape(image_data.get('caption', ''))
+                yield f'<figure><img src="{escape(_image_url(image_data))}" alt="{caption}">'
+                yield f'<figcaption>{caption}</figcaption></figure>\n' if caption else '</figure>\n'
+        elif kind == 'separator':
+            yield '<hr>\n'
+    if in_list:
+        yield '</ul>\n'
+    yield '</main>\n</body>\n</html>\n'
+
+# ----------------------------------------------------------------------
+# JSON-LD
+# ----------------------------------------------------------------------
+
+# schema.org terms, plus `content` carrying each section's structured data as a JSON literal
+JSON_LD_CONTEXT = [
+    'https://schema.org',
+    {'content': {'@id': 'urn:user-story-generator:content', '@type': '@json'}}
+]
+
+def _ops_content(ops):
+    """Structured content of a section that has no data key (static content)"""
+    content = []
+    for op in ops:
+        kind = op[0]
+        if kind in ('paragraph', 'bullet', 'indented'):
+            content.append(op[1])
+        elif kind == 'labelled':
+            content.append({op[1]: op[2]})
+        elif kind == 'details':
+            content.append(dict(op[1]))
+        elif kind == 'table':
+            content.extend(dict(zip(op[1], row)) for row in op[2])
+    return content
+
+def _json_pieces(spec, data, coverage_data, section_images):
+    document = {
+        '@context': JSON_LD_CONTEXT,
+        '@type': 'DigitalDocument',
+        'name': spec['header_title'],
+        'headline': _subtitle(spec, data),
+        'dateCreated': datetime.now().strftime('%Y-%m-%d'),
+        'version': '1.0',
+        'encodingFormat': 'application/ld+json'
+    }
+    control = spec.get('document_control')
+    if control:
+        document['identifier'] = control['document_id']
+        document['author'] = {'@type': 'Person', 'jobTitle': control['author']}
+        document['sourceOrganization'] = {'@type': 'Organization', 'department': control['department']}
+    if coverage_data:
+        document['additionalProperty'] = [
+            {'@type': 'PropertyValue', 'name': label, 'value': value}
+            for label, value in coverage_metrics(coverage_data)
+        ]
+
+    head = json.dumps(document, ensure_ascii=False, indent=2, default=str)
+    yield head[:-2] + ',\n  "hasPart": ['
+
+    position = 0
+    for spec_section in spec['sections']:
+        ops = layout_section(spec_section, data)
+        if not ops:
+            continue
+        position += 1
+        part = {
+            '@type': 'CreativeWork',
+            'position': position,
+            'name': spec_section['title'],
+            'identifier': spec_section['key'] or spec_section['image'],
+            'content': data[spec_section['key']] if spec_section['key'] else _ops_content(ops)
+        }
+        images = find_section_images(spec_section['image'], section_images) if spec_section['image'] else []
+        if images:
+            part['image'] = [{'@type': 'ImageObject', 'contentUrl': _image_url(image_data),
+                              'caption': image_data.get('caption', '')} for image_data in images]
+        separator = ',' if position > 1 else ''
+        yield f"{separator}\n    " + json.dumps(part, ensure_ascii=False, default=str)
+    yield '\n  ]\n}\n'
+
+TEXT_RENDERERS = {
+    'markdown': _markdown_pieces,
+    'html': _html_pieces,
+    'json': _json_pieces
+}
+
+def stream_document(spec, format_type, document_data, coverage_data=None, section_images=None):
+    """Yield a document rendered as Markdown, HTML or JSON-LD in text chunks"""
+    if format_type not in TEXT_RENDERERS:
+        raise ValueError(f"Unsupported format: {format_type}")
+    return _buffered(TEXT_RENDERERS[format_type](spec, document_data or {}, coverage_data, section_images))
+
+def stream_text_export(document_type, format_type, document_data, coverage_data=None, section_images=None):
+    """stream_document for a document type name"""
+    spec = DOCUMENT_SPECS.get(document_type)
+    if spec is None:
+        raise ValueError(f"Unsupported document type: {document_type}")
+    return stream_document(spec, format_type, document_data, coverage_data, section_images)
+
+def render_text_export(document_type, format_type, document_data, coverage_data=None, section_images=None):
+    """Whole text rendering of a document as one string"""
+    return ''.join(stream_text_export(document_type, format_type, document_data, coverage_data, section_images))
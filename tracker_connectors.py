@@ -0,0 +1,370 @@
+"""
+Tracker Connectors
+Maps generated stories and BRD requirements to tracker issues and pushes them
+in batched, rate-limited bulk calls with idempotency keys
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+TRACKER_TYPE = os.getenv('TRACKER_TYPE', 'generic')
+TRACKER_URL = os.getenv('TRACKER_URL', '')
+TRACKER_PROJECT = os.getenv('TRACKER_PROJECT', '')
+# Further projects clients may push to (comma-separated); TRACKER_PROJECT is always allowed
+TRACKER_ALLOWED_PROJECTS = [project.strip() for project in os.getenv('TRACKER_ALLOWED_PROJECTS', '').split(',')
+                            if project.strip()]
+TRACKER_TOKEN = os.getenv('TRACKER_TOKEN', '')
+TRACKER_USER = os.getenv('TRACKER_USER', '')
+TRACKER_BATCH_SIZE = int(os.getenv('TRACKER_BATCH_SIZE', '100'))
+TRACKER_RATE_LIMIT = float(os.getenv('TRACKER_RATE_LIMIT', '5'))
+TRACKER_TIMEOUT = float(os.getenv('TRACKER_TIMEOUT', '30'))
+MAX_PUSH_ITEMS = int(os.getenv('TRACKER_MAX_PUSH_ITEMS', '1000'))
+
+# Responses worth retrying; Retry-After is honoured when the tracker sends it
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRIES = 3
+
+ISSUE_LABEL = 'user-story-generator'
+
+class TrackerError(Exception):
+    """A tracker call failed after retries"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+# ----------------------------------------------------------------------
+# Mapping documents to issues
+# ----------------------------------------------------------------------
+
+def idempotency_key(*parts):
+    """Stable key for an issue, derived from what identifies its source item"""
+    payload = json.dumps([str(part or '').strip().lower() for part in parts], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def _bullets(title, items):
+    items = [str(item) for item in items or [] if str(item).strip()]
+    if not items:
+        return ''
+    return f"{title}:\n" + '\n'.join(f"- {item}" for item in items) + '\n\n'
+
+def _as_items(value):
+    if not value:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def resolve_project(project=None, default=None, allowed=None):
+    """The project a push goes to: the default, or a requested one from the allow-list"""
+    default = TRACKER_PROJECT if default is None else default
+    allowed = TRACKER_ALLOWED_PROJECTS if allowed is None else allowed
+    if not project or project == default:
+        return default
+    if project not in allowed:
+        raise ValueError(f"Pushing to project {project} is not allowed")
+    return project
+
+def jql_string(value):
+    """A JQL string literal, with quotes and backslashes escaped"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def story_to_issue(story_data, project=None):
+    """Tracker issue for a StoryParser story"""
+    goal = story_data.get('business_goal') or 'User story'
+    actor = story_data.get('actor') or ''
+    description = ''
+    if actor:
+        description += f"Actor: {actor}\n"
+    if story_data.get('trigger'):
+        description += f"Trigger: {story_data['trigger']}\n"
+    description += '\n' if description else ''
+    for title, key in (('Preconditions', 'preconditions'), ('Functional Flow', 'functional_flow'),
+                       ('Validations', 'validations'), ('Security', 'security'),
+                       ('Dependencies', 'dependencies'), ('Risks', 'risks')):
+        description += _bullets(title, _as_items(story_data.get(key)))
+
+    return {
+        'idempotency_key': idempotency_key('story', project, actor, goal),
+        'summary': goal[:250],
+        'description': description.strip(),
+        'acceptance_criteria': [str(item) for item in _as_items(story_data.get('acceptance_criteria'))],
+        'issue_type': 'Story',
+        'priority': None,
+        'labels': [ISSUE_LABEL, 'user-story'],
+        'source': {'document_type': 'story', 'item_id': None}
+    }
+
+def brd_requirement_to_issue(requirement, brd_data, project=None):
+    """Tracker issue for one BRD business requirement"""
+    item_id = requirement.get('br_id') or requirement.get('id') or ''
+    title = requirement.get('title') or requirement.get('description') or 'Business requirement'
+    summary = f"{item_id}: {title}" if item_id else str(title)
+    details = [f"Source: {requirement['source']}"] if requirement.get('source') else []
+    if brd_data.get('project_name'):
+        details.append(f"Project: {brd_data['project_name']}")
+    description = '\n\n'.join(part for part in (requirement.get('description'), '\n'.join(details)) if part)
+
+    return {
+        'idempotency_key': idempotency_key('brd', project, brd_data.get('project_name'), item_id or title),
+        'summary': summary[:250],
+        'description': description,
+        'acceptance_criteria': [str(item) for item in _as_items(requirement.get('acceptance_criteria'))],
+        'issue_type': 'Story',
+        'priority': requirement.get('priority'),
+        'labels': [ISSUE_LABEL, 'business-requirement'],
+        'source': {'document_type': 'brd', 'item_id': item_id or None}
+    }
+
+def issues_from_documents(stories=None, brd_data=None, project=None):
+    """Issues for a backlog of stories and/or a BRD's business requirements"""
+    issues = [story_to_issue(story, project) for story in stories or [] if isinstance(story, dict)]
+    if brd_data:
+        issues.extend(brd_requirement_to_issue(requirement, brd_data, project)
+                      for requirement in brd_data.get('business_requirements') or []
+                      if isinstance(requirement, dict))
+
+    # The same item twice in one push would create it twice; keep the first
+    unique = {}
+    for issue in issues:
+        unique.setdefault(issue['idempotency_key'], issue)
+    if len(unique) > MAX_PUSH_ITEMS:
+        raise ValueError(f"A push is limited to {MAX_PUSH_ITEMS} issues")
+    return list(unique.values())
+
+# ----------------------------------------------------------------------
+# Transport
+# ----------------------------------------------------------------------
+
+class RateLimiter:
+    """Token bucket shared by every call a connector makes"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+class TrackerConnector:
+    """Base connector: batching, rate limiting, retries and JSON over HTTP.
+
+    Subclasses implement push_batch() for one bulk call of at most
+    batch_size issues and return one result dict per issue.
+    """
+
+    name = 'base'
+    max_batch_size = None
+
+    def __init__(self, base_url, project=None, token=None, user=None, batch_size=TRACKER_BATCH_SIZE,
+                 rate_limit=TRACKER_RATE_LIMIT, timeout=TRACKER_TIMEOUT, max_retries=MAX_RETRIES):
+        if not base_url:
+            raise ValueError("Tracker URL is not configured")
+        self.base_url = base_url.rstrip('/')
+        self.project = project
+        self.token = token
+        self.user = user
+        self.batch_size = min(batch_size, self.max_batch_size or batch_size)
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.calls = 0
+
+    def _auth_headers(self):
+        if self.token and self.user:
+            credentials = base64.b64encode(f"{self.user}:{self.token}".encode('utf-8')).decode('ascii')
+            return {'Authorization': f'Basic {credentials}'}
+        if self.token:
+            return {'Authorization': f'Bearer {self.token}'}
+        return {}
+
+    def request(self, method, path, payload=None, headers=None):
+        """One JSON call, rate limited and retried on throttling or gateway errors"""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request_headers = {'Content-Type': 'application/json', 'Accept': 'application/json',
+                           **self._auth_headers(), **(headers or {})}
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            self.calls += 1
+            req = urllib.request.Request(self.base_url + path, data=body, method=method, headers=request_headers)
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                    content = response.read()
+                    return json.loads(content) if content else {}
+            except urllib.error.HTTPError as e:
+                detail = e.read().decode('utf-8', 'replace')[:500]
+                if e.code in RETRY_STATUSES and attempt < self.max_retries:
+                    delay = _retry_delay(e.headers.get('Retry-After'), attempt)
+                    print(f"DEBUG - Tracker returned {e.code}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                raise TrackerError(f"Tracker call {method} {path} failed with {e.code}: {detail}", e.code)
+            except urllib.error.URLError as e:
+                if attempt < self.max_retries:
+                    time.sleep(_retry_delay(None, attempt))
+                    continue
+                raise TrackerError(f"Tracker unreachable at {self.base_url}: {e.reason}")
+
+    def push(self, issues):
+        """Push issues in batches; returns one result per issue, in input order"""
+        results = []
+        for start in range(0, len(issues), self.batch_size):
+            batch = issues[start:start + self.batch_size]
+            try:
+                results.extend(self.push_batch(batch))
+            except TrackerError as e:
+                print(f"ERROR: Tracker batch {start // self.batch_size + 1} failed: {e}")
+                results.extend({'idempotency_key': issue['idempotency_key'], 'status': 'error', 'error': str(e)}
+                               for issue in batch)
+        return results
+
+    def push_batch(self, batch):
+        raise NotImplementedError
+
+def _retry_delay(retry_after, attempt):
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return min(0.5 * (2 ** attempt), 10.0)
+
+def batch_key(batch):
+    """Idempotency key of a whole bulk call, so a retried call is not applied twice"""
+    return hashlib.sha256(''.join(issue['idempotency_key'] for issue in batch).encode('ascii')).hexdigest()
+
+class GenericRestConnector(TrackerConnector):
+    """Trackers exposing a JSON bulk endpoint.
+
+    POST {base_url}/issues/bulk  {"project": ..., "issues": [issue, ...]}
+    with an Idempotency-Key header; the tracker answers with
+    {"results": [{"idempotency_key", "id", "url", "status"}, ...]} where
+    status is "created" or "existing".
+    """
+
+    name = 'generic'
+
+    def push_batch(self, batch):
+        response = self.request('POST', '/issues/bulk', {'project': self.project, 'issues': batch},
+                                headers={'Idempotency-Key': batch_key(batch)})
+        by_key = {result.get('idempotency_key'): result for result in response.get('results', [])}
+        return [by_key.get(issue['idempotency_key'],
+                           {'idempotency_key': issue['idempotency_key'], 'status': 'error',
+                            'error': 'Missing from tracker response'})
+                for issue in batch]
+
+class JiraConnector(TrackerConnector):
+    """Jira bulk issue creation (REST API v2, at most 50 issues per call).
+
+    Jira has no idempotency keys, so each issue carries a usg-<key> label and
+    one JQL search per batch finds issues a previous push already created.
+    """
+
+    name = 'jira'
+    max_batch_size = 50
+
+    @staticmethod
+    def key_label(issue):
+        return f"usg-{issue['idempotency_key'][:20]}"
+
+    def _fields(self, issue):
+        description = issue['description']
+        if issue['acceptance_criteria']:
+            description += '\n\nh3. Acceptance Criteria\n' + '\n'.join(f"* {item}" for item in issue['acceptance_criteria'])
+        fields = {
+            'project': {'key': self.project},
+            'summary': issue['summary'],
+            'description': description.strip(),
+            'issuetype': {'name': issue['issue_type']},
+            'labels': issue['labels'] + [self.key_label(issue)]
+        }
+        if issue.get('priority'):
+            fields['priority'] = {'name': str(issue['priority'])}
+        return fields
+
+    def _existing(self, batch):
+        labels = ', '.join(jql_string(self.key_label(issue)) for issue in batch)
+        response = self.request('POST', '/rest/api/2/search', {
+            'jql': f'project = {jql_string(self.project)} AND labels in ({labels})',
+            'fields': ['labels'],
+            'maxResults': len(batch)
+        })
+        existing = {}
+        for found in response.get('issues', []):
+            for label in found.get('fields', {}).get('labels', []):
+                existing[label] = found
+        return existing
+
+    def _result(self, issue, found, status):
+        return {'idempotency_key': issue['idempotency_key'], 'id': found.get('key'),
+                'url': f"{self.base_url}/browse/{found.get('key')}", 'status': status}
+
+    def push_batch(self, batch):
+        existing = self._existing(batch)
+        to_create = [issue for issue in batch if self.key_label(issue) not in existing]
+
+        created, errors = {}, {}
+        if to_create:
+            response = self.request('POST', '/rest/api/2/issue/bulk',
+                                    {'issueUpdates': [{'fields': self._fields(issue)} for issue in to_create]})
+            # Created issues are listed in request order, skipping the elements that failed
+            failed = {error.get('failedElementNumber'): error for error in response.get('errors', [])}
+            succeeded = [issue for index, issue in enumerate(to_create) if index not in failed]
+            created = {issue['idempotency_key']: found for issue, found in zip(succeeded, response.get('issues', []))}
+            errors = {to_create[index]['idempotency_key']: json.dumps(error.get('elementErrors', {}))
+                      for index, error in failed.items() if isinstance(index, int) and index < len(to_create)}
+
+        results = []
+        for issue in batch:
+            key = issue['idempotency_key']
+            if self.key_label(issue) in existing:
+                results.append(self._result(issue, existing[self.key_label(issue)], 'existing'))
+            elif key in created:
+                results.append(self._result(issue, created[key], 'created'))
+            else:
+                results.append({'idempotency_key': key, 'status': 'error',
+                                'error': errors.get(key, 'Missing from tracker response')})
+        return results
+
+CONNECTORS = {
+    GenericRestConnector.name: GenericRestConnector,
+    JiraConnector.name: JiraConnector
+}
+
+def get_connector(tracker_type=None, **overrides):
+    """Connector configured from TRACKER_* settings, with per-call overrides"""
+    tracker_type = tracker_type or TRACKER_TYPE
+    if tracker_type not in CONNECTORS:
+        raise ValueError(f"Unknown tracker type: {tracker_type}")
+    config = {
+        'base_url': TRACKER_URL,
+        'project': TRACKER_PROJECT,
+        'token': TRACKER_TOKEN,
+        'user': TRACKER_USER
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    return CONNECTORS[tracker_type](**config)
+
+def push_summary(results):
+    """Counts of created, existing and failed issues"""
+    summary = {'created': 0, 'existing': 0, 'error': 0}
+    for result in results:
+        status = result.get('status')
+        summary[status if status in summary else 'error'] += 1
+    return summary